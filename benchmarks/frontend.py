@@ -0,0 +1,193 @@
+"""Front end throughput: how parse, checking, inference and transpiling scale with program size.
+
+    python3 benchmarks/frontend.py                        # every shape at 500 to 4000
+    python3 benchmarks/frontend.py --shape call_chain --sizes 500,5000,50000
+    python3 benchmarks/frontend.py --json frontend.json
+
+Programs are synthesized in a few shapes that stress different parts of
+the compiler. Each is put through the in-process front end and transpiler
+(no C compiler) twice: once for time, once with allocation tracing for
+peak memory (tracing slows Python down too much to time the same run). The growth exponent
+of every stage is fitted across sizes: 1.0 is linear, 2.0 quadratic. A
+stage whose exponent exceeds --max-exponent exits 1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from phoenix.driver import BuildOptions, front_end, generate  # noqa: E402
+from phoenix.modules import ModuleLoader  # noqa: E402
+from phoenix.timing import StageTimer  # noqa: E402
+
+# Tree walkers recurse on nested expressions, so one chain stays well below
+# the interpreter's recursion limit; longer programs get more chains.
+CHAIN_TERMS = 400
+
+# Stages faster than this at the largest size are too noisy to fit.
+NOISE_FLOOR = 0.02
+
+
+def many_functions(n: int) -> str:
+    """n small independent functions, each called once from the top level."""
+    out = []
+    for i in range(n):
+        out.append(f"def f{i}(a: int) -> int:\n    b = a * {i % 7 + 2} + {i}\n    return b\n")
+    out.extend(f"print(f{i}({i}))" for i in range(n))
+    return "\n".join(out) + "\n"
+
+
+def unannotated(n: int) -> str:
+    """n functions with unannotated parameters, typed from their call sites in one global sum."""
+    out = [f"def f{i}(a, b):\n    x = a + b * {i}\n    return x\n" for i in range(n)]
+    out.append("t = 0")
+    out.extend(f"t = t + f{i}(1, 2)" for i in range(n))
+    out.append("print(t)")
+    return "\n".join(out) + "\n"
+
+
+def call_chain(n: int) -> str:
+    """f0 calls f1 calls ... f(n-1); defined callee first."""
+    out = [f"def f{n - 1}(a: int) -> int:\n    return a + 1\n"]
+    for i in range(n - 2, -1, -1):
+        out.append(f"def f{i}(a: int) -> int:\n    b = f{i + 1}(a)\n    return b + 1\n")
+    out.append("print(f0(0))")
+    return "\n".join(out) + "\n"
+
+
+def list_literal(n: int) -> str:
+    """One n-element list literal summed by a loop."""
+    rows = [", ".join(str(j) for j in range(i, min(i + 20, n))) for i in range(0, n, 20)]
+    body = ",\n    ".join(rows)
+    return f"values = [\n    {body}\n]\ntotal = 0\nfor i in range({n}):\n    total = total + values[i]\nprint(total)\n"
+
+
+def expression_chains(n: int) -> str:
+    """n terms in CHAIN_TERMS-long arithmetic chains over a handful of variables."""
+    names = ["x", "y", "z", "w"]
+    out = [f"{name} = {i + 1}" for i, name in enumerate(names)]
+    for s, start in enumerate(range(0, n, CHAIN_TERMS)):
+        terms = [f"{names[(s + t) % 4]} * {t % 9 + 1}" for t in range(min(CHAIN_TERMS, n - start))]
+        out.append(f"{names[s % 4]} = " + " + ".join(terms))
+    out.extend(f"print({name})" for name in names)
+    return "\n".join(out) + "\n"
+
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+    "functions": many_functions,
+    "unannotated": unannotated,
+    "call_chain": call_chain,
+    "list_literal": list_literal,
+    "expressions": expression_chains,
+}
+
+
+def measure(source: str, filename: str, memory: bool) -> StageTimer:
+    timer = StageTimer(memory=memory)
+    analysis = front_end(source, filename, ModuleLoader(), timer)
+    with timer.stage("transpile"):
+        generate(analysis, source, filename, "bench", BuildOptions())
+    if memory:
+        tracemalloc.stop()  # the timer starts tracing but leaves it on
+    return timer
+
+
+def growth(sizes: List[int], seconds: List[float]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+
+def best_times(source: str, filename: str, repeat: int) -> Dict[str, float]:
+    """Fastest wall time of each stage over repeat runs."""
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        for stage, stats in measure(source, filename, memory=False).stages.items():
+            best[stage] = min(best.get(stage, stats.wall), stats.wall)
+    return best
+
+
+def run_shape(name: str, sizes: List[int], max_exponent: float, repeat: int) -> Dict:
+    times, traced = {}, {}
+    for n in sizes:
+        source = SHAPES[name](n)
+        times[n] = best_times(source, f"{name}_{n}.py", repeat)
+        traced[n] = measure(source, f"{name}_{n}.py", memory=True)
+    stages = list(times[sizes[-1]])
+
+    print(f"{name}")
+    header = "".join(f"{n:>16}" for n in sizes)
+    print(f"  {'stage':<20}{header}  growth")
+    result = {"sizes": sizes, "stages": {}}
+    flagged = []
+    for stage in stages + ["total"]:
+        if stage == "total":
+            seconds = [sum(times[n].values()) for n in sizes]
+            peaks = [max((s.peak_bytes for s in traced[n].stages.values()), default=0) for n in sizes]
+        else:
+            seconds = [times[n].get(stage, 0.0) for n in sizes]
+            peaks = [traced[n].stages[stage].peak_bytes if stage in traced[n].stages else 0 for n in sizes]
+        exponent = growth(sizes, seconds) if len(sizes) > 1 else 0.0
+        noisy = seconds[-1] < NOISE_FLOOR
+        cells = "".join(f"{t * 1000:8.1f}ms{p / 1048576:5.1f}M" for t, p in zip(seconds, peaks))
+        mark = "" if noisy or exponent <= max_exponent else "  ⚠ super-linear"
+        print(f"  {stage:<20}{cells}  {exponent:5.2f}{' (noise)' if noisy else ''}{mark}")
+        if mark:
+            flagged.append(stage)
+        result["stages"][stage] = {
+            "wall_ms": [round(t * 1000, 3) for t in seconds],
+            "peak_kib": [round(p / 1024, 1) for p in peaks],
+            "growth": round(exponent, 3),
+        }
+    result["super_linear"] = flagged
+    print()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks/frontend.py", description="Measure how the front end scales.")
+    parser.add_argument("--shape", action="append", choices=sorted(SHAPES),
+                        help="program shape to generate (repeatable; default: all)")
+    parser.add_argument("--sizes", default="500,1000,2000,4000",
+                        help="comma-separated program sizes (default: 500,1000,2000,4000)")
+    parser.add_argument("--max-exponent", type=float, default=1.3,
+                        help="largest growth exponent accepted for a stage (default: 1.3)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per size; the fastest counts (default: 3)")
+    parser.add_argument("--json", metavar="FILE", help="also write the measurements as JSON")
+    parser.add_argument("--dump", metavar="DIR", help="write the generated programs to DIR")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    shapes = args.shape or list(SHAPES)
+    if args.dump:
+        Path(args.dump).mkdir(parents=True, exist_ok=True)
+        for name in shapes:
+            for n in sizes:
+                (Path(args.dump) / f"{name}_{n}.py").write_text(SHAPES[name](n))
+
+    results = {name: run_shape(name, sizes, args.max_exponent, args.repeat) for name in shapes}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+            f.write("\n")
+
+    flagged = [f"{name}/{stage}" for name, r in results.items() for stage in r["super_linear"]]
+    if flagged:
+        print(f"❌ Super-linear stages: {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# Count the points of a 120x96 grid over [-2, 1] x [-1.2, 1.2] that stay
+# bounded for 100 iterations of z = z*z + c, 100 times over.
+inside = 0
+total_iters = 0
+ci = 0.0
+cr = 0.0
+zr = 0.0
+zi = 0.0
+zr2 = 0.0
+zi2 = 0.0
+iters = 0
+for rep in range(100):
+    for py in range(96):
+        ci = py * 0.025 - 1.2
+        for px in range(120):
+            cr = px * 0.025 - 2.0
+            zr = 0.0
+            zi = 0.0
+            iters = 0
+            for k in range(100):
+                zr2 = zr * zr
+                zi2 = zi * zi
+                if zr2 + zi2 <= 4.0:
+                    zi = 2.0 * zr * zi + ci
+                    zr = zr2 - zi2 + cr
+                    iters = iters + 1
+                else:
+                    zi = zi
+                    zr = zr
+                    iters = iters
+            total_iters = total_iters + iters
+            if iters == 100:
+                inside = inside + 1
+            else:
+                inside = inside
+
+print(inside)
+print(total_iters)
@@ -0,0 +1,89 @@
+# The Jovian planets orbiting the sun, advanced 1000000 steps of dt = 0.01 years.
+# Pair (pi_[k], pj[k]) lists every pair of bodies once; energy is printed
+# before and after as the check.
+import math
+
+
+def energy(
+    x: list[float], y: list[float], z: list[float],
+    vx: list[float], vy: list[float], vz: list[float],
+    m: list[float], pi_: list[int], pj: list[int],
+) -> float:
+    e = 0.0
+    for i in range(5):
+        v2 = vx[i] * vx[i] + vy[i] * vy[i] + vz[i] * vz[i]
+        e = e + 0.5 * m[i] * v2
+    for k in range(10):
+        a = pi_[k]
+        b = pj[k]
+        dx = x[a] - x[b]
+        dy = y[a] - y[b]
+        dz = z[a] - z[b]
+        e = e - m[a] * m[b] / math.sqrt(dx * dx + dy * dy + dz * dz)
+    return e
+
+
+pi_ = [0, 0, 0, 0, 1, 1, 1, 2, 2, 3]
+pj = [1, 2, 3, 4, 2, 3, 4, 3, 4, 4]
+
+# sun, jupiter, saturn, uranus, neptune
+x = [0.0, 4.84143144246472090e+00, 8.34336671824457987e+00, 1.28943695621391310e+01, 1.53796971148509165e+01]
+y = [0.0, 0.0 - 1.16032004402742839e+00, 4.12479856412430479e+00, 0.0 - 1.51111514016986312e+01, 0.0 - 2.59193146099879641e+01]
+z = [0.0, 0.0 - 1.03622044471123109e-01, 0.0 - 4.03523417114321381e-01, 0.0 - 2.23307578892655734e-01, 1.79258772950371181e-01]
+vx = [0.0, 1.66007664274403694e-03, 0.0 - 2.76742510726862411e-03, 2.96460137564761618e-03, 2.68067772490389322e-03]
+vy = [0.0, 7.69901118419740425e-03, 4.99852801234917238e-03, 2.37847173959480950e-03, 1.62824170038242295e-03]
+vz = [0.0, 0.0 - 6.90460016972063023e-05, 2.30417297573763929e-05, 0.0 - 2.96589568540237556e-05, 0.0 - 9.51592254519715870e-05]
+m = [1.0, 9.54791938424326609e-04, 2.85885980666130812e-04, 4.36624404335156298e-05, 5.15138902046611451e-05]
+
+# Units: masses in solar masses times 4 pi^2, velocities per year.
+px = 0.0
+py = 0.0
+pz = 0.0
+for i in range(5):
+    m[i] = m[i] * 39.47841760435743
+    vx[i] = vx[i] * 365.24
+    vy[i] = vy[i] * 365.24
+    vz[i] = vz[i] * 365.24
+    px = px + vx[i] * m[i]
+    py = py + vy[i] * m[i]
+    pz = pz + vz[i] * m[i]
+
+# Zero the total momentum by giving the sun the opposite.
+vx[0] = 0.0 - px / 39.47841760435743
+vy[0] = 0.0 - py / 39.47841760435743
+vz[0] = 0.0 - pz / 39.47841760435743
+
+print(energy(x, y, z, vx, vy, vz, m, pi_, pj))
+
+a = 0
+b = 0
+dx = 0.0
+dy = 0.0
+dz = 0.0
+d2 = 0.0
+mag = 0.0
+ma = 0.0
+mb = 0.0
+for step in range(1000000):
+    for k in range(10):
+        a = pi_[k]
+        b = pj[k]
+        dx = x[a] - x[b]
+        dy = y[a] - y[b]
+        dz = z[a] - z[b]
+        d2 = dx * dx + dy * dy + dz * dz
+        mag = 0.01 / d2 / math.sqrt(d2)
+        ma = m[a] * mag
+        mb = m[b] * mag
+        vx[a] = vx[a] - dx * mb
+        vy[a] = vy[a] - dy * mb
+        vz[a] = vz[a] - dz * mb
+        vx[b] = vx[b] + dx * ma
+        vy[b] = vy[b] + dy * ma
+        vz[b] = vz[b] + dz * ma
+    for i in range(5):
+        x[i] = x[i] + 0.01 * vx[i]
+        y[i] = y[i] + 0.01 * vy[i]
+        z[i] = z[i] + 0.01 * vz[i]
+
+print(energy(x, y, z, vx, vy, vz, m, pi_, pj))
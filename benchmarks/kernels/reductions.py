@@ -0,0 +1,31 @@
+# Sum, sum of squares and maximum of a fixed array, swept 1000000 times.
+values = [
+    0.0, 3.7, 7.4, 1.0, 4.7, 8.4, 2.0, 5.7, 9.4, 3.0,
+    6.7, 0.3, 4.0, 7.7, 1.3, 5.0, 8.7, 2.3, 6.0, 9.7,
+    3.3, 7.0, 0.6, 4.3, 8.0, 1.6, 5.3, 9.0, 2.6, 6.3,
+    10.0, 3.6, 7.3, 0.9, 4.6, 8.3, 1.9, 5.6, 9.3, 2.9,
+    6.6, 0.2, 3.9, 7.6, 1.2, 4.9, 8.6, 2.2, 5.9, 9.6,
+    3.2, 6.9, 0.5, 4.2, 7.9, 1.5, 5.2, 8.9, 2.5, 6.2,
+    9.9, 3.5, 7.2, 0.8, 4.5, 8.2, 1.8, 5.5, 9.2, 2.8,
+    6.5, 0.1, 3.8, 7.5, 1.1, 4.8, 8.5, 2.1, 5.8, 9.5,
+    3.1, 6.8, 0.4, 4.1, 7.8, 1.4, 5.1, 8.8, 2.4, 6.1,
+    9.8, 3.4, 7.1, 0.7, 4.4, 8.1, 1.7, 5.4, 9.1, 2.7,
+]
+
+total = 0.0
+squares = 0.0
+best = 0.0
+v = 0.0
+for r in range(1000000):
+    for i in range(100):
+        v = values[i]
+        total = total + v
+        squares = squares + v * v
+        if v > best:
+            best = v
+        else:
+            best = best
+
+print(total)
+print(squares)
+print(best)
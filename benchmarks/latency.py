@@ -0,0 +1,211 @@
+"""End-to-end CLI latency: what `python3 -m phoenix.cli file.py` costs in each cache state.
+
+    python3 benchmarks/latency.py                     # every example that builds
+    python3 benchmarks/latency.py good_big.py -r 5
+    python3 benchmarks/latency.py --save-baseline     # store the times later runs are held to
+
+For each file in examples/ three paths are timed:
+
+    cold   no Phoenix cache and no bytecode for the phoenix package
+           (the --launcher always has its bytecode, so cold = warm there)
+    warm   bytecode cached, Phoenix cache empty (gcc runs)
+    hit    the binary comes out of the Phoenix cache
+
+Runs use a private copy of the package and a scratch working directory, so
+the caches in the checkout are never touched. Each run's wall time is split
+into interpreter startup (an empty `python -c pass`), import (everything the
+CLI does outside the build: imports, argument parsing, exit), front end,
+gcc and cache lookup and copy, the last three from the build's --report.
+A hit's wall time comes from a second run without --report, since loading
+the timer costs more than the hit itself.
+A path more than the stored threshold slower than in the baseline exits 1.
+
+There is no absolute goal for a hit. It cannot finish before the interpreter
+has started, and startup alone ranges from about 20 ms to over 200 ms
+depending on the machine and its site-packages, so a fixed figure such as
+30 ms is out of reach on many machines. What Phoenix controls is the time a
+hit adds on top of startup, which is printed last and held to the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+EXAMPLES_DIR = ROOT / "examples"
+RESULTS_DIR = HERE / "results"
+
+STATES = ["cold", "warm", "hit"]
+PARTS = ["startup", "import", "front end", "gcc", "cache"]
+GCC_STAGES = {"compile"}
+CACHE_STAGES = {"cache lookup", "cache store"}
+
+
+class Sandbox:
+    """A private phoenix package and working directory whose caches can be emptied."""
+
+    def __init__(self, root: Path, launcher: bool = False) -> None:
+        self.lib = root / "lib"
+        self.work = root / "work"
+        shutil.copytree(ROOT / "phoenix", self.lib / "phoenix", ignore=shutil.ignore_patterns("__pycache__"))
+        self.work.mkdir()
+        self.env = {k: v for k, v in os.environ.items() if not k.startswith(("PHOENIX_", "PYTHON"))}
+        self.env.update(PYTHONPATH=str(self.lib), PHOENIX_NO_DAEMON="1", PHOENIX_TRACE_MEMORY="0")
+        self.cli = [sys.executable, "-m", "phoenix.cli"]
+        if launcher:
+            path = str(root / "phoenix")
+            self.run([*self.cli, "launcher", "-o", path])
+            self.cli = [path]
+
+    def clear_bytecode(self) -> None:
+        for cache in (self.lib / "phoenix").rglob("__pycache__"):
+            shutil.rmtree(cache, ignore_errors=True)
+
+    def clear_cache(self) -> None:
+        shutil.rmtree(self.work / ".phoenix_cache", ignore_errors=True)
+
+    def prepare(self, state: str) -> None:
+        if state == "cold":
+            self.clear_bytecode()
+        if state in ("cold", "warm"):
+            self.clear_cache()
+
+    def run(self, cmd: List[str]) -> tuple:
+        started = time.perf_counter()
+        result = subprocess.run(cmd, cwd=self.work, env=self.env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return result.returncode, time.perf_counter() - started
+
+    def build(self, source: Path) -> Optional[Dict[str, float]]:
+        """One CLI build, split into PARTS (seconds); None if it failed."""
+        report = self.work / "report.json"
+        code, wall = self.run([*self.cli, str(source), "-o", "output", "--report", str(report)])
+        if code != 0:
+            return None
+        with open(report) as f:
+            stages = {name: s["wall_ms"] / 1000 for name, s in json.load(f)["stages"].items()}
+        parts = {
+            "gcc": sum(t for name, t in stages.items() if name in GCC_STAGES),
+            "cache": sum(t for name, t in stages.items() if name in CACHE_STAGES),
+            "front end": sum(t for name, t in stages.items() if name not in GCC_STAGES | CACHE_STAGES),
+        }
+        parts["wall"] = wall
+        return parts
+
+
+def median_parts(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {name: statistics.median(r[name] for r in runs) for name in runs[0]}
+
+
+def measure(sandbox: Sandbox, source: Path, reps: int, startup: float) -> Optional[Dict[str, Dict[str, float]]]:
+    runs: Dict[str, List[Dict[str, float]]] = {state: [] for state in STATES}
+    for _ in range(reps):
+        # Each state leaves the caches the next one expects.
+        for state in STATES:
+            sandbox.prepare(state)
+            parts = sandbox.build(source)
+            if parts is None:
+                return None
+            if state == "hit":
+                parts["wall"] = sandbox.run([*sandbox.cli, str(source), "-o", "output"])[1]
+            runs[state].append(parts)
+    result = {}
+    for state in STATES:
+        parts = median_parts(runs[state])
+        parts["startup"] = startup
+        parts["import"] = max(0.0, parts["wall"] - startup - parts["front end"] - parts["gcc"] - parts["cache"])
+        result[state] = parts
+    return result
+
+
+def load_json(path: Path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks/latency.py", description="Time the CLI cold, warm and from cache.")
+    parser.add_argument("examples", nargs="*", help="example files (default: every one that builds)")
+    parser.add_argument("-r", "--reps", type=int, default=3, help="runs per path; the median counts (default: 3)")
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "latency.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="slowdown counted as a regression (default: the baseline's, else 0.25)")
+    parser.add_argument("--min-delta", type=float, default=10.0,
+                        help="ignore slowdowns smaller than this many milliseconds (default: 10)")
+    parser.add_argument("--launcher", action="store_true",
+                        help="time the single-file launcher instead of `python3 -m phoenix.cli`")
+    parser.add_argument("--json", metavar="FILE", help="also write the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    sources = [EXAMPLES_DIR / name for name in args.examples] or sorted(EXAMPLES_DIR.glob("*.py"))
+    missing = [str(s) for s in sources if not s.is_file()]
+    if missing:
+        print(f"❌ Error: no such example: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    baseline_path = Path(args.baseline)
+    baseline = load_json(baseline_path, {})
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold", 0.25)
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory(prefix="phoenix-latency-") as tmp:
+        sandbox = Sandbox(Path(tmp), launcher=args.launcher)
+        startup = statistics.median(sandbox.run([sys.executable, "-c", "pass"])[1] for _ in range(5))
+        print(f"{'example':<24}" + "".join(f"{state:>10}" for state in STATES))
+        for source in sources:
+            measured = measure(sandbox, source, args.reps, startup)
+            if measured is None:
+                continue  # rejected programs have no build to time
+            results[source.name] = measured
+            print(f"{source.name:<24}" + "".join(f"{measured[s]['wall'] * 1000:8.1f}ms" for s in STATES))
+
+    if not results:
+        print("❌ Error: no example built", file=sys.stderr)
+        return 1
+
+    print()
+    print(f"{'mean per file':<24}" + "".join(f"{state:>10}" for state in STATES))
+    for part in PARTS + ["wall"]:
+        means = [statistics.mean(r[state][part] for r in results.values()) for state in STATES]
+        print(f"  {part:<22}" + "".join(f"{m * 1000:8.1f}ms" for m in means))
+    above = statistics.mean(r["hit"]["wall"] for r in results.values()) - startup
+    print(f"\nA hit takes {above * 1000:.1f} ms on top of {startup * 1000:.1f} ms of interpreter startup.")
+
+    paths = {f"{name}/{state}": round(r[state]["wall"] * 1000, 3) for name, r in results.items() for state in STATES}
+    regressed = []
+    for path, ms in paths.items():
+        before = baseline.get("paths", {}).get(path)
+        if before is not None and ms > before * (1 + threshold) and ms - before > args.min_delta:
+            regressed.append(f"{path}: {before:.1f} ms → {ms:.1f} ms (+{(ms / before - 1) * 100:.0f}%)")
+    for line in regressed:
+        print(f"⚠ regression: {line}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"startup_ms": round(startup * 1000, 3), "results": results}, f, indent=1)
+            f.write("\n")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump({"threshold": threshold, "paths": paths}, f, indent=1)
+            f.write("\n")
+        print(f"Baseline saved to {baseline_path}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+def escape_time(c, limit=100):
+    z = 0j
+    for n in range(limit):
+        if abs(z) > 2.0:
+            return n
+        z = z * z + c
+    return limit
+
+
+inside = total_iters = 0
+for _ in range(100):
+    counts = [
+        escape_time(complex(px * 0.025 - 2.0, py * 0.025 - 1.2))
+        for py in range(96)
+        for px in range(120)
+    ]
+    inside += counts.count(100)
+    total_iters += sum(counts)
+print(inside)
+print(total_iters)
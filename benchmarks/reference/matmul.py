@@ -0,0 +1,17 @@
+N = 24
+
+a = [[i * 0.5 + j * 0.25 for j in range(N)] for i in range(N)]
+b = [[i * 0.125 - j * 0.0625 for j in range(N)] for i in range(N)]
+
+checksum = 0.0
+for _ in range(300):
+    for r in range(50):
+        columns = list(zip(*b))
+        c = [[sum(x * y for x, y in zip(row, col)) for col in columns] for row in a]
+        checksum += c[r * 11 // N][r * 11 % N]
+        a[r // N][r % N] += 0.001
+
+print(c[0][0])
+print(c[N - 1][N - 1])
+print(sum(map(sum, c)))
+print(checksum)
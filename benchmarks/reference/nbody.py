@@ -0,0 +1,64 @@
+import math
+from itertools import combinations
+
+PI = 3.14159265358979323
+SOLAR_MASS = 4 * PI * PI
+DAYS_PER_YEAR = 365.24
+
+# [position, velocity, mass] for the sun, jupiter, saturn, uranus and neptune
+BODIES = [
+    [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], 1.0],
+    [[4.84143144246472090e+00, -1.16032004402742839e+00, -1.03622044471123109e-01],
+     [1.66007664274403694e-03, 7.69901118419740425e-03, -6.90460016972063023e-05],
+     9.54791938424326609e-04],
+    [[8.34336671824457987e+00, 4.12479856412430479e+00, -4.03523417114321381e-01],
+     [-2.76742510726862411e-03, 4.99852801234917238e-03, 2.30417297573763929e-05],
+     2.85885980666130812e-04],
+    [[1.28943695621391310e+01, -1.51111514016986312e+01, -2.23307578892655734e-01],
+     [2.96460137564761618e-03, 2.37847173959480950e-03, -2.96589568540237556e-05],
+     4.36624404335156298e-05],
+    [[1.53796971148509165e+01, -2.59193146099879641e+01, 1.79258772950371181e-01],
+     [2.68067772490389322e-03, 1.62824170038242295e-03, -9.51592254519715870e-05],
+     5.15138902046611451e-05],
+]
+for body in BODIES:
+    body[1] = [c * DAYS_PER_YEAR for c in body[1]]
+    body[2] *= SOLAR_MASS
+PAIRS = list(combinations(BODIES, 2))
+
+
+def energy():
+    e = sum(0.5 * m * (vx * vx + vy * vy + vz * vz) for _, (vx, vy, vz), m in BODIES)
+    for (p1, _, m1), (p2, _, m2) in PAIRS:
+        dx, dy, dz = p1[0] - p2[0], p1[1] - p2[1], p1[2] - p2[2]
+        e -= m1 * m2 / math.sqrt(dx * dx + dy * dy + dz * dz)
+    return e
+
+
+def advance(dt, steps):
+    for _ in range(steps):
+        for (p1, v1, m1), (p2, v2, m2) in PAIRS:
+            dx, dy, dz = p1[0] - p2[0], p1[1] - p2[1], p1[2] - p2[2]
+            d2 = dx * dx + dy * dy + dz * dz
+            mag = dt / (d2 * math.sqrt(d2))
+            b1, b2 = m1 * mag, m2 * mag
+            v1[0] -= dx * b2
+            v1[1] -= dy * b2
+            v1[2] -= dz * b2
+            v2[0] += dx * b1
+            v2[1] += dy * b1
+            v2[2] += dz * b1
+        for p, v, _ in BODIES:
+            p[0] += dt * v[0]
+            p[1] += dt * v[1]
+            p[2] += dt * v[2]
+
+
+px = sum(v[0] * m for _, v, m in BODIES)
+py = sum(v[1] * m for _, v, m in BODIES)
+pz = sum(v[2] * m for _, v, m in BODIES)
+BODIES[0][1] = [-px / SOLAR_MASS, -py / SOLAR_MASS, -pz / SOLAR_MASS]
+
+print(energy())
+advance(0.01, 1000000)
+print(energy())
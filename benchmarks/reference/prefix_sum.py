@@ -0,0 +1,13 @@
+from itertools import accumulate
+
+values = [(i * 37 % 101) / 10 for i in range(100)]
+
+checksum = 0.0
+for _ in range(2000000):
+    prefix = list(accumulate(values))
+    checksum += prefix[49] + prefix[99]
+
+print(prefix[0])
+print(prefix[49])
+print(prefix[99])
+print(checksum)
@@ -0,0 +1,13 @@
+values = [(i * 37 % 101) / 10 for i in range(100)]
+
+total = squares = best = 0.0
+for _ in range(1000000):
+    for v in values:
+        total += v
+        squares += v * v
+        if v > best:
+            best = v
+
+print(total)
+print(squares)
+print(best)
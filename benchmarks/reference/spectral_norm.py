@@ -0,0 +1,26 @@
+import math
+
+N = 100
+
+
+def eval_a(i, j):
+    return 1.0 / ((i + j) * (i + j + 1) // 2 + i + 1)
+
+
+def mul_av(v):
+    return [sum(eval_a(i, j) * v[j] for j in range(N)) for i in range(N)]
+
+
+def mul_atv(v):
+    return [sum(eval_a(j, i) * v[j] for j in range(N)) for i in range(N)]
+
+
+for _ in range(150):
+    u = [1.0] * N
+    for _ in range(10):
+        v = mul_atv(mul_av(u))
+        u = mul_atv(mul_av(v))
+
+vbv = sum(ui * vi for ui, vi in zip(u, v))
+vv = sum(vi * vi for vi in v)
+print(math.sqrt(vbv / vv))
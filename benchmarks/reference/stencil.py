@@ -0,0 +1,11 @@
+total = 0.0
+for _ in range(250):
+    a = [0.0] * 100
+    a[50] = 100.0
+    for _ in range(5000):
+        a = [a[0]] + [a[i] + 0.25 * (a[i - 1] + a[i + 1] - 2.0 * a[i]) for i in range(1, 99)] + [a[99]]
+    total += sum(a)
+
+print(a[50])
+print(a[25])
+print(total)
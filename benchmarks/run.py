@@ -0,0 +1,249 @@
+"""Benchmark suite: build each kernel with Phoenix, check it against CPython, time both.
+
+    python3 benchmarks/run.py                    # every kernel
+    python3 benchmarks/run.py nbody mandelbrot   # a subset
+    python3 benchmarks/run.py --save-baseline    # record the numbers later runs compare to
+
+kernels/<name>.py is the Phoenix program; reference/<name>.py computes the
+same numbers in idiomatic CPython. Every kernel is sized to run for at least
+MIN_KERNEL_SECONDS as a binary, so process startup (about a millisecond) is
+noise rather than the measurement; the CPython references then take seconds,
+so they get fewer runs (--python-reps). Medians are reported with the
+relative standard deviation across runs. Each result is appended to
+results/history.json. A kernel whose Phoenix median is more than
+--threshold slower than in results/baseline.json is a regression, and the
+run exits 1, as it does when a binary's output disagrees with CPython.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+KERNELS_DIR = HERE / "kernels"
+REFERENCE_DIR = HERE / "reference"
+RESULTS_DIR = HERE / "results"
+
+# Binaries print floats with %f, so agreement is to about six places.
+REL_TOL = 1e-6
+ABS_TOL = 1e-6
+
+# A binary that finishes sooner than this mostly times exec and exit.
+MIN_KERNEL_SECONDS = 0.1
+
+
+@dataclass
+class Timing:
+    runs: List[float] = field(default_factory=list)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.runs)
+
+    @property
+    def spread(self) -> float:
+        """Standard deviation relative to the mean; 0 for a single run."""
+        if len(self.runs) < 2:
+            return 0.0
+        return statistics.stdev(self.runs) / statistics.mean(self.runs)
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.runs)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]  # nearest rank
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "median": round(self.median, 6),
+            "p95": round(self.p95, 6),
+            "spread": round(self.spread, 4),
+            "runs": [round(t, 6) for t in self.runs],
+        }
+
+
+def kernel_names() -> List[str]:
+    return sorted(p.stem for p in KERNELS_DIR.glob("*.py"))
+
+
+def build(name: str, output: Path, flags: List[str]) -> None:
+    cmd = [sys.executable, "-m", "phoenix.cli", str(KERNELS_DIR / f"{name}.py"), "-o", str(output), "--no-daemon", *flags]
+    result = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name}: build failed\n{result.stdout}{result.stderr}")
+
+
+def run(cmd: List[str]) -> tuple:
+    started = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} exited {result.returncode}\n{result.stderr}")
+    return result.stdout, elapsed
+
+
+def outputs_match(expected: str, actual: str) -> bool:
+    """Same lines, numbers equal to within print precision."""
+    want, got = expected.split(), actual.split()
+    if len(want) != len(got):
+        return False
+    for a, b in zip(want, got):
+        try:
+            if not math.isclose(float(a), float(b), rel_tol=REL_TOL, abs_tol=ABS_TOL):
+                return False
+        except ValueError:
+            if a != b:
+                return False
+    return True
+
+
+def measure(cmd: List[str], warmup: int, reps: int) -> Timing:
+    for _ in range(warmup):
+        run(cmd)
+    timing = Timing()
+    for _ in range(reps):
+        timing.runs.append(run(cmd)[1])
+    return timing
+
+
+def load_json(path: Path, default: Any) -> Any:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+
+
+def commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    lines = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        before, after = base["phoenix"]["median"], result["phoenix"]["median"]
+        if after > before * (1 + threshold):
+            lines.append(f"{name}: {before * 1000:.1f} ms → {after * 1000:.1f} ms (+{(after / before - 1) * 100:.0f}%)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks/run.py", description="Time Phoenix binaries against CPython.")
+    parser.add_argument("kernels", nargs="*", help="kernels to run (default: all)")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs first (default: 1)")
+    parser.add_argument("-r", "--reps", type=int, default=5, help="timed runs of each binary (default: 5)")
+    parser.add_argument("--python-reps", type=int, default=3,
+                        help="timed runs of each CPython reference, which take seconds (default: 3)")
+    parser.add_argument("--profile", default=None, help="Phoenix build profile")
+    parser.add_argument("--cc", default=None, help="C back end")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown against the baseline counted as a regression (default: 0.10)")
+    parser.add_argument("--history", default=str(RESULTS_DIR / "history.json"))
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="make this run the baseline")
+    args = parser.parse_args(argv)
+
+    names = args.kernels or kernel_names()
+    unknown = sorted(set(names) - set(kernel_names()))
+    if unknown:
+        print(f"❌ Error: unknown kernels: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    flags = []
+    if args.profile:
+        flags += ["--profile", args.profile]
+    if args.cc:
+        flags += ["--cc", args.cc]
+
+    results: Dict[str, Any] = {}
+    failed = []
+    short = []
+    print(f"{'kernel':<14} {'python':>10} {'±':>6} {'phoenix':>10} {'±':>6} {'p95':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory(prefix="phoenix-bench-") as tmp:
+        for name in names:
+            binary = Path(tmp) / name
+            reference = [sys.executable, str(REFERENCE_DIR / f"{name}.py")]
+            try:
+                build(name, binary, flags)
+                expected, _ = run(reference)
+                actual, _ = run([str(binary)])
+            except RuntimeError as e:
+                print(f"{name:<14} ✗ {e}")
+                failed.append(name)
+                continue
+            if not outputs_match(expected, actual):
+                print(f"{name:<14} ✗ output differs from CPython")
+                print("    expected: " + " ".join(expected.split()))
+                print("    got:      " + " ".join(actual.split()))
+                failed.append(name)
+                continue
+
+            # The check above already ran the reference once, so it needs no warmup.
+            python = measure(reference, 0, args.python_reps)
+            phoenix = measure([str(binary)], args.warmup, args.reps)
+            speedup = python.median / phoenix.median
+            results[name] = {"python": python.to_json(), "phoenix": phoenix.to_json(), "speedup": round(speedup, 2)}
+            print(f"{name:<14} {python.median * 1000:8.1f}ms {python.spread * 100:5.1f}% "
+                  f"{phoenix.median * 1000:8.1f}ms {phoenix.spread * 100:5.1f}% "
+                  f"{phoenix.p95 * 1000:8.1f}ms {speedup:7.1f}×")
+            if phoenix.median < MIN_KERNEL_SECONDS:
+                short.append(name)
+
+    for name in short:
+        print(f"⚠ {name}: the binary runs for under {MIN_KERNEL_SECONDS * 1000:.0f} ms, "
+              "so process startup skews its time; scale the kernel up")
+
+    history = load_json(Path(args.history), [])
+    history.append({
+        "timestamp": time.time(),
+        "commit": commit(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "flags": flags,
+        "warmup": args.warmup,
+        "reps": args.reps,
+        "python_reps": args.python_reps,
+        "results": results,
+    })
+    write_json(Path(args.history), history)
+
+    baseline_path = Path(args.baseline)
+    regressed = regressions(results, load_json(baseline_path, {}), args.threshold)
+    for line in regressed:
+        print(f"⚠ regression: {line}")
+    if args.save_baseline:
+        baseline = load_json(baseline_path, {})
+        baseline.update(results)
+        write_json(baseline_path, baseline)
+        print(f"Baseline saved to {baseline_path}")
+
+    if failed:
+        print(f"❌ {len(failed)} kernel(s) failed: {', '.join(failed)}")
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# A call chain five functions deep, with each caller defined before its callee:
+# the float argument has to reach the bottom of the chain.
+def level1(x):
+    return level2(x) + 1
+
+def level2(x):
+    return level3(x) * 2
+
+def level3(x):
+    return level4(x) - 3
+
+def level4(x):
+    return level5(x) + x
+
+def level5(x):
+    return x * x
+
+print(level1(1.5))
+print(level1(4.0))
@@ -0,0 +1,10 @@
+from numlib import dot, clamp
+
+weights = [0.5, 1.5, 2.0, 1.0]
+values = [2.0, 4.0, 1.0, 3.0]
+
+score = dot(weights, values)
+print(score)
+print(clamp(score, 0.0, 100.0))
+print(clamp(score, 0.0, 10.0))
+print(clamp(0.0 - score, 0.0, 10.0))
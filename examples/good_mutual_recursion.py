@@ -0,0 +1,20 @@
+# Mutually recursive functions: annotated, so each sees the other's return type.
+def is_even(n: int) -> int:
+    result = 1
+    if n > 0:
+        result = is_odd(n - 1)
+    else:
+        result = 1
+    return result
+
+def is_odd(n: int) -> int:
+    result = 0
+    if n > 0:
+        result = is_even(n - 1)
+    else:
+        result = 0
+    return result
+
+print(is_even(10))
+print(is_odd(7))
+print(is_even(7))
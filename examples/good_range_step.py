@@ -0,0 +1,10 @@
+# range() with a start and a step.
+total = 0
+for i in range(2, 10, 3):
+    total = total + i
+print(total)
+
+count = 0
+for j in range(7, 3):
+    count = count + 1
+print(count)
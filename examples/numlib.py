@@ -0,0 +1,28 @@
+# A Phoenix module: only functions and imports, parameters annotated.
+
+def dot(a: list[float], b: list[float]) -> float:
+    total = 0.0
+    for i in range(4):
+        total = total + a[i] * b[i]
+    return total
+
+
+def scale(a: list[float], k: float) -> int:
+    for i in range(4):
+        a[i] = a[i] * k
+    return 0
+
+
+def clamp(x: float, lo: float, hi: float) -> float:
+    # No elif or nested if: raise to lo first, then cap at hi.
+    raised = x
+    if x < lo:
+        raised = lo
+    else:
+        raised = x
+    result = raised
+    if raised > hi:
+        result = hi
+    else:
+        result = raised
+    return result
@@ -0,0 +1,12 @@
+__version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # phoenix.jit pulls in the whole compiler; load it on first use so the
+    # CLI's cache-hit path does not pay for it.
+    if name == "jit":
+        from phoenix.jit import jit
+
+        globals()["jit"] = jit
+        return jit
+    raise AttributeError(f"module 'phoenix' has no attribute {name!r}")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+from phoenix.cache import ANALYSIS_SUFFIX, BinaryCache, compiler_digest
+from phoenix.modules import ModuleInterface
+from phoenix.type_inference import TypeContext
+from phoenix.types import type_from_json, type_to_json
+
+if TYPE_CHECKING:
+    from phoenix.driver import Analysis
+
+
+def analysis_key(source_hash: str, dependency_digest: str) -> str:
+    """Key a front end result on the source, the signatures it imports and the compiler.
+
+    Node types are stored by their position in the parsed tree, which is
+    only stable for one grammar, so the interpreter version is part of the
+    key; the compiler's own sources are too, since any change to them can
+    change what inference concludes.
+    """
+    material = [compiler_digest(), "%d.%d" % sys.version_info[:2], source_hash, dependency_digest]
+    return hashlib.sha256("\0".join(material).encode("utf-8")).hexdigest()
+
+
+def _numbered_nodes(tree: ast.Module) -> List[ast.AST]:
+    """Every statement and expression in tree, in an order that only depends on the source.
+
+    Types are stored against these positions. Walks the fields directly:
+    ast.walk costs as much as the parse itself.
+    """
+    found: List[ast.AST] = [tree]
+    for node in found:  # grows as it is walked
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if isinstance(value, list):
+                found.extend(v for v in value if isinstance(v, ast.AST))
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                found.append(value)
+    return [node for node in found if isinstance(node, (ast.stmt, ast.expr))]
+
+
+def load_analysis(
+    cache: BinaryCache, key: str, source: str, tree: Optional[ast.Module] = None
+) -> Optional["Analysis"]:
+    """The stored type context for key, on a fresh parse of source (or tree), or None.
+
+    Only the inferred types are stored: parsing again costs less than
+    loading a whole tree, and plain JSON executes nothing when read.
+    Analyses are cache entries like binaries: a hit refreshes their place
+    in the LRU order.
+    """
+    from phoenix.driver import Analysis
+
+    path = cache.lookup(key, ANALYSIS_SUFFIX, shared=False)
+    if path is None:
+        return None
+    try:
+        data = json.loads(path.read_text())
+        tree = tree if tree is not None else ast.parse(source)
+        types = [type_from_json(t) for t in data["types"]]
+        nodes = _numbered_nodes(tree)
+        flat = data["node_types"]
+        node_types = {nodes[flat[i]]: types[flat[i + 1]] for i in range(0, len(flat), 2)}
+        type_ctx = TypeContext(
+            {name: types[t] for name, t in data["globals"].items()},
+            node_types,
+            {name: types[t] for name, t in data["functions"].items()},
+            data["externs"],
+            data["uses_math"],
+        )
+        modules = [
+            ModuleInterface(
+                m["name"],
+                m["path"],
+                m["key"],
+                {name: type_from_json(t) for name, t in m["functions"].items()},
+                m["uses_math"],
+                m["deps"],
+            )
+            for m in data["modules"]
+        ]
+    except (OSError, ValueError, KeyError, IndexError, TypeError, SyntaxError):
+        return None
+    return Analysis(tree, type_ctx, modules)
+
+
+def store_analysis(cache: BinaryCache, key: str, analysis: "Analysis") -> None:
+    """Store analysis's types under key, counted against the cache's size cap."""
+    # Each distinct type is written once; nodes refer to it by index.
+    table: dict = {}
+
+    def _index(t) -> int:
+        return table.setdefault(t, len(table))
+
+    positions = {node: i for i, node in enumerate(_numbered_nodes(analysis.tree))}
+    flat = []
+    for node, t in analysis.type_ctx.node_types.items():
+        if node not in positions:
+            return  # typed a node outside the tree: not reproducible from a parse
+        flat += [positions[node], _index(t)]
+    type_ctx = analysis.type_ctx
+    data = {
+        "node_types": flat,
+        "globals": {name: _index(t) for name, t in type_ctx.globals.items()},
+        "functions": {name: _index(t) for name, t in type_ctx.functions.items()},
+        "externs": type_ctx.externs,
+        "uses_math": type_ctx.uses_math,
+        "modules": [{**m.to_json(), "path": m.path, "key": m.key} for m in analysis.modules],
+    }
+    data["types"] = [type_to_json(t) for t in table]
+
+    directory = cache.path(key, ANALYSIS_SUFFIX).parent
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        cache.store(key, str(tmp), suffix=ANALYSIS_SUFFIX)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import shutil
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from phoenix.profiles import Profile, load_project_config
+
+
+TIERS = ("fast", "opt", "auto")
+DEFAULT_TIER = "opt"
+
+
+@dataclass(frozen=True)
+class Backend:
+    """A C compiler Phoenix can drive, and which of its options it understands."""
+
+    name: str
+    fast_flags: Tuple[str, ...] = ("-O0",)
+    supported: Tuple[str, ...] = ()  # profile flag prefixes it accepts
+    pgo: bool = False
+
+    @property
+    def executable(self) -> str:
+        return shutil.which(self.name) or self.name
+
+    def installed(self) -> bool:
+        return shutil.which(self.name) is not None
+
+    def flags(self, profile: Profile, tier: str) -> List[str]:
+        if tier == "fast":
+            return list(self.fast_flags)
+        return [f for f in profile.flags() if f.startswith(self.supported)]
+
+
+BACKENDS: Dict[str, Backend] = {
+    "gcc": Backend("gcc", supported=("-O", "-g", "-march", "-flto", "-fno-plt", "-ffast-math"), pgo=True),
+    "clang": Backend("clang", supported=("-O", "-g", "-march", "-flto", "-fno-plt", "-ffast-math")),
+    # tcc does not optimize; it compiles an order of magnitude faster instead.
+    "tcc": Backend("tcc", fast_flags=(), supported=("-g",)),
+}
+
+# Preference order when no back end is configured.
+PREFERENCE = {
+    "fast": ("tcc", "gcc", "clang"),
+    "opt": ("gcc", "clang", "tcc"),
+}
+
+
+def configured_backend() -> Optional[str]:
+    """Back end named by PHOENIX_CC or phoenix.json, if any."""
+    return os.environ.get("PHOENIX_CC") or load_project_config().get("cc")
+
+
+@lru_cache(maxsize=None)
+def select_backend(name: Optional[str], tier: str) -> Backend:
+    """The back end to use for a tier: the requested one, else the best installed."""
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown C back end '{name}' (choose from {', '.join(BACKENDS)})")
+        backend = BACKENDS[name]
+        if not backend.installed():
+            raise ValueError(f"C back end '{name}' is not installed")
+        return backend
+
+    for candidate in PREFERENCE["fast" if tier == "fast" else "opt"]:
+        if BACKENDS[candidate].installed():
+            return BACKENDS[candidate]
+    raise ValueError("no C compiler found (install gcc, clang or tcc)")
+
+
+def installed_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.installed()]
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import glob
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from phoenix.bindings import shared_library_path
+from phoenix.driver import BuildOptions, BuildSession, Generated, describe_error, generate
+from phoenix.extension import extension_path
+
+
+@dataclass
+class BatchItem:
+    source_path: str
+    output: str
+    key: str = ""
+    cached: bool = False
+    optimizing: bool = False
+    error: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def collect_sources(patterns: List[str]) -> List[str]:
+    """Expand directories and globs into a sorted list of .py files."""
+    files: List[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.py"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        files.extend(m for m in matches if m.endswith(".py") and os.path.isfile(m))
+    return sorted(set(files))
+
+
+def output_paths(files: List[str], out_dir: str, options: Optional[BuildOptions] = None) -> Dict[str, str]:
+    """Mirror source paths under out_dir so equal stems never collide."""
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    outputs = {}
+    for f in files:
+        rel = os.path.relpath(os.path.abspath(f), root)
+        out = str(Path(out_dir) / Path(rel).with_suffix(""))
+        if options is not None and options.shared:
+            out = shared_library_path(out, os.path.dirname(out))
+        elif options is not None and options.extension:
+            out = extension_path(out, os.path.dirname(out))
+        outputs[f] = out
+    return outputs
+
+
+_session: Optional[BuildSession] = None
+
+
+def _front_end(
+    filename: str, output: str, tiers: List[BuildOptions]
+) -> Tuple[str, int, bool, Optional[Generated], List[str], float, dict]:
+    """Process-pool worker: key one file, then deliver its cached binary or
+    parse, check and transpile it.
+
+    Keying reads, parses and hashes the source, so it runs here rather than
+    serially in the parent. Returns (key, index of the tier used, cached,
+    generated code, error_lines, seconds, cache updates); a miss is built
+    at the last tier. Errors travel back as pre-rendered lines because
+    PhoenixError does not pickle its location, and the cache updates
+    (hits, hashes) for the parent to write once for the whole batch.
+    """
+    global _session
+    if _session is None:
+        _session = BuildSession(options=tiers[-1])  # one per worker, shared by all its files
+
+    started = time.perf_counter()
+    try:
+        with open(filename, "r") as f:
+            source = f.read()
+        for i, options in enumerate(tiers):
+            key = _session.key_for(source, filename, options)
+            if not options.pgo_retrain and _session.fetch_cached(key, output, options):
+                return key, i, True, None, [], 0.0, _session.cache.take_pending()
+        analysis = _session.analyze(source, filename)
+        generated = generate(analysis, source, filename, output, tiers[-1])
+    except Exception as e:
+        return "", len(tiers) - 1, False, None, describe_error(e), 0.0, _session.cache.take_pending()
+    seconds = time.perf_counter() - started
+    return key, len(tiers) - 1, False, generated, [], seconds, _session.cache.take_pending()
+
+
+def build_many(
+    files: List[str],
+    out_dir: str = "build",
+    jobs: Optional[int] = None,
+    options: Optional[BuildOptions] = None,
+) -> List[BatchItem]:
+    """Build every file, overlapping Python front ends with gcc back ends.
+
+    Front ends run in a process pool (they are CPU bound Python); each
+    finished translation unit is handed straight to a thread pool that
+    drives gcc, so file N compiles while file N+1 is still being checked.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    session = BuildSession(jobs=jobs, options=options)
+    outputs = output_paths(files, out_dir, session.options)
+    items = [BatchItem(f, outputs[f]) for f in files]
+
+    # The auto tier serves cached optimized binaries and builds the rest fast.
+    tiers = [session.options]
+    if session.options.tier == "auto":
+        tiers = [session.options.at_tier("opt"), session.options.at_tier("fast")]
+        session.options = tiers[-1]
+
+    pending: List[BatchItem] = []
+    unoptimized: List[BatchItem] = []
+    for item in items:
+        os.makedirs(os.path.dirname(item.output) or ".", exist_ok=True)
+        # Unchanged files are looked up by stat; the rest are keyed in the workers.
+        for tier_options in tiers:
+            key = session.indexed_key(item.source_path, tier_options)
+            if key is None or tier_options.pgo_retrain:
+                continue
+            if session.fetch_cached(key, item.output, tier_options):
+                item.key, item.cached = key, True
+                if len(tiers) > 1 and tier_options.tier == "fast":
+                    unoptimized.append(item)
+                break
+        else:
+            pending.append(item)
+
+    if pending:
+        built_at = _build_pending(session, pending, jobs, tiers)
+        if len(tiers) > 1:
+            unoptimized += [item for item in pending if tiers[built_at[item.source_path]].tier == "fast"]
+    session.cache.flush()
+    optimize = [item for item in unoptimized if item.ok]
+    if optimize:
+        session.schedule_optimize([item.source_path for item in optimize], tiers[0])
+        for item in optimize:
+            item.optimizing = True
+    return items
+
+
+def _build_pending(
+    session: BuildSession, pending: List[BatchItem], jobs: int, tiers: List[BuildOptions]
+) -> Dict[str, int]:
+    """Front ends in a process pool, each result handed straight to a gcc thread.
+
+    Returns the index of the tier each source ended up at.
+    """
+
+    def _back_end(item: BatchItem, generated: Generated, front_seconds: float) -> None:
+        started = time.perf_counter() - front_seconds
+        try:
+            result = session.finish_staged(item.key, generated, item.output, filename=item.source_path, started=started)
+            item.cached = result.cached
+        except Exception as e:
+            item.error = describe_error(e)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as front, \
+            ThreadPoolExecutor(max_workers=jobs) as back:
+        running = {
+            front.submit(_front_end, item.source_path, item.output, tiers): item
+            for item in pending
+        }
+        built_at: Dict[str, int] = {}
+        compiling = []
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                item.key, built_at[item.source_path], item.cached, generated, error, seconds, updates = future.result()
+                session.cache.absorb(updates)
+                if error:
+                    item.error = error
+                elif not item.cached:
+                    compiling.append(back.submit(_back_end, item, generated, seconds))
+        for future in compiling:
+            future.result()
+    return built_at
+
+
+def describe_batch(items: List[BatchItem]) -> Tuple[int, List[str]]:
+    lines: List[str] = []
+    for item in items:
+        if item.error:
+            lines.append(f"✗ {item.source_path}")
+            lines.extend("    " + line for text in item.error for line in text.splitlines())
+        elif item.cached:
+            lines.append(f"✓ {item.source_path} → {item.output} (cached)")
+        else:
+            lines.append(f"✓ {item.source_path} → {item.output}")
+
+    failed = sum(1 for item in items if not item.ok)
+    lines.append("")
+    lines.append(f"Built {len(items) - failed}/{len(items)} programs into native binaries.")
+    optimizing = sum(1 for item in items if item.optimizing)
+    if optimizing:
+        lines.append(f"Optimized rebuilds of {optimizing} programs are running in the background.")
+    return (1 if failed else 0), lines
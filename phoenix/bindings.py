@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import ast
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from phoenix.errors import PhoenixError
+from phoenix.type_inference import TypeContext
+from phoenix.types import (
+    BoolType,
+    FloatType,
+    FunctionType,
+    IntType,
+    ListType,
+    StringType,
+    Type,
+    UnknownType,
+)
+
+
+# Exported C symbols get a prefix so Phoenix names never collide with libc.
+SYMBOL_PREFIX = "phx_"
+
+_CTYPES = {
+    IntType: "ctypes.c_int",
+    FloatType: "ctypes.c_double",
+    BoolType: "ctypes.c_bool",
+    StringType: "ctypes.c_char_p",
+}
+
+
+def shared_library_path(filename: str, directory: str = ".") -> str:
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(directory, f"lib{stem}.so")
+
+
+def wrapper_path(library: str) -> str:
+    """foo/libbar.so -> foo/bar_native.py"""
+    directory, name = os.path.split(library)
+    stem = name[3:] if name.startswith("lib") else name
+    stem = stem[: -len(".so")] if stem.endswith(".so") else stem
+    return os.path.join(directory, f"{stem}_native.py")
+
+
+@dataclass(frozen=True)
+class Export:
+    name: str
+    params: List[str]
+    func_type: FunctionType
+    # Per parameter, how many elements the C code may touch; 0 for scalars.
+    lengths: List[int]
+    # Per parameter, whether the C code may store into it; only those lists
+    # are copied back to the caller's.
+    written: List[bool]
+
+
+Interval = Tuple[int, int]
+
+
+class _IndexBounds:
+    """Smallest safe length of each list parameter, from the indexes the body uses.
+
+    The C side receives a bare pointer, so every use of a list parameter
+    must be an index whose range is known statically: integer constants,
+    range() loop variables that are never reassigned, and +, - and * of
+    those. Passing the list on to another function of the module counts
+    that function's indexes. Anything else cannot be bounded and is refused.
+    """
+
+    def __init__(self, functions: Dict[str, ast.FunctionDef], type_ctx: TypeContext, filename: str, lines: List[str]):
+        self.functions = functions
+        self.type_ctx = type_ctx
+        self.filename = filename
+        self.lines = lines
+
+    def lengths(self, func: ast.FunctionDef, visiting: Tuple[str, ...] = ()) -> List[int]:
+        params = [a.arg for a in func.args.args]
+        types = self.type_ctx.functions[func.name].param_types
+        found = {p: 0 for p, t in zip(params, types) if isinstance(t, ListType)}
+        reassigned = {
+            target.id
+            for node in ast.walk(func)
+            if isinstance(node, (ast.Assign, ast.AugAssign))
+            for target in (node.targets if isinstance(node, ast.Assign) else [node.target])
+            if isinstance(target, ast.Name)
+        }
+        self._body(func, func.body, {}, reassigned, found, visiting + (func.name,))
+        return [found.get(p, 0) for p in params]
+
+    def _body(self, func, stmts, loops, reassigned, found, visiting) -> None:
+        for stmt in stmts:
+            if isinstance(stmt, ast.For) and isinstance(stmt.target, ast.Name):
+                r = range(*(arg.value for arg in stmt.iter.args))
+                if not r:
+                    continue  # the body never runs
+                inner = dict(loops)
+                if stmt.target.id in reassigned:
+                    inner.pop(stmt.target.id, None)
+                else:
+                    inner[stmt.target.id] = (r[0], r[-1])
+                self._body(func, stmt.body, inner, reassigned, found, visiting)
+                self._body(func, stmt.orelse, loops, reassigned, found, visiting)
+                continue
+            for child in ast.iter_child_nodes(stmt):
+                if isinstance(child, ast.stmt):
+                    self._body(func, [child], loops, reassigned, found, visiting)
+                else:
+                    self._expr(func, child, loops, found, visiting)
+
+    def _expr(self, func, node, loops, found, visiting) -> None:
+        if isinstance(node, ast.Subscript) and self._param(node.value, found):
+            bounds = static_interval(node.slice, loops)
+            if bounds is None or bounds[0] < 0:
+                self._refuse(func, node.value.id, node)
+            found[node.value.id] = max(found[node.value.id], bounds[1] + 1)
+            self._expr(func, node.slice, loops, found, visiting)
+            return
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in self.functions:
+            callee = self.functions[node.func.id]
+            needs: Optional[List[int]] = None
+            for i, arg in enumerate(node.args):
+                if not self._param(arg, found):
+                    self._expr(func, arg, loops, found, visiting)
+                    continue
+                if needs is None:
+                    # A cycle adds nothing: its indexes are counted where it starts.
+                    needs = [0] * len(callee.args.args) if callee.name in visiting else self.lengths(callee, visiting)
+                if i < len(needs):
+                    found[arg.id] = max(found[arg.id], needs[i])
+            return
+        if self._param(node, found):
+            self._refuse(func, node.id, node)
+        for child in ast.iter_child_nodes(node):
+            self._expr(func, child, loops, found, visiting)
+
+    @staticmethod
+    def _param(node: ast.AST, found: Dict[str, int]) -> bool:
+        return isinstance(node, ast.Name) and node.id in found
+
+    def _refuse(self, func: ast.FunctionDef, param: str, node: ast.AST) -> None:
+        raise PhoenixError(
+            f"Cannot export '{func.name}': cannot bound the indexes used on list parameter '{param}' "
+            "(index it with integer constants or range() loop variables)",
+            lineno=node.lineno,
+            col=node.col_offset + 1,
+            source=self.lines[node.lineno - 1],
+            filename=self.filename,
+        )
+
+
+def written_params(
+    func: ast.FunctionDef, functions: Dict[str, ast.FunctionDef], visiting: Tuple[str, ...] = ()
+) -> List[bool]:
+    """Per parameter, whether the body stores into it by subscript, itself or
+    through a function of the module it passes the parameter to."""
+    written: Set[str] = set()
+    visiting += (func.name,)
+    for node in ast.walk(func):
+        if isinstance(node, (ast.Assign, ast.AugAssign)):
+            for target in node.targets if isinstance(node, ast.Assign) else [node.target]:
+                if isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name):
+                    written.add(target.value.id)
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in functions
+            and node.func.id not in visiting
+        ):
+            callee = written_params(functions[node.func.id], functions, visiting)
+            for arg, stored in zip(node.args, callee):
+                if stored and isinstance(arg, ast.Name):
+                    written.add(arg.id)
+    return [a.arg in written for a in func.args.args]
+
+
+def static_interval(node: ast.AST, loops: Dict[str, Interval]) -> Optional[Interval]:
+    """Smallest and largest value of an int expression, or None if not static.
+
+    loops maps the range() loop variables in scope to their first and last
+    values.
+    """
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return (node.value, node.value)
+    if isinstance(node, ast.Name):
+        return loops.get(node.id)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult)):
+        left, right = static_interval(node.left, loops), static_interval(node.right, loops)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return (left[0] + right[0], left[1] + right[1])
+        if isinstance(node.op, ast.Sub):
+            return (left[0] - right[1], left[1] - right[0])
+        products = [a * b for a in left for b in right]
+        return (min(products), max(products))
+    return None
+
+
+def exported_functions(tree: ast.Module, type_ctx: TypeContext, filename: str, lines: List[str]) -> List[Export]:
+    """Top-level functions with fully known parameter types, in source order."""
+    exported: List[Export] = []
+    functions = {stmt.name: stmt for stmt in tree.body if isinstance(stmt, ast.FunctionDef)}
+    bounds = _IndexBounds(functions, type_ctx, filename, lines)
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.FunctionDef):
+            continue
+        func_type = type_ctx.functions[stmt.name]
+        if any(isinstance(t, UnknownType) for t in func_type.param_types):
+            raise PhoenixError(
+                f"Cannot export '{stmt.name}': parameter types are unknown "
+                "(annotate them or call the function from top-level code)",
+                lineno=stmt.lineno,
+                col=stmt.col_offset + 1,
+                source=lines[stmt.lineno - 1],
+                filename=filename,
+            )
+        exported.append(Export(
+            stmt.name,
+            [a.arg for a in stmt.args.args],
+            func_type,
+            bounds.lengths(stmt),
+            written_params(stmt, functions),
+        ))
+    return exported
+
+
+def _ctype(t: Type) -> str:
+    if isinstance(t, ListType):
+        return f"ctypes.POINTER({_ctype(t.element_type)})"
+    return _CTYPES.get(type(t), "ctypes.c_int")
+
+
+def generate_bindings(source_name: str, library: str, exports: List[Export]) -> str:
+    """Python module exposing each function through ctypes.
+
+    Scalars are passed straight through. Lists are passed as a bare
+    pointer: the wrapper copies the sequence into a C array, refuses it
+    if it is shorter than the function's indexes need and writes back
+    in-place mutations. Strings are UTF-8 encoded and decoded at the boundary;
+    string lists are read-only on the C side and are not written back.
+    """
+    out = [
+        f'"""Native bindings for {source_name} (generated by Phoenix; do not edit)."""',
+        "import ctypes",
+        "import os",
+        "",
+        f"_lib = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), {os.path.basename(library)!r}))",
+        "",
+        "",
+        "def _array(ctype, seq, length, name):",
+        "    if isinstance(seq, ctypes.Array):",
+        "        buf = seq",
+        "    else:",
+        "        buf = (ctype * len(seq))(*seq)",
+        "    if len(buf) < length:",
+        "        raise ValueError(f'{name} needs at least {length} elements, got {len(buf)}')",
+        "    return buf",
+    ]
+
+    for export in exports:
+        name, params, func_type = export.name, export.params, export.func_type
+        symbol = f"_{name}"
+        out.append("")
+        out.append("")
+        out.append(f"{symbol} = _lib.{SYMBOL_PREFIX}{name}")
+        out.append(f"{symbol}.argtypes = [{', '.join(_ctype(t) for t in func_type.param_types)}]")
+        ret = func_type.return_type
+        out.append(f"{symbol}.restype = {'None' if isinstance(ret, UnknownType) else _ctype(ret)}")
+
+        simple = all(
+            isinstance(t, (IntType, FloatType, BoolType)) for t in func_type.param_types
+        ) and not isinstance(ret, StringType)
+        if simple:
+            # Nothing to convert: expose the ctypes function itself.
+            out.append(f"{name} = {symbol}")
+            continue
+
+        out.append("")
+        out.append("")
+        out.append(f"def {name}({', '.join(params)}):")
+        call_args = []
+        writebacks = []
+        for param, t, length, written in zip(params, func_type.param_types, export.lengths, export.written):
+            if isinstance(t, ListType) and isinstance(t.element_type, StringType):
+                encoded = f"[s.encode('utf-8') for s in {param}]"
+                out.append(f"    {param}_buf = _array(ctypes.c_char_p, {encoded}, {length}, {param!r})")
+                call_args.append(f"{param}_buf")
+            elif isinstance(t, ListType):
+                elem = _ctype(t.element_type)
+                out.append(f"    {param}_buf = _array({elem}, {param}, {length}, {param!r})")
+                call_args.append(f"{param}_buf")
+                if written:
+                    writebacks.append(param)
+            elif isinstance(t, StringType):
+                call_args.append(f"{param}.encode('utf-8')")
+            else:
+                call_args.append(param)
+        out.append(f"    result = {symbol}({', '.join(call_args)})")
+        for param in writebacks:
+            out.append(f"    if isinstance({param}, list):")
+            out.append(f"        {param}[:] = {param}_buf[:len({param})]")
+        if isinstance(ret, StringType):
+            out.append("    return result.decode('utf-8')")
+        else:
+            out.append("    return result")
+
+    out.append("")
+    return "\n".join(out)
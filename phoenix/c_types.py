@@ -1,35 +1,53 @@
 from __future__ import annotations
 
-from typing import Iterable, Set
+from typing import Dict, FrozenSet, Iterable, Set
 
-from phoenix.types import BoolType, FloatType, IntType, ListType, Type
+from phoenix.types import BoolType, FloatType, IntType, ListType, StringType, Type
+
+_SCALAR_NAMES = {
+    IntType: "int",
+    FloatType: "double",
+    BoolType: "bool",
+    StringType: "const char *",
+}
+
+_SCALAR_HEADERS = {
+    BoolType: frozenset({"<stdbool.h>"}),
+    FloatType: frozenset({"<math.h>"}),  # sqrt and friends live here
+}
+
+# Per interned type, so each is worked out once.
+_names: Dict[Type, str] = {}
+_headers: Dict[Type, FrozenSet[str]] = {}
 
 
 def c_type_name(t: Type) -> str:
     """Return the C11 type name for a Phoenix type."""
-    if isinstance(t, IntType):
-        return "int"
-    if isinstance(t, FloatType):
-        return "double"
-    if isinstance(t, BoolType):
-        return "bool"
-    from phoenix.types import StringType  # local import to avoid cycle
-    if isinstance(t, StringType):
-        return "const char *"
-    if isinstance(t, ListType):
-        return c_type_name(t.element_type)
-    # Unknown fallback keeps the C code compilable; checker should guard earlier.
-    return "int"
+    name = _names.get(t)
+    if name is None:
+        if isinstance(t, ListType):
+            name = c_type_name(t.element_type)
+        else:
+            # Unknown fallback keeps the C code compilable; checker should guard earlier.
+            name = _SCALAR_NAMES.get(type(t), "int")
+        _names[t] = name
+    return name
+
+
+def _headers_for(t: Type) -> FrozenSet[str]:
+    headers = _headers.get(t)
+    if headers is None:
+        if isinstance(t, ListType):
+            headers = _headers_for(t.element_type)
+        else:
+            headers = _SCALAR_HEADERS.get(type(t), frozenset())
+        _headers[t] = headers
+    return headers
 
 
 def required_headers(types: Iterable[Type]) -> Set[str]:
     """Collect C headers needed for the given types."""
     headers: Set[str] = set()
     for t in types:
-        if isinstance(t, BoolType):
-            headers.add("<stdbool.h>")
-        if isinstance(t, FloatType):
-            headers.add("<math.h>")  # sqrt and friends live here
-        if isinstance(t, ListType):
-            headers.update(required_headers([t.element_type]))
+        headers |= _headers_for(t)
     return headers
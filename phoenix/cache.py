@@ -0,0 +1,720 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from phoenix import __version__
+from phoenix.cache_layout import (
+    ANALYSIS_DIR_NAME,
+    ANALYSIS_SUFFIX,
+    ARTIFACT_SUFFIXES,
+    CACHE_DIR_NAME,
+    DIGEST_SUFFIX,
+    JOURNAL_NAME,
+    KEY_LOCK_DIR,
+    LOCK_NAME,
+    MANIFEST_NAME,
+    STAT_INDEX_NAME,
+    TOOLCHAIN_NAME,
+    append_journal,
+    artifact_path,
+    deliver,
+    empty_record,
+    fetch_local,
+    file_stamp,
+    index_name,
+    temp_name,
+    write_json,
+)
+from phoenix.profiles import load_project_config
+
+
+CACHE_DIR = Path(CACHE_DIR_NAME)
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+MAX_NORMALIZED = 4096  # remembered source hash -> normalized AST hash pairs
+MAX_STAT_ENTRIES = 4096
+STAT_MIN_AGE_NS = 2_000_000_000  # younger files may still change within one mtime tick
+LINK_MODES = ("auto", "reflink", "hardlink", "symlink", "copy")
+SHARED_TIMEOUT = 10.0  # seconds per HTTP request
+
+_SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def hash_source(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def normalized_hash(source: str) -> str:
+    """Hash of the source's AST without positions, so layout and comments do not count."""
+    import ast  # parsing is only needed for sources the cache has not seen
+
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return "raw:" + hash_source(source)  # not a program; the front end reports it
+    return hashlib.sha256(ast.dump(tree, include_attributes=False).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def compiler_digest() -> str:
+    """Hash of the phoenix package's sources, so a compiler change misses every old entry.
+
+    A launcher carries no sources; it is built with the digest of the
+    checkout it came from.
+    """
+    try:
+        from phoenix._digest import DIGEST
+    except ImportError:
+        return package_digest(Path(__file__).resolve().parent)
+    return DIGEST
+
+
+def package_digest(directory: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(directory.glob("*.py")):
+        data = path.read_bytes()
+        digest.update(f"{path.name}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def ensure_cache_dir() -> Path:
+    CACHE_DIR.mkdir(exist_ok=True)
+    return CACHE_DIR
+
+
+def parse_size(text: str) -> int:
+    """Parse '512M', '2G' or a plain byte count."""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def max_cache_bytes() -> int:
+    env = os.environ.get("PHOENIX_CACHE_MAX_BYTES")
+    return parse_size(env) if env else DEFAULT_MAX_BYTES
+
+
+# ---- toolchain fingerprint ---------------------------------------
+def _probe(cc_path: str) -> Dict[str, str]:
+    import subprocess
+
+    def _run(*args: str) -> str:
+        try:
+            proc = subprocess.run([cc_path, *args], capture_output=True, text=True)
+        except OSError:
+            return ""
+        out = (proc.stdout or proc.stderr).strip()
+        return out.splitlines()[0] if proc.returncode == 0 and out else ""
+
+    return {
+        "version": _run("--version") or "unknown",
+        "target": _run("-dumpmachine") or os.uname().machine,
+    }
+
+
+@lru_cache(maxsize=None)
+def toolchain_fingerprint(cc: str = "gcc") -> Dict[str, str]:
+    """Version and target triple of the C compiler, probed once.
+
+    Probes are remembered in memory and in toolchain.json, keyed by the
+    resolved compiler path plus its mtime/size so an upgrade re-probes.
+    """
+    found = shutil.which(cc)
+    if found is None:
+        return {"cc": cc, "version": "missing", "target": os.uname().machine}
+    path = os.path.realpath(found)
+    st = os.stat(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    probe_file = CACHE_DIR / TOOLCHAIN_NAME
+    try:
+        probes = json.loads(probe_file.read_text())
+    except (OSError, ValueError):
+        probes = {}
+
+    entry = probes.get(path)
+    if entry is None or entry.get("stamp") != stamp:
+        entry = {"stamp": stamp, **_probe(path)}
+        probes[path] = entry
+        ensure_cache_dir()
+        write_json(probe_file, probes)
+
+    return {"cc": path, "version": entry["version"], "target": entry["target"]}
+
+
+def cache_key(digest: str, flags: Iterable[str] = (), cc: str = "gcc") -> str:
+    """Key a binary on everything that can change it, not just the input digest."""
+    material = json.dumps(
+        {
+            "phoenix": __version__,
+            "compiler": compiler_digest(),
+            "toolchain": toolchain_fingerprint(cc),
+            "flags": list(flags),
+            "source": digest,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def link_mode() -> str:
+    """How cache hits reach their output: PHOENIX_CACHE_LINK, phoenix.json, else auto."""
+    return os.environ.get("PHOENIX_CACHE_LINK") or load_project_config().get("cache_link", "auto")
+
+
+def atomic_copy(src: str, dest: str, mode: Optional[int] = None) -> None:
+    """Copy src to dest so concurrent readers see the old file or the new one."""
+    deliver(src, dest, mode)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock shared by every process (and thread) that opens path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ---- stat index ----------------------------------------------------
+class StatIndex:
+    """(path, size, mtime_ns, inode) of a program and its imports -> cache key.
+
+    A hit on an untouched program is then served without reading or hashing
+    any source. Files modified within the last STAT_MIN_AGE_NS are never
+    recorded, since a second write in the same mtime tick would go unseen.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.path = root / STAT_INDEX_NAME
+        self._stamp: Optional[int] = None
+        self.entries: Dict[str, dict] = {}
+
+    def _load(self) -> None:
+        try:
+            stamp = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self.entries, self._stamp = {}, None
+            return
+        if stamp == self._stamp:
+            return
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+        self._stamp = stamp
+
+    def lookup(self, filename: str, context: str) -> Optional[str]:
+        self._load()
+        entry = self.entries.get(index_name(filename, context))
+        if entry is None:
+            return None
+        for path, stamp in entry["stamps"].items():
+            if file_stamp(path) != stamp:
+                return None
+        return entry["key"]
+
+    def record(self, filename: str, context: str, paths: List[str], key: str) -> None:
+        stamps = {os.path.abspath(p): file_stamp(p) for p in [filename, *paths]}
+        now = time.time_ns()
+        if any(s is None or now - s[1] < STAT_MIN_AGE_NS for s in stamps.values()):
+            return
+        name = index_name(filename, context)
+        self._load()
+        if self.entries.get(name) == {"stamps": stamps, "key": key}:
+            return
+        self.entries.pop(name, None)
+        self.entries[name] = {"stamps": stamps, "key": key}
+        for stale in list(self.entries)[:-MAX_STAT_ENTRIES]:
+            del self.entries[stale]
+        self.path.parent.mkdir(exist_ok=True)
+        write_json(self.path, self.entries)
+        self._stamp = self.path.stat().st_mtime_ns
+
+
+# ---- shared tiers --------------------------------------------------
+class SharedTier:
+    """A read-only cache another machine filled with `phoenix cache export`.
+
+    The location is a directory (e.g. an NFS mount) or an http(s):// URL
+    serving the same layout: `<key><suffix>` artifacts, each next to a
+    `<key><suffix>.sha256` file that fetched bytes are verified against.
+    """
+
+    def __init__(self, location: str):
+        self.location = location.rstrip("/")
+        self.remote = self.location.startswith(("http://", "https://"))
+        self.available = True
+
+    def _read(self, name: str) -> Optional[bytes]:
+        if not self.remote:
+            try:
+                return (Path(self.location) / name).read_bytes()
+            except OSError:
+                return None
+        import urllib.error
+        import urllib.request
+
+        try:
+            with urllib.request.urlopen(f"{self.location}/{name}", timeout=SHARED_TIMEOUT) as reply:
+                return reply.read()
+        except urllib.error.HTTPError:
+            return None
+        except (OSError, ValueError):
+            self.available = False  # unreachable: stop paying the timeout
+            return None
+
+    def fetch(self, key: str, suffix: str) -> Tuple[str, Optional[bytes]]:
+        """('hit', bytes), ('miss', None) or ('rejected', None) on a digest mismatch."""
+        if not self.available:
+            return "miss", None
+        digest = self._read(f"{key}{suffix}{DIGEST_SUFFIX}")
+        if digest is None:
+            return "miss", None
+        data = self._read(f"{key}{suffix}")
+        if data is None:
+            return "miss", None
+        expected = digest.decode("ascii", "replace").split()[:1]
+        if expected != [hashlib.sha256(data).hexdigest()]:
+            return "rejected", None
+        return "hit", data
+
+
+def shared_tiers() -> List[SharedTier]:
+    """Tiers named by PHOENIX_SHARED_CACHE (comma separated) or phoenix.json."""
+    env = os.environ.get("PHOENIX_SHARED_CACHE")
+    if env is not None:
+        locations = env.split(",")
+    else:
+        locations = load_project_config().get("shared_cache", [])
+        if isinstance(locations, str):
+            locations = [locations]
+    return [SharedTier(loc.strip()) for loc in locations if loc.strip()]
+
+
+# ---- binary cache --------------------------------------------------
+class BinaryCache:
+    """Content-addressed binaries plus a manifest of sizes and access times.
+
+    The manifest drives LRU eviction under a byte cap and accumulates hit,
+    miss and compile-seconds-saved statistics for `phoenix cache stats`.
+    Local misses fall through to the shared tiers in order; a verified hit
+    there is written back to this cache. Manifest updates hold a lock file
+    so concurrent phoenix processes never lose each other's entries.
+
+    Hits, access times and normalized hashes are only buffered: flush()
+    appends them to a journal once per build, and the next manifest write
+    folds the journal in. A local hit therefore takes no lock and does not
+    rewrite the manifest.
+
+    Programs are keyed twice: by their normalized AST and by the C they
+    generate. The first key is usually a link entry pointing at the second,
+    so sources that differ only cosmetically share one binary.
+    """
+
+    def __init__(
+        self,
+        root: Path = CACHE_DIR,
+        max_bytes: Optional[int] = None,
+        shared: Optional[List[SharedTier]] = None,
+    ):
+        self.root = root
+        self.max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+        self.shared = shared_tiers() if shared is None else shared
+        self.link_mode = link_mode()
+        self.manifest_path = root / MANIFEST_NAME
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._stamp: Optional[int] = None
+        self.entries: Dict[str, dict] = {}
+        self.normalized: Dict[str, str] = {}
+        self.stats: Dict[str, float] = {}
+        self._pending = empty_record()
+        self._load()
+
+    # ---- manifest ------------------------------------------------
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth:
+                yield
+                return
+            self._depth += 1
+            try:
+                with file_lock(self.root / LOCK_NAME):
+                    yield
+            finally:
+                self._depth -= 1
+
+    def key_lock(self, key: str) -> ContextManager[None]:
+        """Lock held while building key, so concurrent misses compile once.
+
+        Keys share 256 lock files by prefix; a rare unrelated wait is cheaper
+        than a lock file per key that nothing ever cleans up.
+        """
+        return file_lock(self.root / KEY_LOCK_DIR / f"{key[:2]}.lock")
+
+    def _load(self) -> None:
+        try:
+            stamp = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if stamp is not None and stamp == self._stamp:
+            return
+
+        data: dict = {}
+        if stamp is not None:
+            try:
+                data = json.loads(self.manifest_path.read_text())
+            except ValueError:
+                data = {}
+        self.entries = data.get("entries", {})
+        self.normalized = data.get("normalized", {})
+        self.stats = {"hits": 0, "misses": 0, "seconds_saved": 0.0, "tiers": {}, **data.get("stats", {})}
+        self._stamp = stamp
+
+    def _fold(self) -> bool:
+        """Apply the journal and this process's buffered updates; whether there were any.
+
+        Called with the manifest locked and followed by _save(), since the
+        journal is emptied here.
+        """
+        path = self.root / JOURNAL_NAME
+        records = []
+        try:
+            with open(path, "r+b") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                for line in f.read().splitlines():
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # a record torn by a crash
+                f.truncate(0)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            records.append(self._pending)
+            self._pending = empty_record()
+        for record in records:
+            for key, (hits, atime) in record["used"].items():
+                entry = self.entries.get(key)
+                if entry is not None:
+                    entry["atime"] = max(entry.get("atime", 0), atime)
+                    entry["hits"] = entry.get("hits", 0) + hits
+            for name in ("hits", "misses", "seconds_saved"):
+                self.stats[name] += record[name]
+            for raw, digest in record["normalized"].items():
+                self.normalized.pop(raw, None)
+                self.normalized[raw] = digest
+        for stale in list(self.normalized)[:-MAX_NORMALIZED]:
+            del self.normalized[stale]
+        return any(record != empty_record() for record in records)
+
+    def flush(self) -> None:
+        """Append the updates buffered since the last flush to the journal."""
+        record = self.take_pending()
+        if record != empty_record():
+            append_journal(self.root, record)
+
+    def take_pending(self) -> dict:
+        """Hand over the buffered updates, e.g. from a worker process to its parent."""
+        with self._lock:
+            record, self._pending = self._pending, empty_record()
+        return record
+
+    def absorb(self, record: dict) -> None:
+        """Buffer updates taken from another BinaryCache on the same directory."""
+        with self._lock:
+            for key, (hits, atime) in record["used"].items():
+                used = self._pending["used"].setdefault(key, [0, 0.0])
+                used[0] += hits
+                used[1] = max(used[1], atime)
+            for name in ("hits", "misses", "seconds_saved"):
+                self._pending[name] += record[name]
+            self._pending["normalized"].update(record["normalized"])
+
+    def _use(self, key: str, hit: bool = False, seconds: float = 0.0) -> None:
+        """Buffer an access to key (and, for a hit, the hit and the compile time saved)."""
+        with self._lock:
+            used = self._pending["used"].setdefault(key, [0, 0.0])
+            used[0] += int(hit)
+            used[1] = time.time()
+            if hit:
+                self._pending["hits"] += 1
+                self._pending["seconds_saved"] += seconds
+
+    def _save(self) -> None:
+        self.root.mkdir(exist_ok=True)
+        write_json(self.manifest_path, {"entries": self.entries, "normalized": self.normalized, "stats": self.stats})
+        self._stamp = self.manifest_path.stat().st_mtime_ns
+
+    def path(self, key: str, suffix: Optional[str] = None) -> Path:
+        return Path(artifact_path(str(self.root), self.entries, key, suffix))
+
+    def _resolve(self, key: str) -> str:
+        return self.entries.get(key, {}).get("link", key)
+
+    def source_digest(self, source: str) -> str:
+        """normalized_hash(source), remembered per source hash to skip re-parsing."""
+        raw = hash_source(source)
+        with self._lock:
+            self._load()
+            digest = self.normalized.get(raw) or self._pending["normalized"].get(raw)
+        if digest is None:
+            digest = normalized_hash(source)
+            with self._lock:
+                self._pending["normalized"][raw] = digest
+        return digest
+
+    # ---- lookup / store ------------------------------------------
+    def _pull(self, key: str, suffix: str) -> Optional[Path]:
+        """Copy an artifact from the first shared tier that has it into this cache.
+
+        Downloads (up to SHARED_TIMEOUT per tier) run without the manifest
+        lock, into a temporary file; the lock is only held to publish it.
+        """
+        statuses: List[Tuple[str, str]] = []
+        found = None
+        for tier in self.shared:
+            status, data = tier.fetch(key, suffix)
+            statuses.append((tier.location, status))
+            if data is not None:
+                found = tier, data
+                break
+
+        path = Path(artifact_path(str(self.root), {}, key, suffix))  # never through a stale link
+        tmp = Path(temp_name(path))
+        if found is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(found[1])
+        try:
+            with self._locked():
+                self._load()
+                self._fold()
+                for location, status in statuses:
+                    counts = self.stats["tiers"].setdefault(location, {"hits": 0, "misses": 0, "rejected": 0})
+                    counts[{"hit": "hits", "miss": "misses"}.get(status, status)] += 1
+                if found is None:
+                    self._save()
+                    return None
+                os.replace(tmp, path)
+                now = time.time()
+                tier, data = found
+                self.entries[key] = {"size": len(data), "created": now, "atime": now, "hits": 0, "tier": tier.location}
+                if suffix != ".bin":
+                    self.entries[key]["suffix"] = suffix
+                self._evict(self.max_bytes, keep=key)
+                self._save()
+                return path
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def fetch(self, key: str, dest: str) -> bool:
+        """Deliver the binary for key to dest; False (and a recorded miss) if absent."""
+        if self._deliver(key, dest):
+            return True
+        if self.shared and self._pull(key, ".bin") is not None and self._deliver(key, dest):
+            return True
+        with self._lock:
+            self._pending["misses"] += 1
+        return False
+
+    def _deliver(self, key: str, dest: str) -> bool:
+        with self._lock:
+            self._load()
+            entries = self.entries
+        record = fetch_local(str(self.root), entries, key, dest, self.link_mode)
+        if record is None:
+            return False
+        self.absorb(record)
+        return True
+
+    def store(self, key: str, binary: str, compile_seconds: float = 0.0, suffix: str = ".bin") -> Path:
+        with self._locked():
+            self._load()
+            self._fold()
+            self.root.mkdir(exist_ok=True)
+            self.entries.pop(key, None)  # never write through a link
+            path = self.path(key, suffix)
+            atomic_copy(binary, str(path))
+            now = time.time()
+            self.entries[key] = {
+                "size": path.stat().st_size,
+                "created": now,
+                "atime": now,
+                "hits": 0,
+                "compile_seconds": round(compile_seconds, 4),
+            }
+            if suffix != ".bin":
+                self.entries[key]["suffix"] = suffix
+            self._evict(self.max_bytes, keep=key)
+            self._save()
+            return path
+
+    def link(self, key: str, target: str, suffix: str = ".bin") -> None:
+        """Serve target's artifact under key as well, without a second copy."""
+        if key == target:
+            return
+        with self._locked():
+            self._load()
+            self._fold()
+            now = time.time()
+            self.entries[key] = {"link": self._resolve(target), "size": 0, "created": now, "atime": now, "hits": 0}
+            if suffix != ".bin":
+                self.entries[key]["suffix"] = suffix
+            self._save()
+
+    def has(self, key: str, shared: bool = True) -> bool:
+        """Whether a binary for key is cached here or, unless shared is False, in a shared tier.
+
+        A shared hit is copied into this cache, as fetch() would, so the
+        fetch that follows is local. Hit and miss counts are left to fetch().
+        """
+        with self._lock:
+            self._load()
+            if self.path(key).exists():
+                return True
+        if not shared or not self.shared:
+            return False
+        return self._pull(key, ".bin") is not None
+
+    def lookup(self, key: str, suffix: str, shared: bool = True) -> Optional[Path]:
+        """Path of a cached intermediate artifact (e.g. an object file).
+
+        Only refreshes the access time; hit statistics track final binaries.
+        Unless shared is False, a local miss falls through to the shared tiers.
+        """
+        with self._lock:
+            self._load()
+            path = self.path(key, suffix)
+        if path.exists():
+            self._use(key)
+            return path
+        if not shared or not self.shared:
+            return None
+        return self._pull(key, suffix)
+
+    # ---- maintenance ---------------------------------------------
+    def total_bytes(self) -> int:
+        return sum(e.get("size", 0) for e in self.entries.values())
+
+    def _evict(self, max_bytes: int, keep: Optional[str] = None) -> Dict[str, int]:
+        removed = {"entries": 0, "bytes": 0}
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k].get("atime", 0)):
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self.entries.pop(key)
+            size = entry.get("size", 0)
+            if "link" not in entry:
+                self.path(key, entry.get("suffix", ".bin")).unlink(missing_ok=True)
+            total -= size
+            removed["entries"] += 1
+            removed["bytes"] += size
+        return removed
+
+    def prune(self, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """Evict least recently used entries down to the cap and drop orphans."""
+        with self._locked():
+            self._load()
+            self._fold()
+            removed = self._evict(self.max_bytes if max_bytes is None else max_bytes)
+            for path in self._artifacts():
+                if path.stem not in self.entries:
+                    removed["entries"] += 1
+                    removed["bytes"] += path.stat().st_size
+                    path.unlink()
+            self._save()
+            return removed
+
+    def _artifacts(self) -> Iterable[Path]:
+        for suffix in ARTIFACT_SUFFIXES:
+            yield from self.root.glob(f"*{suffix}")
+        yield from (self.root / ANALYSIS_DIR_NAME).glob(f"*{ANALYSIS_SUFFIX}")
+
+    def clear(self) -> Dict[str, int]:
+        with self._locked():
+            self._load()
+            self._fold()  # empties the journal; its counts are reset below
+            removed = {"entries": 0, "bytes": 0}
+            for path in self._artifacts():
+                removed["entries"] += 1
+                removed["bytes"] += path.stat().st_size
+                path.unlink()
+            self.entries = {}
+            self.normalized = {}
+            self.stats = {"hits": 0, "misses": 0, "seconds_saved": 0.0, "tiers": {}}
+            if self.root.exists():
+                self._save()
+            return removed
+
+    def export(self, dest: str) -> Dict[str, int]:
+        """Copy every entry, with its digest file, into a shared tier directory.
+
+        Tiers have no links, so a linked key is published as its own copy
+        of the artifact it resolves to. Analyses stay local: they number
+        tree nodes the way the Python that wrote them parses.
+        """
+        with self._locked():
+            self._load()
+            os.makedirs(dest, exist_ok=True)
+            exported = {"entries": 0, "bytes": 0}
+            for key, entry in self.entries.items():
+                suffix = entry.get("suffix", ".bin")
+                if suffix == ANALYSIS_SUFFIX:
+                    continue
+                path = self.path(key, suffix)
+                try:
+                    data = path.read_bytes()
+                except FileNotFoundError:
+                    continue
+                name = f"{key}{suffix}"
+                target = Path(dest) / name
+                shutil.copyfile(path, target)
+                # Written last: readers only trust artifacts that have a digest.
+                digest = target.with_name(name + DIGEST_SUFFIX)
+                digest.write_text(f"{hashlib.sha256(data).hexdigest()}  {name}\n")
+                exported["entries"] += 1
+                exported["bytes"] += len(data)
+            return exported
+
+    def summary(self) -> Dict[str, float]:
+        with self._locked():
+            self._load()
+            if self._fold():
+                self._save()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.stats["hits"],
+                "misses": self.stats["misses"],
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "seconds_saved": self.stats["seconds_saved"],
+                "tiers": {tier.location: self.stats["tiers"].get(tier.location, {}) for tier in self.shared},
+            }
@@ -0,0 +1,152 @@
+"""The on-disk layout of the binary cache, and the code that serves a local hit from it.
+
+phoenix.cache builds on this module, and so does the CLI's fast path
+(phoenix.fastpath), which runs before anything else is imported. That is
+why this module imports nothing but os and json at the top; fcntl, shutil,
+threading and time are imported only in the functions that need them.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+CACHE_DIR_NAME = ".phoenix_cache"
+MANIFEST_NAME = "manifest.json"
+STAT_INDEX_NAME = "stat_index.json"
+LOCK_NAME = "manifest.lock"
+JOURNAL_NAME = "manifest.journal"  # hits and hashes not yet folded into the manifest
+KEY_LOCK_DIR = "locks"
+TOOLCHAIN_NAME = "toolchain.json"
+ARTIFACT_SUFFIXES = (".bin", ".o")
+ANALYSIS_SUFFIX = ".json"  # front end results, kept under analysis/ and never exported
+ANALYSIS_DIR_NAME = "analysis"
+DIGEST_SUFFIX = ".sha256"
+_FICLONE = 0x40049409  # linux/fs.h: share extents copy-on-write
+
+
+def artifact_path(root: str, entries: dict, key: str, suffix: str | None = None) -> str:
+    """Where the artifact key resolves to, following a link entry."""
+    key = entries.get(key, {}).get("link", key)
+    if suffix is None:
+        suffix = entries.get(key, {}).get("suffix", ".bin")
+    if suffix == ANALYSIS_SUFFIX:
+        return os.path.join(root, ANALYSIS_DIR_NAME, f"{key}{suffix}")
+    return os.path.join(root, f"{key}{suffix}")
+
+
+def index_name(filename: str, context: str) -> str:
+    """The stat index's name for filename built in context."""
+    return f"{os.path.abspath(filename)}\0{context}"
+
+
+def file_stamp(path: str) -> list | None:
+    """[size, mtime_ns, inode] of path, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def temp_name(path: str) -> str:
+    import threading
+
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def write_json(path: str, data: dict) -> None:
+    tmp = temp_name(path)
+    with open(tmp, "w") as f:
+        f.write(json.dumps(data, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def deliver(src: str, dest: str, mode: int | None = None, how: str = "copy") -> str:
+    """Put src at dest atomically, sharing storage when `how` allows; returns the method used.
+
+    auto tries a reflink, then a hard link, then a byte copy. Any method
+    the filesystem refuses (e.g. across devices) falls back to copying.
+    """
+    methods = ("reflink", "hardlink", "copy") if how == "auto" else (how, "copy")
+    tmp = temp_name(dest)
+    try:
+        for method in methods:
+            try:
+                if method == "reflink":
+                    import fcntl
+
+                    with open(src, "rb") as s, open(tmp, "wb") as d:
+                        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+                elif method == "hardlink":
+                    os.link(src, tmp)
+                elif method == "symlink":
+                    os.symlink(os.path.abspath(src), tmp)
+                else:
+                    import shutil
+
+                    shutil.copyfile(src, tmp)
+                break
+            except OSError:
+                if os.path.lexists(tmp):
+                    os.unlink(tmp)
+                if method == methods[-1]:
+                    raise
+        if mode is not None and method != "symlink":
+            os.chmod(tmp, mode)  # a hard link shares this mode with the cache entry
+        os.replace(tmp, dest)
+        return method
+    finally:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+
+# ---- journal -------------------------------------------------------
+def empty_record() -> dict:
+    """Manifest updates buffered between flushes: key -> [hits, atime] and counters."""
+    return {"used": {}, "hits": 0, "misses": 0, "seconds_saved": 0.0, "normalized": {}}
+
+
+def append_journal(root: str, record: dict) -> None:
+    """Append one record of manifest updates, without taking the manifest lock.
+
+    The record goes out in a single O_APPEND write under a shared lock on
+    the journal, so concurrent writers never interleave and the manifest
+    writer, which folds the journal in under an exclusive lock, never
+    misses one.
+    """
+    import fcntl
+
+    os.makedirs(root, exist_ok=True)
+    fd = os.open(os.path.join(root, JOURNAL_NAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        os.write(fd, (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def fetch_local(root: str, entries: dict, key: str, dest: str, how: str) -> dict | None:
+    """Deliver the locally cached binary for key to dest: the hit's journal record, or None.
+
+    entries (the manifest's) are only read. BinaryCache buffers the record
+    until its next flush; the fast path appends it to the journal at once.
+    """
+    import time
+
+    target = entries.get(key, {}).get("link", key)
+    path = artifact_path(root, entries, key)
+    try:
+        if not os.path.exists(path):  # a symlink would not notice
+            return None
+        deliver(path, dest, 0o755, how)
+    except FileNotFoundError:
+        return None  # evicted meanwhile
+    now = time.time()
+    record = empty_record()
+    record["used"][target] = [1, now]
+    if key != target:
+        record["used"][key] = [0, now]
+    record["hits"] = 1
+    record["seconds_saved"] = entries.get(target, {}).get("compile_seconds", 0.0)
+    return record
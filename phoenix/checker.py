@@ -1,8 +1,11 @@
 import ast
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
 from phoenix.errors import PhoenixError
-from phoenix.type_inference import TypeContext, infer_types
+from phoenix.passes import Pass, PassContext, PassManager
+from phoenix.timing import NULL_TIMER
+from phoenix.type_inference import CallGraph, TypeContext, infer_types
+from phoenix.types import FunctionType, ListType, Type
 
 BANNED_CALLS = {"eval", "exec", "__import__"}
 BANNED_ATTRS = {("importlib", "import_module")}
@@ -18,70 +21,222 @@ def _error(msg: str, node: ast.AST, filename: str, lines: List[str]) -> PhoenixE
     )
 
 
-def _check_control_flow(tree: ast.AST, filename: str, lines: List[str]) -> None:
-    for node in ast.walk(tree):
-        if isinstance(node, ast.While):
+def _describe(t: Type) -> str:
+    if isinstance(t, ListType):
+        return f"list[{_describe(t.element_type)}]"
+    if isinstance(t, FunctionType):
+        params = ", ".join(_describe(p) for p in t.param_types)
+        return f"({params}) -> {_describe(t.return_type)}"
+    return t.name
+
+
+class ControlFlowRule(Pass):
+    name = "control flow"
+
+    def begin(self, ctx: PassContext) -> None:
+        self.ctx = ctx
+
+    def visit_While(self, node: ast.While) -> None:
+        raise _error(
+            "While-loops are forbidden. Loop bounds must be statically known.",
+            node,
+            self.ctx.filename,
+            self.ctx.lines,
+        )
+
+    def visit_For(self, node: ast.For) -> None:
+        if not isinstance(node.iter, ast.Call):
             raise _error(
-                "While-loops are forbidden. Loop bounds must be statically known.",
+                "For-loop iterable must be a statically known range().",
                 node,
-                filename,
-                lines,
+                self.ctx.filename,
+                self.ctx.lines,
             )
 
-        if isinstance(node, ast.For):
-            if not isinstance(node.iter, ast.Call):
-                raise _error(
-                    "For-loop iterable must be a statically known range().",
-                    node,
-                    filename,
-                    lines,
-                )
+        if not isinstance(node.iter.func, ast.Name) or node.iter.func.id != "range":
+            raise _error(
+                "For-loops must use range() with static bounds.",
+                node,
+                self.ctx.filename,
+                self.ctx.lines,
+            )
 
-            if not isinstance(node.iter.func, ast.Name) or node.iter.func.id != "range":
+        for arg in node.iter.args:
+            if not isinstance(arg, ast.Constant) or not isinstance(arg.value, int):
                 raise _error(
-                    "For-loops must use range() with static bounds.",
+                    "range() bounds must be integer literals.",
                     node,
-                    filename,
-                    lines,
+                    self.ctx.filename,
+                    self.ctx.lines,
                 )
 
-            for arg in node.iter.args:
-                if not isinstance(arg, ast.Constant) or not isinstance(arg.value, int):
-                    raise _error(
-                        "range() bounds must be integer literals.",
-                        node,
-                        filename,
-                        lines,
-                    )
+        if len(node.iter.args) == 3 and node.iter.args[2].value == 0:
+            raise _error(
+                "range() step must not be zero.",
+                node,
+                self.ctx.filename,
+                self.ctx.lines,
+            )
+
 
+class DynamicFeaturesRule(Pass):
+    name = "dynamic features"
+
+    def begin(self, ctx: PassContext) -> None:
+        self.ctx = ctx
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name) and node.func.id in BANNED_CALLS:
+            raise _error(
+                f"Use of '{node.func.id}' is forbidden. "
+                "Dynamic execution breaks performance guarantees.",
+                node,
+                self.ctx.filename,
+                self.ctx.lines,
+            )
 
-def _check_dynamic_features(tree: ast.AST, filename: str, lines: List[str]) -> None:
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id in BANNED_CALLS:
+        if isinstance(node.func, ast.Attribute):
+            if (
+                isinstance(node.func.value, ast.Name)
+                and (node.func.value.id, node.func.attr) in BANNED_ATTRS
+            ):
                 raise _error(
-                    f"Use of '{node.func.id}' is forbidden. "
-                    "Dynamic execution breaks performance guarantees.",
+                    "Dynamic imports are forbidden. Performance cannot be proven.",
                     node,
-                    filename,
-                    lines,
+                    self.ctx.filename,
+                    self.ctx.lines,
                 )
 
-            if isinstance(node.func, ast.Attribute):
-                if (
-                    isinstance(node.func.value, ast.Name)
-                    and (node.func.value.id, node.func.attr) in BANNED_ATTRS
-                ):
-                    raise _error(
-                        "Dynamic imports are forbidden. Performance cannot be proven.",
-                        node,
-                        filename,
-                        lines,
-                    )
-
-
-def check_types(tree: ast.AST, filename: str, lines: List[str]) -> TypeContext:
-    _check_control_flow(tree, filename, lines)
-    _check_dynamic_features(tree, filename, lines)
+
+class BranchAssignments(Pass):
+    """Names assigned in each branch of every if, for inference's both-branches rule.
+
+    Gathered during the shared walk so inference does not walk every if
+    body again on each of its passes.
+    """
+
+    name = "branch assignments"
+
+    def begin(self, ctx: PassContext) -> None:
+        self.branches: Dict[ast.stmt, Tuple[set, Dict[str, ast.AST]]] = {}
+        self._owner: Dict[ast.stmt, Tuple[set, Dict[str, ast.AST]]] = {}
+        self._open: List[Tuple[set, Dict[str, ast.AST]]] = []
+
+    def visit_If(self, node: ast.If) -> None:
+        for stmts in (node.body, node.orelse):
+            if stmts:
+                record: Tuple[set, Dict[str, ast.AST]] = (set(), {})
+                self.branches[stmts[0]] = record
+                for stmt in stmts:
+                    self._owner[stmt] = record
+
+    def visit_stmt(self, node: ast.stmt) -> None:
+        record = self._owner.get(node)
+        if record is not None:
+            self._open.append(record)
+
+    def leave_stmt(self, node: ast.stmt) -> None:
+        if node in self._owner:
+            self._open.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        target = node.targets[0]
+        if isinstance(target, ast.Name):
+            for assigned, first in self._open:
+                assigned.add(target.id)
+                first.setdefault(target.id, node)
+
+    def finish(self, ctx: PassContext) -> Dict[ast.stmt, Tuple[set, Dict[str, ast.AST]]]:
+        return self.branches
+
+    def dump(self, ctx: PassContext) -> str:
+        out = []
+        for node in ast.walk(ctx.tree):
+            if isinstance(node, ast.If):
+                parts = []
+                for label, stmts in (("if", node.body), ("else", node.orelse)):
+                    if stmts:
+                        names = ", ".join(sorted(self.branches[stmts[0]][0]))
+                        parts.append(f"{label}: {{{names}}}")
+                out.append(f"line {node.lineno}  " + "  ".join(parts))
+        return "\n".join(out) or "(no if statements)"
+
+
+class CallGraphPass(Pass):
+    """Calls and name reads per top-level function, which order inference's worklist."""
+
+    name = "call graph"
+
+    def begin(self, ctx: PassContext) -> None:
+        self.graph = CallGraph()
+        self._owners = {
+            stmt: stmt.name if isinstance(stmt, ast.FunctionDef) else None for stmt in ctx.tree.body
+        }
+        self._calls: Set[str] = set()
+        self._reads: Optional[Set[str]] = None
+
+    def visit_stmt(self, node: ast.stmt) -> None:
+        if node in self._owners:
+            owner = self._owners[node]
+            self._calls = self.graph.calls.setdefault(owner, set())
+            # Only functions need their reads: they depend on global types.
+            self._reads = None if owner is None else self.graph.reads.setdefault(owner, set())
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            self._calls.add(node.func.id)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if self._reads is not None and isinstance(node.ctx, ast.Load):
+            self._reads.add(node.id)
+
+    def finish(self, ctx: PassContext) -> CallGraph:
+        return self.graph
+
+    def dump(self, ctx: PassContext) -> str:
+        out = []
+        for owner, callees in self.graph.calls.items():
+            if callees:
+                out.append(f"{owner or '<module>'} -> {', '.join(sorted(callees))}")
+        return "\n".join(out) or "(no calls)"
+
+
+class InferTypes(Pass):
     # Inference enforces type stability and homogeneous aggregates.
-    return infer_types(tree, filename, lines)
+    name = "infer types"
+    requires = ("control flow", "dynamic features", "branch assignments", "call graph")
+
+    def run(self, ctx: PassContext) -> TypeContext:
+        return infer_types(
+            ctx.tree,
+            ctx.filename,
+            ctx.lines,
+            ctx.imports,
+            ctx.results["branch assignments"],
+            ctx.results["call graph"],
+        )
+
+    def dump(self, ctx: PassContext) -> str:
+        type_ctx = ctx.results[self.name]
+        out = [f"{name}: {_describe(t)}" for name, t in type_ctx.globals.items()]
+        out += [f"def {name}{_describe(t)}" for name, t in type_ctx.functions.items()]
+        return "\n".join(out)
+
+
+def checker_passes() -> List[Pass]:
+    """Every pass check_types runs, in the order given to the pass manager."""
+    return [ControlFlowRule(), DynamicFeaturesRule(), BranchAssignments(), CallGraphPass(), InferTypes()]
+
+
+def check_types(
+    tree: ast.AST,
+    filename: str,
+    lines: List[str],
+    imports: Optional[Dict[str, Tuple[str, FunctionType]]] = None,
+    timer=NULL_TIMER,
+    dump_after: Optional[str] = None,
+) -> TypeContext:
+    """Run the rule and inference passes; dump_after stops with a PassDump after that pass."""
+    ctx = PassContext(tree, filename, lines, imports or {})
+    PassManager(checker_passes(), timer, dump_after).run(ctx)
+    return ctx.results["infer types"]
@@ -1,80 +1,373 @@
+import os
 import sys
-import ast
-import subprocess
-import hashlib
-import shutil
-from pathlib import Path
 
-from phoenix.checker import check_types
-from phoenix.errors import PhoenixError
-from phoenix.transpiler import transpile
 
+USAGE = """Usage: python3 -m phoenix.cli <file.py> [-o OUTPUT] [--profile NAME] [--fast-math] [--pgo] [--incremental] [--shared|--extension]
+                                         [--cc gcc|clang|tcc] [--tier fast|opt|auto] [--no-daemon]
+                                         [--time-passes] [--report build.json] [--dump-after PASS]
+       python3 -m phoenix.cli build <dir-or-glob>... [-j N] [--out-dir DIR] [build options]
+       python3 -m phoenix.cli watch <file-or-dir>... [--out-dir DIR] [--interval SECONDS] [--no-run] [build options]
+       python3 -m phoenix.cli optimize <file.py>... [build options]
+       python3 -m phoenix.cli cache stats|prune|clear [--max-bytes SIZE]
+       python3 -m phoenix.cli cache export --to DIR
+       python3 -m phoenix.cli launcher [-o PATH] [--python INTERPRETER]
+       python3 -m phoenix.cli serve [--socket PATH] [-j N]
+       python3 -m phoenix.cli stop [--socket PATH]"""
 
-CACHE_DIR = Path(".phoenix_cache")
-CACHE_DIR.mkdir(exist_ok=True)
 
+def _add_build_args(parser):
+    from phoenix.backends import BACKENDS, TIERS
+    from phoenix.profiles import PROFILES
 
-def hash_source(source: str) -> str:
-    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+    parser.add_argument("--profile", choices=sorted(PROFILES),
+                        help="optimization profile (default: phoenix.json or 'release')")
+    parser.add_argument("--cc", choices=sorted(BACKENDS),
+                        help="C back end (default: PHOENIX_CC, phoenix.json, else best installed)")
+    parser.add_argument("--tier", choices=TIERS,
+                        help="fast: quickest compile; opt: best code; auto: fast now, opt in the background")
+    parser.add_argument("--fast-math", action="store_true", default=None,
+                        help="allow -ffast-math floating point rewrites")
+    parser.add_argument("--pgo", action="store_true",
+                        help="profile-guided build: instrument, run once, rebuild")
+    parser.add_argument("--pgo-retrain", action="store_true",
+                        help="discard the stored PGO profile and train a new one")
+    parser.add_argument("--incremental", action="store_true",
+                        help="compile each function to its own cached object file")
+    parser.add_argument("--shared", action="store_true",
+                        help="build lib<name>.so exporting every function, plus ctypes bindings")
+    parser.add_argument("--extension", action="store_true",
+                        help="build a CPython extension module importable as <name>")
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 -m phoenix.cli <file.py>")
-        sys.exit(1)
+def _build_options(args):
+    from phoenix.backends import DEFAULT_TIER, configured_backend, select_backend
+    from phoenix.options import BuildOptions
+    from phoenix.profiles import load_project_config, resolve_profile
+
+    try:
+        profile = resolve_profile(args.profile, args.fast_math)
+        cc = args.cc or configured_backend()
+        tier = args.tier or load_project_config().get("tier", DEFAULT_TIER)
+        for t in ("fast", "opt") if tier == "auto" else (tier,):
+            backend = select_backend(cc, t)
+    except ValueError as e:
+        _emit(1, [f"❌ Error: {e}"])
+    pgo = args.pgo or args.pgo_retrain
+    if pgo and args.incremental:
+        _emit(1, ["❌ Error: --pgo and --incremental cannot be combined"])
+    if pgo and (tier != "opt" or not backend.pgo):
+        _emit(1, ["❌ Error: --pgo needs the opt tier and the gcc back end"])
+    for flag, enabled in (("--shared", args.shared), ("--extension", args.extension)):
+        if enabled and (pgo or args.incremental):
+            _emit(1, [f"❌ Error: {flag} cannot be combined with --pgo or --incremental"])
+    if args.shared and args.extension:
+        _emit(1, ["❌ Error: --shared and --extension cannot be combined"])
+    return BuildOptions(
+        profile=profile,
+        pgo=pgo,
+        pgo_retrain=args.pgo_retrain,
+        incremental=args.incremental,
+        shared=args.shared,
+        extension=args.extension,
+        cc=cc,
+        tier=tier,
+    )
+
+
+def _emit(code, lines):
+    for line in lines:
+        print(line)
+    if code != 0:
+        sys.exit(code)
+
+
+# ---- subcommands ------------------------------------------------
+def cmd_serve(argv):
+    import argparse
+
+    from phoenix import daemon
+
+    parser = argparse.ArgumentParser(prog="phoenix serve")
+    parser.add_argument("--socket", default=daemon.SOCKET_PATH)
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="concurrent gcc processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        daemon.serve(args.socket, args.jobs)
+    except RuntimeError as e:
+        _emit(1, [f"❌ Error: {e}"])
+
+
+def cmd_stop(argv):
+    import argparse
+
+    from phoenix import daemon
+
+    parser = argparse.ArgumentParser(prog="phoenix stop")
+    parser.add_argument("--socket", default=daemon.SOCKET_PATH)
+    args = parser.parse_args(argv)
+
+    reply = daemon.request({"op": "shutdown"}, args.socket)
+    if reply is None:
+        _emit(1, ["❌ Error: no phoenix daemon is running"])
+    _emit(reply["code"], reply["lines"])
+
+
+def cmd_build(argv):
+    import argparse
+
+    from phoenix.batch import build_many, collect_sources, describe_batch
+
+    parser = argparse.ArgumentParser(prog="phoenix build")
+    parser.add_argument("sources", nargs="+", help="directories, files or glob patterns")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="parallel workers (default: CPU count)")
+    parser.add_argument("--out-dir", default="build")
+    _add_build_args(parser)
+    args = parser.parse_args(argv)
+    options = _build_options(args)
+
+    files = collect_sources(args.sources)
+    if not files:
+        _emit(1, ["❌ Error: no Phoenix sources matched"])
+    _emit(*describe_batch(build_many(files, args.out_dir, args.jobs, options)))
+
+
+def cmd_watch(argv):
+    import argparse
+
+    from phoenix.watch import POLL_INTERVAL, Watcher
+
+    parser = argparse.ArgumentParser(prog="phoenix watch")
+    parser.add_argument("sources", nargs="+", help="files, directories or glob patterns")
+    parser.add_argument("--out-dir", default="build")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between checks for changed sources")
+    parser.add_argument("--no-run", action="store_true",
+                        help="rebuild only; do not execute the binaries")
+    _add_build_args(parser)
+    args = parser.parse_args(argv)
+    options = _build_options(args)
+
+    watcher = Watcher(args.sources, args.out_dir, options, run=not args.no_run)
+    try:
+        watcher.loop(args.interval)
+    except ValueError as e:
+        _emit(1, [f"❌ Error: {e}"])
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_optimize(argv):
+    import argparse
+
+    from phoenix.driver import BuildSession, describe_error
+
+    parser = argparse.ArgumentParser(prog="phoenix optimize")
+    parser.add_argument("files", nargs="+")
+    _add_build_args(parser)
+    args = parser.parse_args(argv)
+    options = _build_options(args)
 
-    filename = sys.argv[1]
+    # Fills the cache only; `--tier auto` builds run this in the background.
+    session = BuildSession(options=options)
+    code, lines = 0, []
+    for filename in args.files:
+        try:
+            session.optimize(filename)
+            lines.append(f"✓ {filename}: optimized build cached")
+        except Exception as e:
+            code = 1
+            lines.append(f"✗ {filename}")
+            lines.extend("    " + line for text in describe_error(e) for line in text.splitlines())
+    _emit(code, lines)
+
+
+def cmd_launcher(argv):
+    import argparse
+    import py_compile
+
+    from phoenix.launcher import build_launcher, default_interpreter
+
+    parser = argparse.ArgumentParser(prog="phoenix launcher")
+    parser.add_argument("-o", "--output", default="phoenix",
+                        help="path of the executable to write (default: ./phoenix)")
+    parser.add_argument("--python", default=None,
+                        help=f"interpreter line for the launcher (default: {default_interpreter()})")
+    args = parser.parse_args(argv)
 
     try:
-        # ---- read source ----
-        with open(filename, "r") as f:
-            source = f.read()
-            lines = source.splitlines()
-
-        # ---- compute cache key ----
-        src_hash = hash_source(source)
-        cached_bin = CACHE_DIR / f"{src_hash}.bin"
-
-        # ---- cache hit ----
-        if cached_bin.exists():
-            shutil.copyfile(cached_bin, "output")
-            print("✓ Using cached binary")
+        path = build_launcher(args.output, args.python)
+    except (OSError, RuntimeError, py_compile.PyCompileError) as e:
+        _emit(1, [f"❌ Error: {e}"])
+    _emit(0, [f"✓ Launcher written to {path}"])
+
+
+def cmd_cache(argv):
+    import argparse
+
+    from phoenix.cache import BinaryCache, format_size, parse_size
+
+    parser = argparse.ArgumentParser(prog="phoenix cache")
+    parser.add_argument("action", choices=["stats", "prune", "clear", "export"])
+    parser.add_argument("--max-bytes", type=parse_size, default=None,
+                        help="byte cap for prune, e.g. 512M (default: PHOENIX_CACHE_MAX_BYTES or 1G)")
+    parser.add_argument("--to", metavar="DIR",
+                        help="export: directory to publish as a shared read-only tier")
+    args = parser.parse_args(argv)
+    cache = BinaryCache(max_bytes=args.max_bytes)
+
+    if args.action == "export":
+        if not args.to:
+            _emit(1, ["❌ Error: cache export needs --to DIR"])
+        exported = cache.export(args.to)
+        _emit(0, [f"✓ Exported {exported['entries']} entries ({format_size(exported['bytes'])}) to {args.to}"])
+        return
+
+    if args.action == "stats":
+        s = cache.summary()
+        _emit(0, [
+            f"Entries:        {s['entries']}",
+            f"Size:           {format_size(s['bytes'])} / {format_size(s['max_bytes'])}",
+            f"Hits:           {s['hits']}",
+            f"Misses:         {s['misses']}",
+            f"Hit rate:       {s['hit_rate']:.1%}",
+            f"Compile saved:  ~{s['seconds_saved']:.2f}s",
+            *(
+                f"Shared tier:    {location}: {t.get('hits', 0)} hits, {t.get('misses', 0)} misses, "
+                f"{t.get('rejected', 0)} rejected"
+                for location, t in s["tiers"].items()
+            ),
+        ])
+        return
+
+    removed = cache.prune() if args.action == "prune" else cache.clear()
+    _emit(0, [f"✓ Removed {removed['entries']} entries ({format_size(removed['bytes'])})"])
+
+
+def cmd_compile(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="phoenix", usage=USAGE)
+    parser.add_argument("file")
+    parser.add_argument("-o", "--output", default=None,
+                        help="output path (default: ./output, or lib<name>.so / <name><EXT_SUFFIX>)")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="always compile in this process")
+    parser.add_argument("--time-passes", action="store_true",
+                        help="print wall time, CPU time and peak memory per compiler stage")
+    parser.add_argument("--report", metavar="FILE",
+                        help="write stage timings, node counts, C size and cache outcome as JSON")
+    parser.add_argument("--dump-after", metavar="PASS",
+                        help="check the file, print what the named checker pass produced and stop")
+    _add_build_args(parser)
+    args = parser.parse_args(argv)
+    if args.dump_after:
+        from phoenix.driver import dump_pass
+
+        _emit(*dump_pass(args.file, args.dump_after))
+        return
+    options = _build_options(args)
+    timed = args.time_passes or args.report
+    output = "output"
+    if args.output is not None:
+        output = args.output
+    elif options.shared:
+        from phoenix.bindings import shared_library_path
+
+        output = shared_library_path(args.file)
+    elif options.extension:
+        from phoenix.extension import extension_path
+
+        output = extension_path(args.file)
+
+    timer = _stage_timer() if timed else None
+
+    # The next identical command line can be served by cached_build.
+    from phoenix.fastpath import remember
+
+    remember(argv, options)
+
+    # ---- try the compile daemon ----
+    # Extensions must match this interpreter's ABI, which the daemon may not.
+    # Timings must come from this process.
+    use_daemon = not args.no_daemon and not options.extension and not timed
+    if use_daemon and not os.environ.get("PHOENIX_NO_DAEMON"):
+        from phoenix.daemon import remote_build
+
+        reply = remote_build(args.file, output, options.to_payload())
+        if reply is not None:
+            _emit(*reply)
             return
 
-        # ---- parse + check ----
-        tree = ast.parse(source)
-        type_ctx = check_types(tree, filename, lines)
+    # ---- no daemon: compile in-process ----
+    from phoenix.driver import BuildSession, execute
 
-        # ---- transpile ----
-        c_code = transpile(tree, type_ctx)
+    session = BuildSession(options=options)
+    if timer is not None:
+        session.timer = timer
+    code, lines = execute(session, args.file, output)
+    _finish_compile(args, timer, output, options.to_payload(), code, lines)
 
-        with open("output.c", "w") as f:
-            f.write(c_code)
 
-        # ---- compile ----
-        subprocess.run(
-            ["gcc", "output.c", "-o", "output"],
-            check=True
-        )
+def _stage_timer():
+    from phoenix.timing import StageTimer
 
-        # ---- store in cache ----
-        shutil.copyfile("output", cached_bin)
+    # Allocation tracing slows the front end; latency measurements turn it off.
+    return StageTimer(memory=os.environ.get("PHOENIX_TRACE_MEMORY") != "0")
 
-        print("✓ Compiled to native binary: ./output")
-        print("✓ Phoenix approved. Code is type-stable.")
 
-    except PhoenixError as e:
-        print(e.pretty())
-        sys.exit(1)
+def _finish_compile(args, timer, output, payload, code, lines):
+    if args.time_passes:
+        lines += ["", "Time per pass:", *timer.report()]
+    if args.report:
+        from phoenix.timing import write_report
 
-    except subprocess.CalledProcessError:
-        print("❌ PhoenixError [Backend]: generated C code failed to compile.")
-        sys.exit(1)
+        write_report(args.report, timer, {
+            "file": args.file,
+            "output": output,
+            "exit_code": code,
+            "binary_bytes": os.path.getsize(output) if code == 0 and os.path.exists(output) else None,
+            "options": payload,
+        })
+    _emit(code, lines)
 
-    except Exception as e:
-        print(f"❌ Error: {e}")
+
+COMMANDS = {
+    "build": cmd_build,
+    "cache": cmd_cache,
+    "launcher": cmd_launcher,
+    "optimize": cmd_optimize,
+    "serve": cmd_serve,
+    "stop": cmd_stop,
+    "watch": cmd_watch,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(USAGE)
         sys.exit(1)
 
+    command = COMMANDS.get(argv[0])
+    if command is not None:
+        command(argv[1:])
+        return
+
+    # ---- unchanged program, cached binary: only os and json imported ----
+    from phoenix.fastpath import NULL_TIMER, cached_build, parse_request
+
+    request = parse_request(argv)
+    if request is not None:
+        timer = _stage_timer() if request.time_passes or request.report else NULL_TIMER
+        lines = cached_build(request, timer)
+        if lines is not None:
+            _finish_compile(request, timer, request.output, request.options, 0, lines)
+            return
+    cmd_compile(argv)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+from phoenix.cache import ensure_cache_dir
+from phoenix.profiles import CONFIG_FILE
+
+
+def project_context() -> dict:
+    """What a build resolves against besides its arguments.
+
+    The working directory holds the cache and phoenix.json; the PHOENIX_*
+    variables and PATH choose compilers, module paths and cache tiers.
+    """
+    env = sorted(
+        [k, v] for k, v in os.environ.items()
+        if (k.startswith("PHOENIX_") and k != "PHOENIX_SOCKET") or k == "PATH"
+    )
+    try:
+        config = CONFIG_FILE.read_text()
+    except OSError:
+        config = ""
+    return {"cwd": os.getcwd(), "env": env, "config": config}
+
+
+def default_socket_path() -> str:
+    """One daemon per user and project: working directory plus environment.
+
+    PHOENIX_SOCKET overrides it; a daemon then declines requests from
+    other projects, which build in-process instead.
+    """
+    explicit = os.environ.get("PHOENIX_SOCKET")
+    if explicit:
+        return os.path.abspath(explicit)
+    context = project_context()
+    project = json.dumps([context["cwd"], context["env"]])
+    digest = hashlib.sha256(project.encode("utf-8")).hexdigest()[:16]
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime, f"phoenixd-{os.getuid()}-{digest}.sock")
+
+
+SOCKET_PATH = default_socket_path()
+
+
+# ---- client -----------------------------------------------------
+def request(payload: dict, socket_path: str = SOCKET_PATH) -> Optional[dict]:
+    """Send one request to a running daemon; None if no daemon answers."""
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                reply = stream.readline()
+    except OSError:
+        return None
+
+    if not reply:
+        return None
+    return json.loads(reply)
+
+
+def remote_build(
+    filename: str,
+    output: str,
+    options: Optional[dict] = None,
+    socket_path: str = SOCKET_PATH,
+) -> Optional[Tuple[int, List[str]]]:
+    reply = request(
+        {
+            "op": "build",
+            "file": os.path.abspath(filename),
+            "output": os.path.abspath(output),
+            "display": output,
+            "options": options or {},
+            "context": project_context(),
+        },
+        socket_path,
+    )
+    if reply is None or reply.get("declined"):
+        return None
+    return reply["code"], reply["lines"]
+
+
+# ---- server -----------------------------------------------------
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            payload = json.loads(line)
+            reply = self.server.dispatch(payload)
+        except Exception as e:
+            payload, reply = {}, {"code": 1, "lines": [f"❌ Error: {e}"]}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+        if payload.get("op") == "shutdown":
+            # shutdown() blocks until serve_forever returns, so hand it off.
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, jobs: int):
+        from phoenix.driver import BuildSession
+
+        self.jobs = jobs
+        self.context = project_context()
+        self.session = BuildSession(jobs=jobs, background="thread")
+        self._lock = threading.Lock()
+        super().__init__(socket_path, _Handler)
+
+    def _session_for(self, context: Optional[dict]):
+        """The session to build a client's request in, or None if this daemon cannot.
+
+        Only a client in the daemon's own directory and environment resolves
+        the same cache, modules and compilers. An edited phoenix.json is
+        picked up by starting a fresh session.
+        """
+        from phoenix.driver import BuildSession
+
+        if context is None or [context["cwd"], context["env"]] != [self.context["cwd"], self.context["env"]]:
+            return None
+        with self._lock:
+            if context["config"] != self.context["config"]:
+                self.session = BuildSession(jobs=self.jobs, background="thread")
+                self.context = context
+            return self.session
+
+    def dispatch(self, payload: dict) -> dict:
+        from phoenix.driver import BuildOptions, execute
+
+        op = payload.get("op")
+        if op == "ping":
+            return {"code": 0, "lines": ["✓ phoenix daemon running"]}
+        if op == "shutdown":
+            return {"code": 0, "lines": ["✓ phoenix daemon stopped"]}
+        if op == "build":
+            session = self._session_for(payload.get("context"))
+            if session is None:
+                return {"declined": True, "code": 1, "lines": ["❌ Error: daemon serves another project"]}
+            # Clients resolve phoenix.json themselves and send the outcome.
+            options = BuildOptions.from_payload(payload.get("options", {}))
+            code, lines = execute(session, payload["file"], payload["output"], payload.get("display"), options)
+            return {"code": code, "lines": lines}
+        return {"code": 1, "lines": [f"❌ Error: unknown daemon request '{op}'"]}
+
+
+def serve(socket_path: str = SOCKET_PATH, jobs: Optional[int] = None) -> None:
+    ensure_cache_dir()
+    if os.path.exists(socket_path):
+        if request({"op": "ping"}, socket_path) is not None:
+            raise RuntimeError(f"a phoenix daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a crashed daemon
+
+    server = CompileServer(socket_path, jobs or os.cpu_count() or 1)
+    print(f"✓ phoenix daemon listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,667 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from phoenix.analysis_cache import analysis_key, load_analysis, store_analysis
+from phoenix.backends import DEFAULT_TIER
+from phoenix.bindings import (
+    SYMBOL_PREFIX,
+    exported_functions,
+    generate_bindings,
+    shared_library_path,
+    wrapper_path,
+)
+from phoenix.cache import BinaryCache, StatIndex, atomic_copy, cache_key, hash_source, toolchain_fingerprint
+from phoenix.checker import check_types
+from phoenix.errors import PhoenixError
+from phoenix.extension import extension_path, generate_extension, module_name, python_include
+from phoenix.modules import ModuleInterface, ModuleLoader
+from phoenix.options import BuildOptions, index_context
+from phoenix.passes import PassDump
+from phoenix.pgo import compile_with_pgo, profile_path
+from phoenix.timing import NULL_TIMER
+from phoenix.transpiler import TranslationUnit, transpile, transpile_module, transpile_units
+from phoenix.type_inference import TypeContext
+
+
+class BackendError(Exception):
+    """The C compiler rejected the generated code."""
+
+    def __init__(self, stderr: str):
+        super().__init__(stderr)
+        self.stderr = stderr
+
+
+@dataclass
+class Analysis:
+    """Front end output: the checked tree plus the modules it links against."""
+
+    tree: ast.Module
+    type_ctx: TypeContext
+    modules: List[ModuleInterface] = field(default_factory=list)
+
+    @property
+    def uses_math(self) -> bool:
+        return self.type_ctx.uses_math or any(m.uses_math for m in self.modules)
+
+
+def front_end(
+    source: str,
+    filename: str,
+    loader: ModuleLoader,
+    timer=NULL_TIMER,
+    tree: Optional[ast.Module] = None,
+    dump_after: Optional[str] = None,
+) -> Analysis:
+    """Parse (unless a tree for this source is given), resolve imports and type-check.
+
+    With dump_after, checking stops with a PassDump after that pass.
+    """
+    if tree is None:
+        with timer.stage("parse"):
+            tree = ast.parse(source)
+    lines = source.splitlines()
+    with timer.stage("resolve imports"):
+        imports, modules = loader.resolve(tree, filename, lines)
+    type_ctx = check_types(tree, filename, lines, imports, timer, dump_after)
+    return Analysis(tree, type_ctx, modules)
+
+
+@dataclass
+class Generated:
+    """Back end input: C code (translation units when incremental) plus extras."""
+
+    code: Any
+    uses_math: bool
+    modules: List[ModuleInterface] = field(default_factory=list)
+    bindings: Optional[str] = None
+
+
+def generate(analysis: Analysis, source: str, filename: str, output: str, options: BuildOptions) -> Generated:
+    """Transpile an analysed program the way the build options ask for."""
+    tree, type_ctx = analysis.tree, analysis.type_ctx
+    bindings = None
+    if options.library:
+        lines = source.splitlines()
+        exports = exported_functions(tree, type_ctx, filename, lines)
+        code = transpile_module(tree, type_ctx, {e.name: SYMBOL_PREFIX + e.name for e in exports})
+        if options.extension:
+            code = generate_extension(module_name(filename, lines), code, exports)
+        else:
+            bindings = generate_bindings(os.path.basename(filename), output, exports)
+    elif options.incremental:
+        code = transpile_units(tree, type_ctx)
+    else:
+        code = transpile(tree, type_ctx)
+    return Generated(code, analysis.uses_math, analysis.modules, bindings)
+
+
+# Front end results a session keeps in memory. The daemon's session lives
+# for as long as the daemon, and every edit makes a new entry.
+MAX_SESSION_ANALYSES = 64
+
+
+def _remember(entries: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > MAX_SESSION_ANALYSES:
+        entries.popitem(last=False)
+
+
+@dataclass
+class BuildResult:
+    output: str
+    cached: bool
+    pgo_trained: Optional[bool] = None
+    recompiled_units: Optional[Tuple[int, int]] = None
+    kind: str = "binary"
+    bindings: Optional[str] = None
+    tier: str = DEFAULT_TIER
+    backend: str = ""
+    optimize_pending: bool = False
+
+
+class BuildSession:
+    """Compilation state that can outlive a single build.
+
+    The CLI creates a throwaway session per invocation; the compile daemon
+    keeps one alive so parsed trees, type contexts and cache lookups are
+    reused across requests.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        options: Optional[BuildOptions] = None,
+        cache: Optional[BinaryCache] = None,
+        background: str = "process",
+    ):
+        self.background = background
+        self.timer = NULL_TIMER
+        # Least recently used first; both are bounded by MAX_SESSION_ANALYSES.
+        self.analyses: "OrderedDict[str, Analysis]" = OrderedDict()
+        self.trees: "OrderedDict[str, ast.Module]" = OrderedDict()
+        self.modules = ModuleLoader()
+        self.options = options or BuildOptions()
+        self.cache = cache if cache is not None else BinaryCache()
+        self.stat_index = StatIndex(self.cache.root)
+        self.backend_slots = threading.BoundedSemaphore(max(1, jobs))
+        self._lock = threading.Lock()
+
+    # ---- front end -----------------------------------------------
+    def analyze(self, source: str, filename: str) -> Analysis:
+        # Imported signatures feed inference, so they are part of the key;
+        # the tree depends on the source alone and survives dependency edits.
+        source_hash = hash_source(source)
+        key = analysis_key(source_hash, self.modules.dependency_digest(source, filename))
+        with self._lock:
+            cached = self.analyses.get(key)
+            tree = self.trees.get(source_hash)
+            if cached is not None:
+                self.analyses.move_to_end(key)
+            if tree is not None:
+                self.trees.move_to_end(source_hash)
+        if cached is not None:
+            return cached
+
+        # ---- analysed by an earlier process ----
+        with self.timer.stage("load analysis"):
+            analysis = load_analysis(self.cache, key, source, tree)
+        if analysis is None:
+            analysis = front_end(source, filename, self.modules, self.timer, tree)
+            store_analysis(self.cache, key, analysis)
+        if self.timer.active:
+            self.timer.note("ast_nodes", sum(1 for _ in ast.walk(analysis.tree)))
+            self.timer.note("functions", len(analysis.type_ctx.functions))
+
+        with self._lock:
+            _remember(self.analyses, key, analysis)
+            _remember(self.trees, source_hash, analysis.tree)
+        return analysis
+
+    # ---- back end ------------------------------------------------
+    def run_backend(self, cmd: List[str]) -> None:
+        with self.backend_slots:
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise BackendError(proc.stderr)
+
+    def compile_program(
+        self,
+        c_code: str,
+        output: str,
+        uses_math: bool,
+        options: Optional[BuildOptions] = None,
+        filename: Optional[str] = None,
+        objects: Tuple[str, ...] = (),
+    ) -> Optional[bool]:
+        """Compile generated C to output; returns whether PGO trained, if used."""
+        options = options or self.options
+        cc = [options.backend.executable, *options.compile_flags()]
+        libs = [*objects, "-lm"] if uses_math else list(objects)
+        if options.library:
+            cc.append("-shared")
+        if options.extension:
+            cc.append(f"-I{python_include()}")
+
+        if options.pgo and filename is not None:
+            gcda = profile_path(filename, options.profile.name)
+            return compile_with_pgo(
+                self.run_backend, cc, c_code, output, libs, gcda, options.pgo_retrain
+            )
+
+        c_path = f"{output}.c"
+        with self.timer.stage("write C"):
+            with open(c_path, "w") as f:
+                f.write(c_code)
+        self.run_backend([*cc, c_path, "-o", output, *libs])
+        return None
+
+    def compile_units(
+        self,
+        units: List[TranslationUnit],
+        output: str,
+        uses_math: bool,
+        options: Optional[BuildOptions] = None,
+        objects: Tuple[str, ...] = (),
+    ) -> Tuple[int, int]:
+        """Compile each unit to a cached object file, then link.
+
+        Objects are keyed by the unit's C text, its inferred signature, the
+        flags and the toolchain, so only edited functions reach gcc again.
+        Returns (units recompiled, units total).
+        """
+        options = options or self.options
+        cc = options.backend.executable
+        flags = options.compile_flags()
+        fingerprint = repr(sorted(toolchain_fingerprint(cc).items()))
+        libs = ["-lm"] if uses_math else []
+
+        def _object_key(unit: TranslationUnit) -> str:
+            material = "\0".join([unit.code, unit.signature, " ".join(flags), fingerprint])
+            return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+        keys = [_object_key(u) for u in units]
+        compiled: Dict[str, str] = {}
+        missing = []
+        for unit, key in zip(units, keys):
+            path = self.cache.lookup(key, ".o")
+            if path is None:
+                missing.append((unit, key))
+            else:
+                compiled[key] = str(path)
+
+        with tempfile.TemporaryDirectory(prefix="phoenix-obj-") as tmp:
+            def _compile(unit: TranslationUnit, key: str) -> None:
+                started = time.perf_counter()
+                c_path = os.path.join(tmp, f"{unit.name}.c")
+                obj_path = os.path.join(tmp, f"{unit.name}.o")
+                with open(c_path, "w") as f:
+                    f.write(unit.code)
+                self.run_backend([cc, *flags, "-c", c_path, "-o", obj_path])
+                stored = self.cache.store(key, obj_path, time.perf_counter() - started, suffix=".o")
+                compiled[key] = str(stored)
+
+            if missing:
+                with ThreadPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as pool:
+                    for future in [pool.submit(_compile, u, k) for u, k in missing]:
+                        future.result()
+
+        self.run_backend([cc, *flags, *(compiled[k] for k in keys), *objects, "-o", output, *libs])
+        return len(missing), len(units)
+
+    def module_objects(self, modules: List[ModuleInterface], options: Optional[BuildOptions] = None) -> List[str]:
+        """Object files for imported modules, compiled once per module and flag set."""
+        options = options or self.options
+        cc = options.backend.executable
+        flags = options.compile_flags()
+        fingerprint = repr(sorted(toolchain_fingerprint(cc).items()))
+        paths = []
+        for module in modules:
+            material = "\0".join([module.key, " ".join(flags), fingerprint])
+            key = hashlib.sha256(material.encode("utf-8")).hexdigest()
+            path = self.cache.lookup(key, ".o")
+            if path is None:
+                started = time.perf_counter()
+                with tempfile.TemporaryDirectory(prefix="phoenix-mod-") as tmp:
+                    c_path = os.path.join(tmp, f"{module.name}.c")
+                    obj_path = os.path.join(tmp, f"{module.name}.o")
+                    with open(c_path, "w") as f:
+                        f.write(self.modules.emit_object_source(module))
+                    self.run_backend([cc, *flags, "-c", c_path, "-o", obj_path])
+                    path = self.cache.store(key, obj_path, time.perf_counter() - started, suffix=".o")
+            paths.append(str(path))
+        return paths
+
+    # ---- binary cache --------------------------------------------
+    def key_for(self, source: str, filename: str, options: Optional[BuildOptions] = None) -> str:
+        options = options or self.options
+        flags = options.cache_flags()
+        digest = self.modules.dependency_digest(source, filename)
+        if digest:
+            flags.append(f"modules={digest}")
+        key = cache_key(self.cache.source_digest(source), flags, options.backend.executable)
+        deps = self.modules.dependency_paths(source, filename) if digest else []
+        self.stat_index.record(filename, self._index_context(options), deps, key)
+        return key
+
+    def _index_context(self, options: BuildOptions) -> str:
+        return index_context(options, self.modules.search_path)
+
+    def indexed_key(self, filename: str, options: Optional[BuildOptions] = None) -> Optional[str]:
+        """Cache key of a program whose files are unchanged since it was last keyed."""
+        options = options or self.options
+        key = self.stat_index.lookup(filename, self._index_context(options))
+        return key if key is not None and self.cache.has(key) else None
+
+    def code_key(self, generated: Generated, options: Optional[BuildOptions] = None) -> str:
+        """Key on the generated code itself: sources that transpile alike share a binary."""
+        options = options or self.options
+        code = generated.code if isinstance(generated.code, str) else "\0".join(u.code for u in generated.code)
+        material = [code, generated.bindings or "", str(generated.uses_math), *(m.key for m in generated.modules)]
+        flags = [*options.cache_flags(), "stage=c"]
+        return cache_key(hash_source("\0".join(material)), flags, options.backend.executable)
+
+    def _companions(self, key: str, output: str, options: BuildOptions) -> List[Tuple[str, str, str]]:
+        """(cache key, suffix, path) of files cached alongside the binary."""
+        if not options.shared:
+            return []
+        bindings_key = hashlib.sha256(f"{key}:bindings".encode("utf-8")).hexdigest()
+        return [(bindings_key, ".py", wrapper_path(output))]
+
+    def fetch_cached(self, key: str, output: str, options: Optional[BuildOptions] = None) -> bool:
+        """Copy a cached binary (and its companions) to output; False on a miss."""
+        companions = self._companions(key, output, options or self.options)
+        found = [self.cache.lookup(k, suffix) for k, suffix, _ in companions]
+        if None in found:
+            return False
+        if not self.cache.fetch(key, output):
+            return False
+        for cached, (_, _, path) in zip(found, companions):
+            atomic_copy(str(cached), path)
+        return True
+
+    def publish(self, key: str, output: str, compile_seconds: float = 0.0, options: Optional[BuildOptions] = None) -> None:
+        for companion_key, suffix, path in self._companions(key, output, options or self.options):
+            self.cache.store(companion_key, path, suffix=suffix)
+        self.cache.store(key, output, compile_seconds)
+
+    def link(self, key: str, target: str, options: Optional[BuildOptions] = None) -> None:
+        """Make key (and its companions) resolve to the entries published under target."""
+        options = options or self.options
+        pairs = zip(self._companions(key, "", options), self._companions(target, "", options))
+        for (companion_key, suffix, _), (companion_target, _, _) in pairs:
+            self.cache.link(companion_key, companion_target, suffix)
+        self.cache.link(key, target)
+
+    # ---- pipeline ------------------------------------------------
+    def back_end(
+        self,
+        generated: Generated,
+        output: str,
+        options: Optional[BuildOptions] = None,
+        filename: Optional[str] = None,
+    ) -> BuildResult:
+        """Compile generated code (and imported modules) to output."""
+        options = options or self.options
+        objects = tuple(self.module_objects(generated.modules, options))
+
+        result = BuildResult(
+            output, cached=False, kind=_output_kind(options), tier=options.tier, backend=options.backend.name
+        )
+        if options.incremental and not options.library:
+            result.recompiled_units = self.compile_units(
+                generated.code, output, generated.uses_math, options, objects
+            )
+        else:
+            result.pgo_trained = self.compile_program(
+                generated.code, output, generated.uses_math, options, filename, objects
+            )
+
+        if generated.bindings is not None:
+            result.bindings = wrapper_path(output)
+            with open(result.bindings, "w") as f:
+                f.write(generated.bindings)
+        return result
+
+    def build(self, filename: str, output: str = "output", options: Optional[BuildOptions] = None) -> BuildResult:
+        try:
+            return self._build_file(filename, output, options or self.options)
+        finally:
+            self.cache.flush()  # one journal write per build, whatever it hit
+
+    def _build_file(self, filename: str, output: str, options: BuildOptions) -> BuildResult:
+        # ---- unchanged files: no read, no hash ----
+        fast_options = options.at_tier("opt") if options.tier == "auto" else options
+        if not options.pgo_retrain:
+            with self.timer.stage("cache lookup"):
+                key = self.indexed_key(filename, fast_options)
+                hit = key is not None and self.fetch_cached(key, output, fast_options)
+            if hit:
+                return self._cached_result(output, fast_options)
+
+        with self.timer.stage("read"):
+            with open(filename, "r") as f:
+                source = f.read()
+
+        if options.tier != "auto":
+            return self._build(source, filename, output, options)
+
+        # ---- auto tier: optimized binary if cached, else fast now + opt later ----
+        optimized = options.at_tier("opt")
+        if self.fetch_cached(self.key_for(source, filename, optimized), output, optimized):
+            return self._cached_result(output, optimized)
+        result = self._build(source, filename, output, options.at_tier("fast"))
+        self.schedule_optimize([filename], optimized)
+        result.optimize_pending = True
+        return result
+
+    def _cached_result(self, output: str, options: BuildOptions) -> BuildResult:
+        self.timer.note("cache", "hit")
+        bindings = wrapper_path(output) if options.shared else None
+        return BuildResult(output, cached=True, kind=_output_kind(options), bindings=bindings, tier=options.tier)
+
+    def _build(self, source: str, filename: str, output: str, options: BuildOptions) -> BuildResult:
+        # ---- cache hit ----
+        with self.timer.stage("cache lookup"):
+            key = self.key_for(source, filename, options)
+            hit = not options.pgo_retrain and self.fetch_cached(key, output, options)
+        if hit:
+            return self._cached_result(output, options)
+
+        # Concurrent misses on one key queue here; the first one builds it.
+        with self.cache.key_lock(key):
+            # The shared tiers were asked moments ago; only a local build can have appeared.
+            if not options.pgo_retrain and self.cache.has(key, shared=False) and self.fetch_cached(key, output, options):
+                return self._cached_result(output, options)
+            started = time.perf_counter()
+
+            # ---- parse + check + transpile ----
+            analysis = self.analyze(source, filename)
+            with self.timer.stage("transpile"):
+                generated = generate(analysis, source, filename, output, options)
+            return self._finish_staged(key, generated, output, options, filename, started)
+
+    def finish_staged(
+        self,
+        key: str,
+        generated: Generated,
+        output: str,
+        options: Optional[BuildOptions] = None,
+        filename: Optional[str] = None,
+        started: Optional[float] = None,
+    ) -> BuildResult:
+        """finish() code generated elsewhere (batch front ends) the way build() does.
+
+        Holds key's lock, so a concurrent build of the same program waits and
+        then takes the cached binary instead of compiling it again.
+        """
+        options = options or self.options
+        with self.cache.key_lock(key):
+            if not options.pgo_retrain and self.cache.has(key) and self.fetch_cached(key, output, options):
+                return self._cached_result(output, options)
+            return self._finish_staged(key, generated, output, options, filename, started)
+
+    def _finish_staged(
+        self,
+        key: str,
+        generated: Generated,
+        output: str,
+        options: BuildOptions,
+        filename: Optional[str],
+        started: Optional[float],
+    ) -> BuildResult:
+        with tempfile.TemporaryDirectory(prefix="phoenix-build-") as tmp:
+            # Build privately; other invocations only ever see finished files.
+            # Bindings only name the library by basename, which is the same here.
+            staged = os.path.join(tmp, os.path.basename(output))
+            result = self.finish(key, generated, staged, options, filename, started)
+            self._install(staged, output, result)
+        return result
+
+    def finish(
+        self,
+        key: str,
+        generated: Generated,
+        output: str,
+        options: Optional[BuildOptions] = None,
+        filename: Optional[str] = None,
+        started: Optional[float] = None,
+    ) -> BuildResult:
+        """Compile generated code unless identical code is cached, and publish it under key."""
+        options = options or self.options
+        started = time.perf_counter() if started is None else started
+
+        if self.timer.active:
+            units = [generated.code] if isinstance(generated.code, str) else [u.code for u in generated.code]
+            self.timer.note("c_lines", sum(code.count("\n") for code in units))
+
+        # ---- identical C already compiled ----
+        code_key = self.code_key(generated, options)
+        with self.timer.stage("cache lookup"):
+            reuse = not options.pgo_retrain and self.cache.has(code_key)
+            reuse = reuse and self.fetch_cached(code_key, output, options)
+        if reuse:
+            self.link(key, code_key, options)
+            result = self._cached_result(output, options)
+            self.timer.note("cache", "code hit")
+            return result
+
+        # ---- compile ----
+        with self.timer.stage("compile"):
+            result = self.back_end(generated, output, options, filename)
+
+        # ---- store in cache ----
+        with self.timer.stage("cache store"):
+            self.publish(code_key, output, time.perf_counter() - started, options)
+            self.link(key, code_key, options)
+        self.timer.note("cache", "miss")
+        return result
+
+    def _install(self, staged: str, output: str, result: BuildResult) -> None:
+        """Move a finished build from its private directory to output."""
+        atomic_copy(staged, output, mode=0o755)
+        if os.path.exists(f"{staged}.c"):
+            atomic_copy(f"{staged}.c", f"{output}.c")
+        result.output = output
+        if result.bindings is not None:
+            result.bindings = wrapper_path(output)
+            atomic_copy(wrapper_path(staged), result.bindings)
+
+    # ---- tiers ---------------------------------------------------
+    def schedule_optimize(self, files: List[str], options: BuildOptions) -> None:
+        """Rebuild files at the opt tier in the background, into the cache only.
+
+        A long-lived session (the daemon) uses a thread; otherwise a detached
+        `phoenix optimize` process outlives this one.
+        """
+        if self.background == "thread":
+            def _run() -> None:
+                for filename in files:
+                    try:
+                        self.optimize(filename, options)
+                    except Exception:
+                        pass  # the next build reports the error in the foreground
+            threading.Thread(target=_run, daemon=True).start()
+            return
+
+        # The child imports phoenix from wherever this process did (a checkout or a launcher).
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+        subprocess.Popen(
+            [sys.executable, "-m", "phoenix.cli", "optimize", *files, *options.at_tier("opt").to_args()],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def optimize(self, filename: str, options: Optional[BuildOptions] = None) -> BuildResult:
+        """Build the opt tier of a program into the cache without keeping an output."""
+        options = (options or self.options).at_tier("opt")
+        with tempfile.TemporaryDirectory(prefix="phoenix-opt-") as tmp:
+            # Library outputs keep their real names: bindings refer to them.
+            if options.shared:
+                output = shared_library_path(filename, tmp)
+            elif options.extension:
+                output = extension_path(filename, tmp)
+            else:
+                output = os.path.join(tmp, "output")
+            return self.build(filename, output, options)
+
+
+def _output_kind(options: BuildOptions) -> str:
+    if options.extension:
+        return "extension module"
+    if options.shared:
+        return "shared library"
+    return "binary"
+
+
+def _describe_tier(result: BuildResult) -> List[str]:
+    if result.optimize_pending:
+        return ["✓ Fast tier build; optimized rebuild running in the background"]
+    if result.tier == "fast":
+        return [f"✓ Fast tier build ({result.backend})" if result.backend else "✓ Fast tier build"]
+    return []
+
+
+def describe_build(result: BuildResult, display: Optional[str] = None) -> List[str]:
+    if result.kind != "binary":
+        what = "Using cached" if result.cached else "Compiled"
+        lines = [f"✓ {what} {result.kind}: {_display_path(display or result.output)}"]
+        if result.bindings is not None:
+            bindings = wrapper_path(display) if display else result.bindings
+            lines.append(f"✓ Python bindings: {_display_path(bindings)}")
+        return lines + _describe_tier(result)
+    if result.cached:
+        return ["✓ Using cached binary"] + _describe_tier(result)
+    lines = [f"✓ Compiled to native binary: {_display_path(display or result.output)}"]
+    lines.extend(_describe_tier(result))
+    if result.pgo_trained is not None:
+        how = "freshly trained" if result.pgo_trained else "stored"
+        lines.append(f"✓ Profile-guided build ({how} profile)")
+    if result.recompiled_units is not None:
+        changed, total = result.recompiled_units
+        lines.append(f"✓ Incremental build: recompiled {changed}/{total} translation units")
+    lines.append("✓ Phoenix approved. Code is type-stable.")
+    return lines
+
+
+def describe_error(exc: Exception) -> List[str]:
+    if isinstance(exc, PhoenixError):
+        return [exc.pretty()]
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return ["❌ PhoenixError [Backend]: PGO training run timed out."]
+    if isinstance(exc, BackendError):
+        lines = ["❌ PhoenixError [Backend]: generated C code failed to compile."]
+        if exc.stderr:
+            lines.append(exc.stderr.rstrip())
+        return lines
+    return [f"❌ Error: {exc}"]
+
+
+def execute(
+    session: BuildSession,
+    filename: str,
+    output: str = "output",
+    display: Optional[str] = None,
+    options: Optional[BuildOptions] = None,
+) -> Tuple[int, List[str]]:
+    """Run one build and return (exit code, lines to print)."""
+    try:
+        result = session.build(filename, output, options)
+    except Exception as e:
+        return 1, describe_error(e)
+    return 0, describe_build(result, display)
+
+
+def dump_pass(filename: str, pass_name: str) -> Tuple[int, List[str]]:
+    """Check filename up to pass_name and return (exit code, what that pass produced)."""
+    try:
+        with open(filename) as f:
+            source = f.read()
+        front_end(source, filename, ModuleLoader(), dump_after=pass_name)
+    except PassDump as dump:
+        return 0, [f"--- after {dump.name} ---", dump.text]
+    except Exception as e:
+        return 1, describe_error(e)
+    return 1, [f"❌ Error: pass '{pass_name}' did not run"]
+
+
+def _display_path(path: str) -> str:
+    if "/" in path:
+        return path
+    return f"./{path}"
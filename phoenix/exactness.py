@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import ast
+from typing import Dict, List, Tuple
+
+from phoenix.bindings import static_interval
+from phoenix.checker import check_types
+from phoenix.errors import PhoenixError
+from phoenix.type_inference import TypeContext
+from phoenix.types import FloatType, IntType, StringType
+
+_INT_MIN, _INT_MAX = -(2**31), 2**31 - 1
+
+
+class _Exactness:
+    """Refuses code whose C lowering could give a different result than Python.
+
+    Only what the transpiler lowers faithfully is accepted: int and float
+    arithmetic with +, -, * and float /, single comparisons of numbers,
+    indexes with static non-negative bounds, and int arithmetic whose
+    operands are constants or range() loop variables, so it cannot
+    overflow C's 32-bit int. Where Python raises and C would carry on
+    with inf or nan, the code is refused: a float is only divided by a
+    nonzero constant, and math.sqrt only takes what cannot be negative.
+    """
+
+    def __init__(self, func: ast.FunctionDef, type_ctx: TypeContext, filename: str, lines: List[str]):
+        self.func = func
+        self.types = type_ctx.node_types
+        self.filename = filename
+        self.lines = lines
+        self.reassigned = {
+            node.targets[0].id
+            for node in ast.walk(func)
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name)
+        }
+
+    def check(self) -> None:
+        self._block(self.func.body, {}, top=True)
+
+    def _block(self, stmts: List[ast.stmt], loops: Dict[str, Tuple[int, int]], top: bool = False) -> None:
+        for stmt in stmts:
+            if isinstance(stmt, ast.Return):
+                if not top or stmt.value is None:
+                    self._refuse(stmt, "only a value returned from the function body is compiled")
+                self._expr(stmt.value, loops)
+            elif isinstance(stmt, ast.Assign):
+                target = stmt.targets[0]
+                if len(stmt.targets) != 1 or not isinstance(target, (ast.Name, ast.Subscript)):
+                    self._refuse(stmt, "only single-name and single-index assignments are compiled")
+                if isinstance(target, ast.Subscript):
+                    self._expr(target, loops)
+                if isinstance(stmt.value, ast.List) and isinstance(target, ast.Name):
+                    for element in stmt.value.elts:
+                        self._expr(element, loops)
+                else:
+                    self._expr(stmt.value, loops)
+            elif isinstance(stmt, ast.For):
+                if stmt.orelse:
+                    self._refuse(stmt, "for-else is not compiled")
+                r = range(*(arg.value for arg in stmt.iter.args))
+                inner = dict(loops)
+                if stmt.target.id in self.reassigned or not r:
+                    inner.pop(stmt.target.id, None)
+                else:
+                    inner[stmt.target.id] = (r[0], r[-1])
+                self._block(stmt.body, inner)
+            elif isinstance(stmt, ast.If):
+                self._expr(stmt.test, loops)
+                self._block(stmt.body, loops)
+                self._block(stmt.orelse, loops)
+            elif isinstance(stmt, ast.Expr) and _is_call(stmt.value, "print") and len(stmt.value.args) == 1:
+                arg = stmt.value.args[0]
+                if not isinstance(self.types.get(arg), (IntType, StringType)):
+                    self._refuse(stmt, "C prints floats and bools differently from Python")
+                self._expr(arg, loops)
+            elif not isinstance(stmt, ast.Pass):
+                self._refuse(stmt, f"{type(stmt).__name__} statements are not compiled")
+
+    def _expr(self, node: ast.expr, loops: Dict[str, Tuple[int, int]]) -> None:
+        if isinstance(node, ast.Name):
+            return
+        if isinstance(node, ast.Constant):
+            if type(node.value) is int and not _INT_MIN <= node.value <= _INT_MAX:
+                self._refuse(node, "the int literal does not fit in a C int")
+            return
+        if isinstance(node, ast.Subscript):
+            bounds = static_interval(node.slice, loops)
+            length = getattr(self.types.get(node.value), "length", None)
+            if bounds is None or bounds[0] < 0 or (length is not None and bounds[1] >= length):
+                self._refuse(node, "the index is not statically within the list")
+            # Inference does not type indexes; every step of a bounded one is an int.
+            for step in ast.walk(node.slice):
+                if isinstance(step, ast.BinOp):
+                    self._fits(step, loops)
+            self._expr(node.value, loops)
+            return
+        if isinstance(node, ast.Compare):
+            self._expr(node.left, loops)
+            self._expr(node.comparators[0], loops)
+            return
+        if isinstance(node, ast.Call):
+            if _is_call(node, "int"):
+                if not isinstance(self.types.get(node.args[0]), IntType):
+                    self._refuse(node, "int() of a float can overflow a C int")
+            elif _is_sqrt(node):
+                if not _non_negative(node.args[0]):
+                    self._refuse(node, "math.sqrt of a negative number raises in Python; C returns nan")
+            elif not _is_call(node, self.func.name):
+                self._refuse(node, "only math.sqrt, int and the function itself can be called")
+            for arg in node.args:
+                self._expr(arg, loops)
+            return
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+                self._refuse(node, f"operator {type(node.op).__name__} is not compiled")
+            if not all(isinstance(self.types.get(n), (IntType, FloatType)) for n in (node.left, node.right)):
+                self._refuse(node, "only int and float arithmetic is compiled")
+            if isinstance(self.types.get(node), IntType):
+                if isinstance(node.op, ast.Div):
+                    self._refuse(node, "C divides ints as integers; Python's / does not")
+                self._fits(node, loops)
+            elif isinstance(node.op, ast.Div) and not _nonzero_constant(node.right):
+                self._refuse(node, "division by zero raises in Python; C returns inf or nan")
+            self._expr(node.left, loops)
+            self._expr(node.right, loops)
+            return
+        self._refuse(node, f"{type(node).__name__} expressions are not compiled")
+
+    def _fits(self, node: ast.BinOp, loops: Dict[str, Tuple[int, int]]) -> None:
+        bounds = static_interval(node, loops)
+        if bounds is None or bounds[0] < _INT_MIN or bounds[1] > _INT_MAX:
+            self._refuse(node, "int arithmetic that can overflow a C int")
+
+    def _refuse(self, node: ast.AST, reason: str) -> None:
+        raise PhoenixError(
+            f"Cannot compile '{self.func.name}' exactly: {reason}",
+            lineno=node.lineno,
+            col=node.col_offset + 1,
+            source=self.lines[node.lineno - 1],
+            filename=self.filename,
+        )
+
+
+def _is_call(node: ast.AST, name: str) -> bool:
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+
+def _is_sqrt(node: ast.Call) -> bool:
+    func = node.func
+    return isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and (func.value.id, func.attr) == ("math", "sqrt")
+
+
+def _nonzero_constant(node: ast.expr) -> bool:
+    return isinstance(node, ast.Constant) and type(node.value) in (int, float) and node.value != 0
+
+
+def _non_negative(node: ast.expr) -> bool:
+    """Whether node cannot be negative: constants, squares, sums and products of those, roots."""
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, float) and node.value >= 0
+    if isinstance(node, ast.Call):
+        return _is_sqrt(node)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult) and ast.dump(node.left) == ast.dump(node.right):
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult, ast.Div)):
+        return _non_negative(node.left) and _non_negative(node.right)
+    return False
+
+
+def check_exact(program: str, filename: str) -> None:
+    """Raise PhoenixError unless every function in program lowers exactly."""
+    tree = ast.parse(program)
+    lines = program.splitlines()
+    type_ctx = check_types(tree, filename, lines)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            _Exactness(node, type_ctx, filename, lines).check()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import os
+import sys
+import sysconfig
+from typing import List
+
+from phoenix.bindings import SYMBOL_PREFIX, Export
+from phoenix.errors import PhoenixError
+from phoenix.types import BoolType, FloatType, IntType, ListType, StringType, Type, UnknownType
+
+
+def python_abi() -> str:
+    """ABI tag of the running interpreter; extensions are cached per tag."""
+    return sysconfig.get_config_var("SOABI") or sys.implementation.cache_tag
+
+
+def python_include() -> str:
+    return sysconfig.get_paths()["include"]
+
+
+def extension_path(filename: str, directory: str = ".") -> str:
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    suffix = sysconfig.get_config_var("EXT_SUFFIX") or ".so"
+    return os.path.join(directory, f"{stem}{suffix}")
+
+
+def module_name(filename: str, lines: List[str]) -> str:
+    name = os.path.splitext(os.path.basename(filename))[0]
+    if not name.isidentifier():
+        raise PhoenixError(
+            f"Cannot build an extension module named '{name}': not a valid identifier",
+            lineno=1,
+            col=1,
+            source=lines[0] if lines else "",
+            filename=filename,
+        )
+    return name
+
+
+# Helpers shared by every wrapper. Each unboxer returns -1 with a Python
+# exception set on failure; arrays are copied into PyMem buffers and also
+# hand back the sequence they read, which the wrapper holds until the call
+# returns so str elements stay valid.
+_RUNTIME = r"""
+#include <limits.h>
+#include <stdbool.h>
+
+static int phoenix_unbox_int(PyObject *obj, int *out) {
+    long v = PyLong_AsLong(obj);
+    if (v == -1 && PyErr_Occurred()) return -1;
+    if (v < INT_MIN || v > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "Python int too large for a Phoenix int");
+        return -1;
+    }
+    *out = (int)v;
+    return 0;
+}
+
+static int phoenix_unbox_double(PyObject *obj, double *out) {
+    double v = PyFloat_AsDouble(obj);
+    if (v == -1.0 && PyErr_Occurred()) return -1;
+    *out = v;
+    return 0;
+}
+
+static int phoenix_unbox_bool(PyObject *obj, bool *out) {
+    int v = PyObject_IsTrue(obj);
+    if (v < 0) return -1;
+    *out = v;
+    return 0;
+}
+
+static int phoenix_unbox_str(PyObject *obj, const char **out) {
+    const char *s = PyUnicode_AsUTF8(obj);
+    if (s == NULL) return -1;
+    *out = s;
+    return 0;
+}
+
+static PyObject *phoenix_box_int(int v) { return PyLong_FromLong(v); }
+static PyObject *phoenix_box_double(double v) { return PyFloat_FromDouble(v); }
+static PyObject *phoenix_box_bool(bool v) { return PyBool_FromLong(v); }
+static PyObject *phoenix_box_str(const char *v) { return PyUnicode_FromString(v); }
+
+#define PHOENIX_ARRAY(kind, ctype)                                                  \
+static int phoenix_unbox_##kind##_array(PyObject *obj, Py_ssize_t need,            \
+                                        ctype **out, Py_ssize_t *len,              \
+                                        PyObject **keep) {                         \
+    PyObject *seq = PySequence_Fast(obj, "expected a sequence");                   \
+    if (seq == NULL) return -1;                                                     \
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);                                   \
+    if (n < need) {                                                                 \
+        PyErr_Format(PyExc_ValueError, "sequence needs at least %zd elements, got %zd", need, n); \
+        Py_DECREF(seq);                                                             \
+        return -1;                                                                  \
+    }                                                                               \
+    ctype *buf = PyMem_Malloc(sizeof(ctype) * (n ? n : 1));                         \
+    if (buf == NULL) { Py_DECREF(seq); PyErr_NoMemory(); return -1; }               \
+    PyObject **items = PySequence_Fast_ITEMS(seq);                                  \
+    for (Py_ssize_t i = 0; i < n; i++) {                                            \
+        if (phoenix_unbox_##kind(items[i], &buf[i]) < 0) {                          \
+            PyMem_Free(buf);                                                        \
+            Py_DECREF(seq);                                                         \
+            return -1;                                                              \
+        }                                                                           \
+    }                                                                               \
+    /* The caller releases seq after the call: str items point into it. */         \
+    *keep = seq;                                                                    \
+    *out = buf;                                                                     \
+    *len = n;                                                                       \
+    return 0;                                                                       \
+}
+
+#define PHOENIX_WRITEBACK(kind, ctype)                                              \
+static int phoenix_writeback_##kind##_array(PyObject *obj, ctype *buf, Py_ssize_t n) { \
+    if (!PyList_Check(obj)) return 0;                                               \
+    for (Py_ssize_t i = 0; i < n && i < PyList_GET_SIZE(obj); i++) {                \
+        PyObject *item = phoenix_box_##kind(buf[i]);                                \
+        if (item == NULL) return -1;                                                \
+        PyList_SetItem(obj, i, item);                                               \
+    }                                                                               \
+    return 0;                                                                       \
+}
+
+PHOENIX_ARRAY(int, int)
+PHOENIX_ARRAY(double, double)
+PHOENIX_ARRAY(bool, bool)
+PHOENIX_ARRAY(str, const char *)
+PHOENIX_WRITEBACK(int, int)
+PHOENIX_WRITEBACK(double, double)
+PHOENIX_WRITEBACK(bool, bool)
+"""
+
+# Phoenix type -> (helper suffix, C type)
+_KINDS = {
+    IntType: ("int", "int"),
+    FloatType: ("double", "double"),
+    BoolType: ("bool", "bool"),
+    StringType: ("str", "const char *"),
+}
+
+
+def _kind(t: Type):
+    return _KINDS.get(type(t), ("int", "int"))
+
+
+def _wrapper(export: Export) -> List[str]:
+    name, func_type = export.name, export.func_type
+    # Locals are prefixed so parameter names cannot shadow result/args/nargs.
+    locals_ = [f"arg_{param}" for param in export.params]
+    out = [
+        "static PyObject *",
+        f"pyphx_{name}(PyObject *self, PyObject *const *args, Py_ssize_t nargs)",
+        "{",
+        "    PyObject *result = NULL;",
+    ]
+    arrays = []
+    for i, (var, t) in enumerate(zip(locals_, func_type.param_types)):
+        if isinstance(t, ListType):
+            _, ctype = _kind(t.element_type)
+            out.append(f"    {ctype} *{var} = NULL;")
+            out.append(f"    Py_ssize_t {var}_len = 0;")
+            out.append(f"    PyObject *{var}_seq = NULL;")
+            arrays.append((i, var, t))
+        else:
+            out.append(f"    {_kind(t)[1]} {var};")
+
+    n = len(locals_)
+    plural = "argument" if n == 1 else "arguments"
+    out.append(f"    if (nargs != {n}) {{")
+    out.append(
+        f'        PyErr_Format(PyExc_TypeError, "{name}() takes exactly {n} {plural} (%zd given)", nargs);'
+    )
+    out.append("        return NULL;")
+    out.append("    }")
+
+    for i, (var, t, need) in enumerate(zip(locals_, func_type.param_types, export.lengths)):
+        if isinstance(t, ListType):
+            kind, _ = _kind(t.element_type)
+            out.append(
+                f"    if (phoenix_unbox_{kind}_array(args[{i}], {need}, &{var}, &{var}_len, &{var}_seq) < 0) goto done;"
+            )
+        else:
+            out.append(f"    if (phoenix_unbox_{_kind(t)[0]}(args[{i}], &{var}) < 0) goto done;")
+
+    call = f"{SYMBOL_PREFIX}{name}({', '.join(locals_)})"
+    ret = func_type.return_type
+    if isinstance(ret, (UnknownType, ListType)):
+        out.append(f"    {call};")
+        out.append("    result = Py_NewRef(Py_None);")
+    else:
+        out.append(f"    result = phoenix_box_{_kind(ret)[0]}({call});")
+
+    for i, var, t in arrays:
+        if isinstance(t.element_type, StringType) or not export.written[i]:
+            continue  # C strings are read-only, and lists the body only reads are unchanged
+        kind, _ = _kind(t.element_type)
+        out.append(f"    if (result != NULL && phoenix_writeback_{kind}_array(args[{i}], {var}, {var}_len) < 0)")
+        out.append("        Py_CLEAR(result);")
+
+    out.append("done:")
+    for _, var, _ in arrays:
+        out.append(f"    PyMem_Free((void *){var});")
+        out.append(f"    Py_XDECREF({var}_seq);")
+    out.append("    return result;")
+    out.append("}")
+    out.append("")
+    return out
+
+
+def generate_extension(name: str, library_code: str, exports: List[Export]) -> str:
+    """C source of a CPython extension module wrapping the exported functions.
+
+    Each wrapper is a METH_FASTCALL function: arguments arrive as a C array
+    of objects, are unboxed straight into C values and the result is boxed
+    once, without building an argument tuple.
+    """
+    out = ["#define PY_SSIZE_T_CLEAN", "#include <Python.h>", "", library_code, _RUNTIME]
+    for export in exports:
+        out.extend(_wrapper(export))
+
+    out.append(f"static PyMethodDef {name}_methods[] = {{")
+    for export in exports:
+        out.append(f'    {{"{export.name}", (PyCFunction)(void (*)(void))pyphx_{export.name}, METH_FASTCALL, NULL}},')
+    out.append("    {NULL, NULL, 0, NULL}")
+    out.append("};")
+    out.append("")
+    out.append(f"static struct PyModuleDef {name}_module = {{")
+    out.append(f'    PyModuleDef_HEAD_INIT, "{name}", "Compiled by Phoenix.", -1, {name}_methods,')
+    out.append("};")
+    out.append("")
+    out.append(f"PyMODINIT_FUNC PyInit_{name}(void) {{")
+    out.append(f"    return PyModule_Create(&{name}_module);")
+    out.append("}")
+    out.append("")
+    return "\n".join(out)
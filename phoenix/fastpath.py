@@ -0,0 +1,195 @@
+"""The CLI's cache-hit path, which runs before anything but os and json is imported.
+
+A program whose files are unchanged since it was last keyed is found
+through the stat index. Its key depends on build options that take the
+profiles, back ends and a compiler probe to work out, so every full build
+remembers the context it resolved its command line to (fast_contexts.json),
+together with the stamps of what that resolution read: phoenix.json, the C
+compiler and Phoenix itself. A later identical command line reuses it while
+those stamps hold, and delivers the binary straight from the manifest.
+
+The cache layout and the code that delivers a hit come from
+phoenix.cache_layout, which phoenix.cache is built on too. Like this
+module it imports only os and json: importing the cache, options or
+argparse costs more than the whole lookup.
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from phoenix.cache_layout import (
+    CACHE_DIR_NAME as CACHE_DIR,
+    MANIFEST_NAME,
+    STAT_INDEX_NAME,
+    append_journal,
+    fetch_local,
+    file_stamp,
+    index_name,
+    write_json,
+)
+
+CONTEXTS_NAME = "fast_contexts.json"
+CONFIG_FILE = "phoenix.json"  # phoenix.profiles.CONFIG_FILE
+MAX_CONTEXTS = 64
+
+# Build arguments the fast path understands; anything else takes the full path.
+_VALUED = {"--profile", "--cc", "--tier"}
+_FLAGS = {"--fast-math", "--pgo", "--incremental", "--no-daemon"}
+
+
+class _NullTimer:
+    active = False
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def note(self, name, value):
+        pass
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+NULL_TIMER = _NullTimer()  # phoenix.timing.NULL_TIMER, without importing tracemalloc
+
+
+class Request:
+    """A plain build command line: what to build, where, and how it is timed."""
+
+    def __init__(self, file, output, build, time_passes, report):
+        self.file = file
+        self.output = output
+        self.time_passes = time_passes
+        self.report = report
+        # What the build arguments resolve to also depends on the environment.
+        env = sorted((k, v) for k, v in os.environ.items() if k.startswith("PHOENIX_") or k == "PATH")
+        self.context = json.dumps([build, env])
+        self.options = None  # the resolved options' payload, once served
+
+
+def parse_request(argv):
+    """The Request for a command line the fast path understands, or None."""
+    file, output, report, time_passes, build = None, "output", None, False, []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name, eq, value = arg.partition("=") if arg.startswith("--") else (arg, "", "")
+        if name in ("-o", "--output", "--report") or name in _VALUED:
+            if not eq:
+                if i + 1 == len(argv):
+                    return None
+                i += 1
+                value = argv[i]
+            if name in _VALUED:
+                build += [name, value]
+            elif name == "--report":
+                report = value
+            else:
+                output = value
+        elif arg in _FLAGS:
+            build.append(arg)
+        elif arg == "--time-passes":
+            time_passes = True
+        elif arg.startswith("-") or file is not None:
+            return None  # --shared, --dump-after, -h, ...: the full path handles them
+        else:
+            file = arg
+        i += 1
+    if file is None:
+        return None
+    return Request(file, output, build, time_passes, report)
+
+
+def _unchanged(stamps):
+    return all(file_stamp(path) == stamp for path, stamp in stamps.items())
+
+
+def _read_json(name):
+    try:
+        with open(os.path.join(CACHE_DIR, name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch(key, output, how):
+    """BinaryCache.fetch for a locally cached binary; False sends the build the full way.
+
+    The hit goes straight to the journal, as BinaryCache.flush() would write it.
+    """
+    entries = (_read_json(MANIFEST_NAME) or {}).get("entries", {})
+    record = fetch_local(CACHE_DIR, entries, key, output, how)
+    if record is None:
+        return False  # evicted: the full path may still pull it from a shared tier
+    append_journal(CACHE_DIR, record)
+    return True
+
+
+def cached_build(request, timer=NULL_TIMER):
+    """Deliver the cached binary of an unchanged program: the lines to print, or None."""
+    with timer.stage("cache lookup"):
+        resolved = (_read_json(CONTEXTS_NAME) or {}).get(request.context)
+        if resolved is None or not _unchanged(resolved["stamps"]):
+            return None
+        index = _read_json(STAT_INDEX_NAME) or {}
+        entry = index.get(index_name(request.file, resolved["context"]))
+        if entry is None or not _unchanged(entry["stamps"]):
+            return None
+        if not _fetch(entry["key"], request.output, resolved["link"]):
+            return None
+    timer.note("cache", "hit")
+    request.options = resolved["options"]
+    return ["✓ Using cached binary"] + (["✓ Fast tier build"] if resolved["fast"] else [])
+
+
+def _phoenix_files():
+    """What a change to Phoenix itself touches: its sources, or the launcher archive."""
+    package = os.path.dirname(os.path.abspath(__file__))
+    if not os.path.isdir(package):
+        return [os.path.dirname(package)]
+    return [package, *(os.path.join(package, n) for n in sorted(os.listdir(package)) if n.endswith(".py"))]
+
+
+def remember(argv, options):
+    """Record what the command line in argv resolved to, for the next cached_build.
+
+    Called by full builds, which have the options at hand anyway.
+    """
+    import shutil
+
+    from phoenix.cache import link_mode
+    from phoenix.options import index_context, module_search_path
+
+    request = parse_request(argv)
+    if request is None or options.library or options.pgo_retrain:
+        return
+    payload = options.to_payload()
+    if options.tier == "auto":
+        options = options.at_tier("opt")  # serve the optimized build when it is ready
+    paths = [os.path.abspath(CONFIG_FILE), *_phoenix_files()]
+    compiler = shutil.which(options.backend.executable)
+    if compiler is not None:
+        paths.append(os.path.realpath(compiler))
+    resolved = {
+        "context": index_context(options, module_search_path()),
+        "stamps": {path: file_stamp(path) for path in paths},
+        "fast": options.tier == "fast",
+        "link": link_mode(),
+        "options": payload,
+    }
+    contexts = _read_json(CONTEXTS_NAME) or {}
+    if contexts.get(request.context) == resolved:
+        return
+    contexts.pop(request.context, None)
+    contexts[request.context] = resolved
+    for stale in list(contexts)[:-MAX_CONTEXTS]:
+        del contexts[stale]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_json(os.path.join(CACHE_DIR, CONTEXTS_NAME), contexts)
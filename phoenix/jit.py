@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import textwrap
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger("phoenix.jit")
+
+_SCALARS = {bool: "bool", int: "int", float: "float", str: "str"}
+
+_session = None
+_loaded: Dict[str, Any] = {}
+_lock = threading.RLock()
+
+
+def _annotation(value: Any) -> Optional[str]:
+    """Phoenix annotation for a runtime value, or None if it has no C type."""
+    scalar = _SCALARS.get(type(value))
+    if scalar is not None:
+        return scalar
+    if isinstance(value, (list, tuple)) and value:
+        inner = {_SCALARS.get(type(v)) for v in value}
+        if len(inner) == 1 and None not in inner:
+            return f"list[{inner.pop()}]"
+    return None
+
+
+def _specialization_key(args: Tuple[Any, ...]) -> Tuple[type, ...]:
+    # Lists are keyed on their element type, or None when they are empty or
+    # mixed; such lists have no Phoenix type and run in Python.
+    key = []
+    for a in args:
+        if isinstance(a, (list, tuple)):
+            elements = set(map(type, a))
+            key.append((type(a), elements.pop() if len(elements) == 1 else None))
+        else:
+            key.append(type(a))
+    return tuple(key)
+
+
+def _program(func: Callable, args: Tuple[Any, ...]) -> str:
+    """Phoenix source for func, with unannotated parameters typed from args."""
+    tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    node = tree.body[0]
+    if not isinstance(node, ast.FunctionDef):
+        raise TypeError("only plain functions can be compiled")
+    node.decorator_list = []
+    for arg, value in zip(node.args.args, args):
+        if arg.annotation is None:
+            annotation = _annotation(value)
+            if annotation is None:
+                raise TypeError(f"argument '{arg.arg}' has no Phoenix type ({type(value).__name__})")
+            arg.annotation = ast.parse(annotation, mode="eval").body
+
+    header = "import math\n\n" if "math" in func.__code__.co_names else ""
+    return header + ast.unparse(node) + "\n"
+
+
+def _compile(func: Callable, args: Tuple[Any, ...], profile: Optional[str]) -> Callable:
+    """Build func as an extension module through the binary cache and load it."""
+    import importlib.util
+
+    from phoenix.cache import CACHE_DIR
+    from phoenix.driver import BuildOptions, BuildSession
+    from phoenix.exactness import check_exact
+    from phoenix.extension import extension_path
+    from phoenix.profiles import resolve_profile
+
+    global _session
+    program = _program(func, args)
+    check_exact(program, f"<jit {func.__qualname__}>")
+    options = BuildOptions(profile=resolve_profile(profile), extension=True)
+    name = "phx_jit_" + hashlib.sha256(f"{program}\0{options.cache_flags()}".encode("utf-8")).hexdigest()[:16]
+
+    with _lock:
+        module = _loaded.get(name)
+        if module is None:
+            jit_dir = CACHE_DIR / "jit"
+            jit_dir.mkdir(parents=True, exist_ok=True)
+            path = jit_dir / f"{name}.py"
+            if not path.exists():
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(program)
+                os.replace(tmp, path)
+
+            if _session is None:
+                _session = BuildSession(options=options)
+            output = extension_path(str(path), str(jit_dir))
+            _session.build(str(path), output, options)
+
+            spec = importlib.util.spec_from_file_location(name, output)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _loaded[name] = module
+    return getattr(module, func.__name__)
+
+
+def _reason(exc: Exception) -> str:
+    from phoenix.driver import describe_error
+
+    return "\n".join(describe_error(exc))
+
+
+class JitFunction:
+    """A Python function that compiles itself with Phoenix on first call.
+
+    Each distinct combination of argument types is compiled once. If the
+    checker or the C compiler rejects the function, or its C code could
+    give a different result than Python (see phoenix.exactness), that
+    combination keeps running the original Python code and the reason is
+    logged to the "phoenix.jit" logger.
+    """
+
+    def __init__(self, func: Callable, profile: Optional[str] = None):
+        functools.update_wrapper(self, func)
+        self.py_func = func
+        self.profile = profile
+        self.signature = inspect.signature(func)
+        self.specializations: Dict[Tuple[type, ...], Callable] = {}
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            bound = self.signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            args = bound.args
+        key = _specialization_key(args)
+        impl = self.specializations.get(key)
+        if impl is None:
+            impl = self._specialize(key, args)
+        if impl is self.py_func:
+            return impl(*args)
+        try:
+            return impl(*args)
+        except (TypeError, ValueError, OverflowError):
+            # Only unboxing raises these, before any C code runs: a list
+            # too short for the function or an int too big for a C int.
+            # Python gives the real result or error.
+            return self.py_func(*args)
+
+    def _specialize(self, key: Tuple[type, ...], args: Tuple[Any, ...]) -> Callable:
+        with _lock:
+            impl = self.specializations.get(key)
+            if impl is not None:
+                return impl
+            try:
+                impl = _compile(self.py_func, args, self.profile)
+            except Exception as e:
+                logger.warning("Falling back to Python for %s: %s", self.__qualname__, _reason(e))
+                impl = self.py_func
+            self.specializations[key] = impl
+            return impl
+
+    @property
+    def native(self) -> bool:
+        """Whether any specialization runs compiled code."""
+        return any(impl is not self.py_func for impl in self.specializations.values())
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return functools.partial(self, obj)
+
+
+def jit(func: Optional[Callable] = None, *, profile: Optional[str] = None):
+    """Compile a function with Phoenix the first time it is called.
+
+    Usable bare (``@phoenix.jit``) or with a build profile
+    (``@phoenix.jit(profile="native")``).
+    """
+    if func is None:
+        return lambda f: JitFunction(f, profile)
+    return JitFunction(func, profile)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import py_compile
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+from typing import Optional
+
+from phoenix.cache import package_digest
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+_MAIN = "from phoenix.cli import main\n\nmain()\n"
+
+
+def default_interpreter() -> str:
+    # Bytecode only loads in the Python that wrote it; Phoenix needs nothing
+    # from site-packages, so -S skips the site import at every start.
+    return f"{sys.executable} -S"
+
+
+def build_launcher(target: str, interpreter: Optional[str] = None) -> Path:
+    """Write the phoenix package as one executable zipapp of precompiled bytecode.
+
+    Nothing is compiled at startup and no __pycache__ is consulted, so the
+    launcher starts as fast as the interpreter imports its modules.
+    """
+    if not PACKAGE_DIR.is_dir():
+        raise RuntimeError("build the launcher from a source checkout, not from a launcher")
+    with tempfile.TemporaryDirectory(prefix="phoenix-launcher-") as tmp:
+        staged = Path(tmp)
+        (staged / "phoenix").mkdir()
+        for source in sorted(PACKAGE_DIR.glob("*.py")):
+            py_compile.compile(
+                str(source),
+                cfile=str(staged / "phoenix" / f"{source.stem}.pyc"),
+                dfile=f"phoenix/{source.name}",
+                doraise=True,
+            )
+        # No sources travel in the launcher, so it carries their digest for cache keys.
+        digest = staged / "_digest.py"
+        digest.write_text(f"DIGEST = {package_digest(PACKAGE_DIR)!r}\n")
+        py_compile.compile(
+            str(digest), cfile=str(staged / "phoenix" / "_digest.pyc"), dfile="phoenix/_digest.py", doraise=True
+        )
+        digest.unlink()
+        (staged / "__main__.py").write_text(_MAIN)
+        zipapp.create_archive(staged, target, interpreter=interpreter or default_interpreter())
+    return Path(target)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from phoenix import __version__
+from phoenix.cache import CACHE_DIR, compiler_digest
+from phoenix.errors import PhoenixError
+from phoenix.options import module_search_path
+from phoenix.types import FunctionType, UnknownType, type_from_json, type_to_json
+
+
+MODULE_DIR = CACHE_DIR / "modules"
+# Modules that map onto C libraries rather than Phoenix source.
+BUILTIN_MODULES = {"math"}
+
+# Cheap dependency scan used for cache keys before anything is parsed.
+# Imports must be top-level, which the analysis below enforces.
+_FROM_IMPORT = re.compile(r"^from[ \t]+([A-Za-z_][\w.]*)[ \t]+import\b", re.M)
+
+
+def _error(msg: str, node: ast.AST, filename: str, lines: List[str]) -> PhoenixError:
+    return PhoenixError(
+        msg,
+        lineno=node.lineno,
+        col=node.col_offset + 1,
+        source=lines[node.lineno - 1],
+        filename=filename,
+    )
+
+
+def mangle(module: str) -> str:
+    return module.replace(".", "_")
+
+
+@dataclass
+class ModuleInterface:
+    """What importers need from a Phoenix module: signatures and a cache key."""
+
+    name: str
+    path: str
+    key: str
+    functions: Dict[str, FunctionType] = field(default_factory=dict)
+    uses_math: bool = False
+    deps: List[str] = field(default_factory=list)
+
+    def symbol(self, func: str) -> str:
+        return f"{mangle(self.name)}__{func}"
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "functions": {k: type_to_json(v) for k, v in self.functions.items()},
+            "uses_math": self.uses_math,
+            "deps": self.deps,
+        }
+
+
+class ModuleLoader:
+    """Resolves `from mod import f` statically and memoizes module analysis.
+
+    Interfaces are cached on disk under .phoenix_cache/modules/<key>.json,
+    keyed by the module source and the keys of everything it imports, so
+    each module is type-checked once no matter how many programs use it.
+    """
+
+    def __init__(self, search_path: Optional[List[str]] = None):
+        self.search_path = module_search_path() if search_path is None else search_path
+        self.interfaces: Dict[str, ModuleInterface] = {}
+        self._lock = threading.RLock()
+
+    # ---- lookup --------------------------------------------------
+    def find(self, name: str, importer: str) -> Optional[str]:
+        rel = os.path.join(*name.split(".")) + ".py"
+        for base in [os.path.dirname(os.path.abspath(importer)), *self.search_path]:
+            candidate = os.path.join(base, rel)
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+        return None
+
+    def _scan(self, source: str, filename: str) -> List[Tuple[str, str]]:
+        deps = []
+        for name in sorted(set(_FROM_IMPORT.findall(source))):
+            if name in BUILTIN_MODULES:
+                continue
+            path = self.find(name, filename)
+            if path is not None:
+                deps.append((name, path))
+        return deps
+
+    def module_key(self, path: str, stack: Tuple[str, ...] = ()) -> str:
+        # Not memoized: a long-lived session must notice edits to dependencies.
+        # The compiler's digest is in it too: interfaces and module objects are
+        # what this checker and emitter made of the source.
+        if path in stack:
+            return "cycle"  # reported properly during analysis
+        with open(path, "r") as f:
+            source = f.read()
+        material = [__version__, compiler_digest(), source, self.dependency_digest(source, path, stack + (path,))]
+        return hashlib.sha256("\0".join(material).encode("utf-8")).hexdigest()
+
+    def dependency_paths(self, source: str, filename: str, stack: Tuple[str, ...] = ()) -> List[str]:
+        """Source files of every module the source (transitively) imports."""
+        paths: List[str] = []
+        for _, path in self._scan(source, filename):
+            if path in stack or path in paths:
+                continue
+            paths.append(path)
+            with open(path, "r") as f:
+                nested = self.dependency_paths(f.read(), path, stack + (path,))
+            paths.extend(p for p in nested if p not in paths)
+        return paths
+
+    def dependency_digest(self, source: str, filename: str, stack: Tuple[str, ...] = ()) -> str:
+        """Hash of every module the source (transitively) imports."""
+        parts = [f"{name}={self.module_key(path, stack)}" for name, path in self._scan(source, filename)]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest() if parts else ""
+
+    # ---- resolution ----------------------------------------------
+    def resolve(
+        self,
+        tree: ast.Module,
+        filename: str,
+        lines: List[str],
+        stack: Tuple[str, ...] = (),
+    ) -> Tuple[Dict[str, Tuple[str, FunctionType]], List[ModuleInterface]]:
+        """Map imported names to (C symbol, signature) and list modules to link.
+
+        The module list is transitive and ordered dependencies first.
+        """
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node not in tree.body:
+                raise _error("Imports must be at module top level", node, filename, lines)
+
+        imports: Dict[str, Tuple[str, FunctionType]] = {}
+        modules: List[ModuleInterface] = []
+        for node in tree.body:
+            if not isinstance(node, ast.ImportFrom) or node.module in BUILTIN_MODULES:
+                continue
+            if node.level != 0 or node.module is None:
+                raise _error("Relative imports are not supported", node, filename, lines)
+
+            path = self.find(node.module, filename)
+            if path is None:
+                raise _error(f"Cannot find Phoenix module '{node.module}'", node, filename, lines)
+            if path in stack or path == os.path.abspath(filename):
+                raise _error(f"Circular import of module '{node.module}'", node, filename, lines)
+
+            iface = self.load(node.module, path, stack + (os.path.abspath(filename),))
+            for dep in self.linked(iface):
+                if dep.key not in {m.key for m in modules}:
+                    modules.append(dep)
+
+            for alias in node.names:
+                if alias.name == "*":
+                    raise _error("Wildcard imports are not supported", node, filename, lines)
+                if alias.name not in iface.functions:
+                    raise _error(
+                        f"Module '{node.module}' has no function '{alias.name}'", node, filename, lines
+                    )
+                local = alias.asname or alias.name
+                imports[local] = (iface.symbol(alias.name), iface.functions[alias.name])
+        return imports, modules
+
+    def linked(self, iface: ModuleInterface) -> List[ModuleInterface]:
+        """The module and everything it imports, dependencies first."""
+        ordered: List[ModuleInterface] = []
+        for dep_key in iface.deps:
+            for dep in self.linked(self.interfaces[dep_key]):
+                if dep not in ordered:
+                    ordered.append(dep)
+        ordered.append(iface)
+        return ordered
+
+    def load(self, name: str, path: str, stack: Tuple[str, ...] = ()) -> ModuleInterface:
+        key = self.module_key(path)
+        with self._lock:
+            if key in self.interfaces:
+                return self.interfaces[key]
+
+        cached = MODULE_DIR / f"{key}.json"
+        try:
+            data = json.loads(cached.read_text())
+        except (OSError, ValueError):
+            data = None
+
+        if data is not None:
+            # Signatures are known; make sure dependencies are loaded for linking.
+            with open(path, "r") as f:
+                source = f.read()
+            for dep_name, dep_path in self._scan(source, path):
+                self.load(dep_name, dep_path, stack + (path,))
+            iface = ModuleInterface(
+                name,
+                path,
+                key,
+                {k: type_from_json(v) for k, v in data["functions"].items()},
+                data["uses_math"],
+                data["deps"],
+            )
+        else:
+            iface, _, _ = self.analyze(name, path, stack)
+            MODULE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(iface.to_json(), sort_keys=True))
+            os.replace(tmp, cached)
+
+        with self._lock:
+            self.interfaces[key] = iface
+        return iface
+
+    def analyze(self, name: str, path: str, stack: Tuple[str, ...] = ()):
+        """Type-check a module; returns (interface, tree, type context)."""
+        from phoenix.checker import check_types
+
+        with open(path, "r") as f:
+            source = f.read()
+        lines = source.splitlines()
+        tree = ast.parse(source)
+
+        for stmt in tree.body:
+            is_docstring = isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)
+            if not isinstance(stmt, (ast.FunctionDef, ast.Import, ast.ImportFrom)) and not is_docstring:
+                raise _error(
+                    f"Phoenix module '{name}' may only contain functions and imports",
+                    stmt,
+                    path,
+                    lines,
+                )
+
+        imports, modules = self.resolve(tree, path, lines, stack)
+        type_ctx = check_types(tree, path, lines, imports)
+
+        for stmt in tree.body:
+            if not isinstance(stmt, ast.FunctionDef):
+                continue
+            func_type = type_ctx.functions[stmt.name]
+            if any(isinstance(t, UnknownType) for t in func_type.param_types):
+                raise _error(
+                    f"Exported function '{stmt.name}' needs annotated parameter types",
+                    stmt,
+                    path,
+                    lines,
+                )
+
+        direct: List[str] = []
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and node.module not in BUILTIN_MODULES:
+                dep_key = self.module_key(self.find(node.module, path))
+                if dep_key not in direct:
+                    direct.append(dep_key)
+        iface = ModuleInterface(
+            name,
+            path,
+            self.module_key(path),
+            {k: v for k, v in type_ctx.functions.items() if k not in type_ctx.externs},
+            type_ctx.uses_math,
+            direct,
+        )
+        return iface, tree, type_ctx
+
+    def emit_object_source(self, iface: ModuleInterface) -> str:
+        """C code for a module's object file."""
+        from phoenix.transpiler import transpile_module
+
+        _, tree, type_ctx = self.analyze(iface.name, iface.path)
+        symbols = {name: iface.symbol(name) for name in iface.functions}
+        return transpile_module(tree, type_ctx, symbols)
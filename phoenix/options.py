@@ -0,0 +1,115 @@
+"""Build options, kept apart from the compiler so the cache-hit path can use them."""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+from phoenix import __version__
+from phoenix.backends import DEFAULT_TIER, Backend, select_backend
+from phoenix.cache import compiler_digest, toolchain_fingerprint
+from phoenix.profiles import DEFAULT_PROFILE, PROFILES, Profile, resolve_profile
+
+
+@dataclass
+class BuildOptions:
+    """Everything about a build besides the source that changes the binary."""
+
+    profile: Profile = field(default_factory=lambda: PROFILES[DEFAULT_PROFILE])
+    pgo: bool = False
+    pgo_retrain: bool = False
+    incremental: bool = False
+    shared: bool = False
+    extension: bool = False
+    cc: Optional[str] = None  # back end name; None picks the best installed for the tier
+    tier: str = DEFAULT_TIER
+
+    @property
+    def library(self) -> bool:
+        """Output is loaded into a Python process rather than executed."""
+        return self.shared or self.extension
+
+    @property
+    def backend(self) -> Backend:
+        return select_backend(self.cc, self.tier)
+
+    def at_tier(self, tier: str) -> "BuildOptions":
+        return replace(self, tier=tier)
+
+    def compile_flags(self) -> List[str]:
+        flags = self.backend.flags(self.profile, self.tier)
+        if self.library:
+            flags.append("-fPIC")
+        return flags
+
+    def cache_flags(self) -> List[str]:
+        # The back end itself enters the key through its toolchain fingerprint.
+        if self.tier == "fast":
+            flags = ["tier=fast", *self.backend.flags(self.profile, self.tier)]
+        else:
+            flags = self.profile.cache_flags()
+        if self.pgo:
+            flags.append("pgo")
+        if self.incremental:
+            flags.append("incremental")
+        if self.shared:
+            flags.append("shared")
+        if self.extension:
+            from phoenix.extension import python_abi
+
+            flags.append(f"extension={python_abi()}")
+        return flags
+
+    def to_payload(self) -> dict:
+        return {
+            "profile": self.profile.name,
+            "fast_math": self.profile.fast_math,
+            "pgo": self.pgo,
+            "pgo_retrain": self.pgo_retrain,
+            "incremental": self.incremental,
+            "shared": self.shared,
+            "extension": self.extension,
+            "cc": self.cc,
+            "tier": self.tier,
+        }
+
+    def to_args(self) -> List[str]:
+        """Command line flags that reproduce these options."""
+        args = ["--profile", self.profile.name, "--tier", self.tier]
+        if self.profile.fast_math:
+            args.append("--fast-math")
+        if self.cc is not None:
+            args += ["--cc", self.cc]
+        for flag, enabled in (
+            ("--incremental", self.incremental),
+            ("--shared", self.shared),
+            ("--extension", self.extension),
+        ):
+            if enabled:
+                args.append(flag)
+        return args
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "BuildOptions":
+        return cls(
+            profile=resolve_profile(payload.get("profile"), payload.get("fast_math")),
+            pgo=bool(payload.get("pgo")),
+            pgo_retrain=bool(payload.get("pgo_retrain")),
+            incremental=bool(payload.get("incremental")),
+            shared=bool(payload.get("shared")),
+            extension=bool(payload.get("extension")),
+            cc=payload.get("cc"),
+            tier=payload.get("tier") or DEFAULT_TIER,
+        )
+
+
+def module_search_path() -> List[str]:
+    """Directories from PHOENIX_PATH searched for imported modules."""
+    return [p for p in os.environ.get("PHOENIX_PATH", "").split(os.pathsep) if p]
+
+
+def index_context(options: BuildOptions, search_path: List[str]) -> str:
+    """Everything besides the files themselves that the stat index must match."""
+    toolchain = toolchain_fingerprint(options.backend.executable)
+    return json.dumps([__version__, compiler_digest(), options.cache_flags(), toolchain, search_path], sort_keys=True)
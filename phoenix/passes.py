@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from phoenix.timing import NULL_TIMER
+
+Handler = Callable[[ast.AST], None]
+
+
+@dataclass
+class PassContext:
+    """What passes share: the program, its source for errors, and each pass's result."""
+
+    tree: ast.Module
+    filename: str
+    lines: List[str]
+    imports: Dict[str, Any] = field(default_factory=dict)
+    results: Dict[str, Any] = field(default_factory=dict)
+
+
+class Pass:
+    """One rule or analysis over the tree.
+
+    A traversal pass defines visit_<Node> (and leave_<Node>) methods for the
+    node classes it cares about, abstract ones such as stmt or expr
+    included; the manager calls them from one walk shared by every
+    traversal pass. Other passes override run() and see the whole tree.
+    Whatever finish() or run() returns is stored in ctx.results under the
+    pass name for the passes that list it in requires.
+    """
+
+    name = ""
+    requires: Tuple[str, ...] = ()
+
+    @property
+    def traversal(self) -> bool:
+        return type(self).run is Pass.run
+
+    def begin(self, ctx: PassContext) -> None:
+        pass
+
+    def finish(self, ctx: PassContext) -> Any:
+        return None
+
+    def run(self, ctx: PassContext) -> Any:
+        raise NotImplementedError
+
+    def dump(self, ctx: PassContext) -> str:
+        """Text printed by --dump-after; the tree unless the pass has something better."""
+        return ast.dump(ctx.tree, indent=1)
+
+
+class PassDump(Exception):
+    """Raised to stop the pipeline after the pass --dump-after names."""
+
+    def __init__(self, name: str, text: str):
+        super().__init__(name)
+        self.name = name
+        self.text = text
+
+
+class PassManager:
+    """Runs passes in dependency order, fusing adjacent traversal passes into one walk.
+
+    With an active timer every pass gets its own stage; in a fused walk
+    that is the time spent in its handlers, and the walk itself is the
+    "traverse" stage.
+    """
+
+    def __init__(self, passes: List[Pass], timer=NULL_TIMER, dump_after: Optional[str] = None):
+        self.passes = _ordered(passes)
+        self.timer = timer
+        self.dump_after = dump_after
+        if dump_after is not None and dump_after not in {p.name for p in passes}:
+            names = ", ".join(p.name for p in self.passes)
+            raise ValueError(f"unknown pass '{dump_after}' (passes: {names})")
+
+    def run(self, ctx: PassContext) -> PassContext:
+        group: List[Pass] = []
+        for p in self.passes:
+            if p.traversal:
+                group.append(p)
+                continue
+            self._walk(group, ctx)
+            group = []
+            with self.timer.stage(p.name):
+                ctx.results[p.name] = p.run(ctx)
+            self._maybe_dump([p], ctx)
+        self._walk(group, ctx)
+        return ctx
+
+    def _maybe_dump(self, done: List[Pass], ctx: PassContext) -> None:
+        for p in done:
+            if p.name == self.dump_after:
+                raise PassDump(p.name, p.dump(ctx))
+
+    def _walk(self, group: List[Pass], ctx: PassContext) -> None:
+        if not group:
+            return
+        for p in group:
+            p.begin(ctx)
+        handlers: Dict[type, Tuple[List[Handler], List[Handler]]] = {}
+        with self.timer.stage("traverse"):
+            # Depth-first, children in field order, without recursion. A
+            # (node, handlers) tuple on the stack is the node being left.
+            stack: List[Any] = [ctx.tree]
+            while stack:
+                node = stack.pop()
+                if type(node) is tuple:
+                    node, leave = node
+                    for handler in leave:
+                        handler(node)
+                    continue
+                entry = handlers.get(type(node))
+                if entry is None:
+                    entry = handlers[type(node)] = self._handlers(type(node), group)
+                enter, leave = entry
+                for handler in enter:
+                    handler(node)
+                if leave:
+                    stack.append((node, leave))
+                children = list(ast.iter_child_nodes(node))
+                children.reverse()
+                stack += children
+        for p in group:
+            with self.timer.stage(p.name):
+                ctx.results[p.name] = p.finish(ctx)
+        self._maybe_dump(group, ctx)
+
+    def _handlers(self, cls: Type[ast.AST], group: List[Pass]) -> Tuple[List[Handler], List[Handler]]:
+        """Enter handlers from the most general node class down; leave handlers in reverse."""
+        enter: List[Handler] = []
+        leave: List[Handler] = []
+        for p in group:
+            for base in reversed(cls.__mro__):
+                for prefix, into in (("visit_", enter), ("leave_", leave)):
+                    handler = getattr(p, prefix + base.__name__, None)
+                    if handler is not None:
+                        into.append(self._timed(p.name, handler))
+        leave.reverse()
+        return enter, leave
+
+    def _timed(self, name: str, handler: Handler) -> Handler:
+        if not self.timer.active:
+            return handler
+
+        def run(node: ast.AST) -> None:
+            with self.timer.stage(name):
+                handler(node)
+
+        return run
+
+
+def _ordered(passes: List[Pass]) -> List[Pass]:
+    """Passes after everything they require, otherwise in the order given."""
+    by_name = {p.name: p for p in passes}
+    ordered: List[Pass] = []
+    state: Dict[str, str] = {}
+
+    def visit(p: Pass) -> None:
+        if state.get(p.name) == "done":
+            return
+        if state.get(p.name) == "visiting":
+            raise ValueError(f"pass '{p.name}' depends on itself")
+        state[p.name] = "visiting"
+        for name in p.requires:
+            if name not in by_name:
+                raise ValueError(f"pass '{p.name}' requires unknown pass '{name}'")
+            visit(by_name[name])
+        state[p.name] = "done"
+        ordered.append(p)
+
+    for p in passes:
+        visit(p)
+    return ordered
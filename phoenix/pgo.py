@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Callable, List
+
+from phoenix.cache import CACHE_DIR, atomic_copy
+
+
+PGO_DIR = CACHE_DIR / "pgo"
+TRAINING_TIMEOUT = 300  # seconds
+
+# Profiles are reused across edits of the same program, so tolerate
+# functions whose control flow no longer matches the recorded counters.
+USE_FLAGS = ["-fprofile-use", "-fprofile-correction", "-Wno-missing-profile", "-Wno-coverage-mismatch"]
+
+
+def profile_path(filename: str, profile_name: str) -> Path:
+    """Where the .gcda for a program lives; stable across edits of the file."""
+    ident = f"{os.path.abspath(filename)}\0{profile_name}"
+    return PGO_DIR / f"{hashlib.sha256(ident.encode('utf-8')).hexdigest()}.gcda"
+
+
+def compile_with_pgo(
+    run: Callable[[List[str]], None],
+    cmd_prefix: List[str],
+    c_code: str,
+    output: str,
+    libs: List[str],
+    gcda: Path,
+    retrain: bool = False,
+) -> bool:
+    """Instrument, train and rebuild; returns True if a new profile was trained.
+
+    `run` executes one compiler command (raising on failure), and
+    `cmd_prefix` is the compiler plus its optimization flags.
+    """
+    with tempfile.TemporaryDirectory(prefix="phoenix-pgo-") as tmp:
+        c_path = os.path.join(tmp, "prog.c")
+        obj_path = os.path.join(tmp, "prog.o")
+        with open(c_path, "w") as f:
+            f.write(c_code)
+
+        trained = retrain or not gcda.exists()
+        if trained:
+            # ---- instrument ----
+            instrumented = os.path.join(tmp, "prog-instrumented")
+            run([*cmd_prefix, "-fprofile-generate", "-c", c_path, "-o", obj_path])
+            run([*cmd_prefix, "-fprofile-generate", obj_path, "-o", instrumented, *libs])
+
+            # ---- train ----
+            proc = subprocess.run(
+                [instrumented], cwd=tmp, capture_output=True, timeout=TRAINING_TIMEOUT
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(f"PGO training run exited with status {proc.returncode}")
+
+            # gcc names the counters after the object file.
+            gcda.parent.mkdir(parents=True, exist_ok=True)
+            atomic_copy(os.path.join(tmp, "prog.gcda"), str(gcda))
+        else:
+            shutil.copyfile(gcda, os.path.join(tmp, "prog.gcda"))
+
+        # ---- rebuild with the profile ----
+        run([*cmd_prefix, *USE_FLAGS, "-c", c_path, "-o", obj_path])
+        run([*cmd_prefix, obj_path, "-o", output, *libs])
+        return trained
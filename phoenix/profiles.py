@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+CONFIG_FILE = Path("phoenix.json")
+DEFAULT_PROFILE = "release"
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A named set of C back end options."""
+
+    name: str
+    opt_level: str = "-O3"
+    debug_info: bool = False
+    march_native: bool = False
+    lto: bool = False
+    no_plt: bool = False
+    fast_math: bool = False
+
+    def flags(self) -> List[str]:
+        flags = [self.opt_level]
+        if self.debug_info:
+            flags.append("-g")
+        if self.march_native:
+            flags.append("-march=native")
+        if self.lto:
+            flags.append("-flto")
+        if self.no_plt:
+            flags.append("-fno-plt")
+        if self.fast_math:
+            flags.append("-ffast-math")
+        return flags
+
+    def cache_flags(self) -> List[str]:
+        """Flags as they should enter the cache key.
+
+        -march=native means different code on different CPUs, so the host CPU
+        model is folded in to keep such binaries from being shared by accident.
+        """
+        flags = self.flags()
+        if self.march_native:
+            flags.append(f"cpu={host_cpu()}")
+        return flags
+
+
+PROFILES: Dict[str, Profile] = {
+    "debug": Profile("debug", opt_level="-O0", debug_info=True),
+    "release": Profile("release", opt_level="-O3"),
+    "native": Profile("native", opt_level="-O3", march_native=True),
+    "max": Profile("max", opt_level="-O3", march_native=True, lto=True, no_plt=True),
+}
+
+
+@lru_cache(maxsize=None)
+def host_cpu() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    import platform
+
+    return platform.processor() or platform.machine()
+
+
+def load_project_config(path: Path = CONFIG_FILE) -> dict:
+    """Read phoenix.json from the working directory, if present."""
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"{path}: invalid JSON ({e})") from None
+
+
+def resolve_profile(name: Optional[str] = None, fast_math: Optional[bool] = None) -> Profile:
+    """Pick a profile: CLI arguments first, then phoenix.json, then the default."""
+    config = load_project_config()
+    name = name or config.get("profile", DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"unknown build profile '{name}' (choose from {', '.join(PROFILES)})")
+
+    profile = PROFILES[name]
+    if fast_math is None:
+        fast_math = config.get("fast_math", profile.fast_math)
+    if fast_math != profile.fast_math:
+        profile = replace(profile, fast_math=bool(fast_math))
+    return profile
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, ContextManager, Dict, Iterator, List
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus its finished children (gcc)."""
+    t = os.times()
+    return time.process_time() + t.children_user + t.children_system
+
+
+def _child_peak_kib() -> int:
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss  # KiB on Linux
+
+
+@dataclass
+class StageStats:
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_bytes: int = 0  # Python heap, when memory is traced
+    child_peak_kib: int = 0  # largest child RSS, if a child ran during the stage
+    calls: int = 0
+
+
+class _Frame:
+    __slots__ = ("name", "wall", "cpu", "peak", "started", "cpu_started", "child_peak")
+
+    def __init__(self, name: str, now: float, cpu: float):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = 0
+        self.started = now
+        self.cpu_started = cpu
+        self.child_peak = _child_peak_kib()
+
+
+class StageTimer:
+    """Wall, CPU and peak memory per named pipeline stage, in the order stages first ran.
+
+    Stages may nest: time spent in an inner stage is not counted again in
+    the outer one, so the stages always add up to the total. With
+    memory=True, Python allocations are traced (which slows the build down).
+    """
+
+    active = True
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, Any] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _pause(self, frame: _Frame, now: float, cpu: float) -> None:
+        frame.wall += now - frame.started
+        frame.cpu += cpu - frame.cpu_started
+        if self.memory:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        now, cpu = time.perf_counter(), _cpu_seconds()
+        if stack:
+            self._pause(stack[-1], now, cpu)
+        elif self.memory:
+            tracemalloc.reset_peak()
+        frame = _Frame(name, now, cpu)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            now, cpu = time.perf_counter(), _cpu_seconds()
+            self._pause(frame, now, cpu)
+            stack.pop()
+            child_peak = _child_peak_kib()
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+                stats.wall += frame.wall
+                stats.cpu += frame.cpu
+                stats.peak_bytes = max(stats.peak_bytes, frame.peak)
+                if child_peak > frame.child_peak:
+                    stats.child_peak_kib = max(stats.child_peak_kib, child_peak)
+                stats.calls += 1
+            if stack:
+                parent = stack[-1]
+                parent.started, parent.cpu_started = now, cpu
+                parent.peak = max(parent.peak, frame.peak)
+
+    def note(self, name: str, value: Any) -> None:
+        """Record a fact about the build (node counts, cache outcome) for reports."""
+        self.counters[name] = value
+
+    def reset(self) -> None:
+        self.stages = {}
+        self.counters = {}
+
+    @property
+    def total(self) -> float:
+        return sum(s.wall for s in self.stages.values())
+
+    def report(self) -> List[str]:
+        width = max((len(name) for name in self.stages), default=0)
+        width = max(width, len("total"))
+        lines = []
+        for name, s in self.stages.items():
+            line = f"  {name:<{width}}  {s.wall * 1000:8.1f} ms  {s.cpu * 1000:8.1f} ms cpu"
+            if self.memory:
+                line += f"  {s.peak_bytes / 1024:8.0f} KiB"
+            if s.child_peak_kib:
+                line += f"  ({s.child_peak_kib} KiB child)"
+            lines.append(line)
+        cpu = sum(s.cpu for s in self.stages.values())
+        lines.append(f"  {'total':<{width}}  {self.total * 1000:8.1f} ms  {cpu * 1000:8.1f} ms cpu")
+        return lines
+
+    def to_json(self) -> Dict[str, Any]:
+        stages = {}
+        for name, s in self.stages.items():
+            entry = {"wall_ms": round(s.wall * 1000, 3), "cpu_ms": round(s.cpu * 1000, 3), "calls": s.calls}
+            if self.memory:
+                entry["peak_kib"] = round(s.peak_bytes / 1024, 1)
+            if s.child_peak_kib:
+                entry["child_peak_kib"] = s.child_peak_kib
+            stages[name] = entry
+        return {"stages": stages, "total_ms": round(self.total * 1000, 3), "counters": dict(self.counters)}
+
+
+def write_report(path: str, timer: StageTimer, build: Dict[str, Any]) -> None:
+    """Write one build's timings and facts as JSON, for graphing across builds."""
+    from phoenix import __version__
+
+    report = {"phoenix": __version__, "timestamp": time.time(), **build, **timer.to_json()}
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+        f.write("\n")
+
+
+class _NullTimer:
+    active = False
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def note(self, name: str, value: Any) -> None:
+        pass
+
+
+# Default for code paths nobody is timing.
+NULL_TIMER = _NullTimer()
@@ -1,12 +1,14 @@
 import ast
 import json
-from typing import Iterable, Set, List 
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, List
 
 from phoenix.c_types import c_type_name, required_headers
 from phoenix.type_inference import TypeContext
 from phoenix.types import (
     BoolType,
     FloatType,
+    FunctionType,
     IntType,
     ListType,
     StringType,
@@ -16,12 +18,14 @@ from phoenix.types import (
 
 
 class CEmitter:
-    def __init__(self, type_ctx: TypeContext):
+    def __init__(self, type_ctx: TypeContext, symbols: Optional[Dict[str, str]] = None):
         self.lines = []
         self.indent = 0
         self.declared: Set[str] = set()
         self.functions = []
         self.type_ctx = type_ctx
+        # Phoenix function name -> C symbol (imported and module-mangled names).
+        self.symbols: Dict[str, str] = {**type_ctx.externs, **(symbols or {})}
 
     def emit(self, line: str = ""):
         self.lines.append("    " * self.indent + line)
@@ -76,7 +80,7 @@ class CEmitter:
             rhs = self.expr(value)
             self.emit(f"{lhs} = {rhs};")
 
-    def emit_function(self, node: ast.FunctionDef):
+    def signature(self, node: ast.FunctionDef) -> str:
         name = node.name
         args = [arg.arg for arg in node.args.args]
         func_type = self.type_ctx.functions.get(name)
@@ -84,16 +88,21 @@ class CEmitter:
         param_types = func_type.param_types if func_type else [UnknownType()] * len(args)
         return_type = func_type.return_type if func_type else IntType()
 
-        old_declared = self.declared
-        self.declared = set(args)
-
         def _param_decl(t: Type, name: str) -> str:
             if isinstance(t, ListType):
                 return f"{c_type_name(t.element_type)} {name}[]"
             return f"{c_type_name(t)} {name}"
 
         params = ", ".join(_param_decl(t, a) for t, a in zip(param_types, args))
-        self.emit(f"{c_type_name(return_type)} {name}({params}) {{")
+        return f"{c_type_name(return_type)} {self.symbols.get(name, name)}({params})"
+
+    def emit_function(self, node: ast.FunctionDef):
+        args = [arg.arg for arg in node.args.args]
+
+        old_declared = self.declared
+        self.declared = set(args)
+
+        self.emit(f"{self.signature(node)} {{")
 
         self.indent += 1
         for stmt in node.body:
@@ -109,12 +118,14 @@ class CEmitter:
         self.declared = old_declared
 
     def emit_for(self, node):
-        iter_call = node.iter
-        bound = iter_call.args[0].value
+        bounds = [arg.value for arg in node.iter.args]
+        start, stop, step = (0, bounds[0], 1) if len(bounds) == 1 else (*bounds, 1)[:3]
         var = node.target.id
 
         c_type = c_type_name(self._type_of(node.target))
-        self.emit(f"for ({c_type} {var} = 0; {var} < {bound}; {var}++) {{")
+        # Literal bounds cannot be negative, so the loop always counts up.
+        advance = f"{var}++" if step == 1 else f"{var} += {step}"
+        self.emit(f"for ({c_type} {var} = {start}; {var} < {stop}; {advance}) {{")
         self.emit_block(node.body)
         self.emit("}")
 
@@ -193,7 +204,7 @@ class CEmitter:
                     return f"sqrt({arg})"
 
             if isinstance(node.func, ast.Name):
-                func = node.func.id
+                func = self.symbols.get(node.func.id, node.func.id)
                 args = ", ".join(self.expr(a) for a in node.args)
                 return f"{func}({args})"
 
@@ -214,7 +225,8 @@ class CEmitter:
             else:
                 op = "+"
 
-            return f"{left} {op} {right}"
+            # Parenthesised so nested operations keep the tree's grouping.
+            return f"({left} {op} {right})"
 
         return "0"
 
@@ -228,22 +240,32 @@ def _collect_types(type_ctx: TypeContext) -> Iterable[Type]:
     return seen
 
 
-def transpile(tree, type_ctx: TypeContext):
-    emitter = CEmitter(type_ctx)
-
+def _headers(type_ctx: TypeContext) -> List[str]:
     headers = {"<stdio.h>"}
     headers.update(required_headers(_collect_types(type_ctx)))
     if type_ctx.uses_math:
         headers.add("<math.h>")
+    return sorted(headers)
 
-    for h in sorted(headers):
-        emitter.emit(f"#include {h}")
-    emitter.emit()
 
-    for stmt in tree.body:
-        if isinstance(stmt, ast.FunctionDef):
-            emitter.emit_function(stmt)
+def extern_prototype(symbol: str, func_type: FunctionType) -> str:
+    def _param_decl(t: Type) -> str:
+        if isinstance(t, ListType):
+            return f"{c_type_name(t.element_type)} []"
+        return c_type_name(t)
+
+    params = ", ".join(_param_decl(t) for t in func_type.param_types) or "void"
+    return f"{c_type_name(func_type.return_type)} {symbol}({params});"
+
+
+def _emit_externs(emitter: CEmitter, type_ctx: TypeContext) -> None:
+    for name, symbol in sorted(type_ctx.externs.items()):
+        emitter.emit(extern_prototype(symbol, type_ctx.functions[name]))
+    if type_ctx.externs:
+        emitter.emit()
+
 
+def _emit_main(emitter: CEmitter, tree) -> None:
     emitter.emit("int main() {")
     emitter.indent += 1
     emitter.declared = set()
@@ -256,4 +278,105 @@ def transpile(tree, type_ctx: TypeContext):
     emitter.indent -= 1
     emitter.emit("}")
 
+
+def transpile(tree, type_ctx: TypeContext):
+    emitter = CEmitter(type_ctx)
+
+    for h in _headers(type_ctx):
+        emitter.emit(f"#include {h}")
+    emitter.emit()
+    _emit_externs(emitter, type_ctx)
+
+    functions = [stmt for stmt in tree.body if isinstance(stmt, ast.FunctionDef)]
+    # Prototypes first: a function may call one defined after it.
+    for func in functions:
+        emitter.emit(f"{emitter.signature(func)};")
+    if functions:
+        emitter.emit()
+    for func in functions:
+        emitter.emit_function(func)
+
+    _emit_main(emitter, tree)
+
+    return "\n".join(emitter.lines)
+
+
+def transpile_module(tree, type_ctx: TypeContext, symbols: Dict[str, str]) -> str:
+    """Emit a library translation unit: functions under their C symbols, no main()."""
+    emitter = CEmitter(type_ctx, symbols)
+
+    for h in _headers(type_ctx):
+        emitter.emit(f"#include {h}")
+    emitter.emit()
+    _emit_externs(emitter, type_ctx)
+
+    functions = [stmt for stmt in tree.body if isinstance(stmt, ast.FunctionDef)]
+    # Prototypes first so module functions may call each other in any order.
+    for func in functions:
+        emitter.emit(f"{emitter.signature(func)};")
+    emitter.emit()
+    for func in functions:
+        emitter.emit_function(func)
+
     return "\n".join(emitter.lines)
+
+
+# ---- separate compilation ----------------------------------------
+@dataclass(frozen=True)
+class TranslationUnit:
+    """One independently compilable C file: a single function or main()."""
+
+    name: str
+    code: str
+    signature: str = ""
+
+
+def _called_functions(nodes: Iterable[ast.AST], known: Dict[str, object]) -> List[str]:
+    called: List[str] = []
+    for root in nodes:
+        for node in ast.walk(root):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Name)
+                and node.func.id in known
+                and node.func.id not in called
+            ):
+                called.append(node.func.id)
+    return called
+
+
+def transpile_units(tree, type_ctx: TypeContext) -> List[TranslationUnit]:
+    """Split the program into one translation unit per function plus main.
+
+    Each unit carries only the prototypes of the functions it calls, so a
+    body edit changes exactly one unit's text and an edit to a signature
+    touches only that function and its callers.
+    """
+    functions = {stmt.name: stmt for stmt in tree.body if isinstance(stmt, ast.FunctionDef)}
+    includes = [f"#include {h}" for h in _headers(type_ctx)]
+    prototype_emitter = CEmitter(type_ctx)
+    signatures = {name: prototype_emitter.signature(node) for name, node in functions.items()}
+    callable_names = {**functions, **type_ctx.externs}
+
+    def _unit(name: str, body_nodes: List[ast.AST], emit) -> TranslationUnit:
+        emitter = CEmitter(type_ctx)
+        for line in includes:
+            emitter.emit(line)
+        emitter.emit()
+        for callee in _called_functions(body_nodes, callable_names):
+            if callee in type_ctx.externs:
+                emitter.emit(extern_prototype(type_ctx.externs[callee], type_ctx.functions[callee]))
+            elif callee != name:
+                emitter.emit(f"{signatures[callee]};")
+        emitter.emit()
+        emit(emitter)
+        ft = type_ctx.functions.get(name)
+        return TranslationUnit(name, "\n".join(emitter.lines), repr(ft) if ft else "")
+
+    units = [
+        _unit(name, [node], lambda e, node=node: e.emit_function(node))
+        for name, node in functions.items()
+    ]
+    top_level = [stmt for stmt in tree.body if not isinstance(stmt, ast.FunctionDef)]
+    units.append(_unit("main", top_level, lambda e: _emit_main(e, tree)))
+    return units
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import ast
+import heapq
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 from phoenix.errors import PhoenixError
 from phoenix.types import (
@@ -34,51 +35,269 @@ class TypeContext:
     globals: Dict[str, Type] = field(default_factory=dict)
     node_types: Dict[ast.AST, Type] = field(default_factory=dict)
     functions: Dict[str, FunctionType] = field(default_factory=dict)
+    externs: Dict[str, str] = field(default_factory=dict)
     uses_math: bool = False
 
 
+@dataclass
+class CallGraph:
+    """Which functions each top-level function calls and which names it reads.
+
+    The module body is the owner None.
+    """
+
+    calls: Dict[Optional[str], Set[str]] = field(default_factory=dict)
+    reads: Dict[Optional[str], Set[str]] = field(default_factory=dict)
+
+    def add(self, owner: Optional[str], node: ast.AST) -> None:
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            self.calls.setdefault(owner, set()).add(node.func.id)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            self.reads.setdefault(owner, set()).add(node.id)
+
+
+def call_graph(tree: ast.Module) -> CallGraph:
+    graph = CallGraph()
+    for stmt in tree.body:
+        owner = stmt.name if isinstance(stmt, ast.FunctionDef) else None
+        for node in ast.walk(stmt):
+            graph.add(owner, node)
+    return graph
+
+
+def _callee_first(names: List[str], calls: Dict[Optional[str], Set[str]]) -> List[str]:
+    """names ordered so every function comes after the ones it calls.
+
+    Mutually recursive functions (one strongly connected component) keep
+    their definition order. Tarjan's algorithm, iterative so long call
+    chains do not hit the recursion limit.
+    """
+    position = {name: i for i, name in enumerate(names)}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    ordered: List[str] = []
+    for root in names:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(calls.get(root, ()), key=lambda c: position.get(c, -1))))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, callees = work[-1]
+            for callee in callees:
+                if callee not in position:
+                    continue  # builtins, imports
+                if callee not in index:
+                    index[callee] = low[callee] = len(index)
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(sorted(calls.get(callee, ()), key=lambda c: position.get(c, -1)))))
+                    break
+                if callee in on_stack:
+                    low[name] = min(low[name], index[callee])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    low[caller] = min(low[caller], low[name])
+                if low[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    ordered.extend(sorted(component, key=position.__getitem__))
+    return ordered
+
+
+# A unit whose types are still changing after this many analyses is
+# oscillating rather than converging.
+MAX_ANALYSES = 32
+
+# Names usable in parameter/return annotations.
+ANNOTATION_TYPES = {
+    "int": IntType,
+    "float": FloatType,
+    "bool": BoolType,
+    "str": StringType,
+}
+
+
 class TypeInferencer(ast.NodeVisitor):
-    def __init__(self, filename: str, lines: List[str]):
+    def __init__(
+        self,
+        filename: str,
+        lines: List[str],
+        imports: Optional[Dict[str, Tuple[str, FunctionType]]] = None,
+        branches: Optional[Dict[ast.stmt, Tuple[set, Dict[str, ast.AST]]]] = None,
+    ):
         self.filename = filename
         self.lines = lines
+        self.imports = imports or {}
+        # Names assigned in each if branch, keyed by the branch's first
+        # statement, when the caller already gathered them.
+        self.branches = branches or {}
         self.ctx = TypeContext()
         self.env_stack: List[Dict[str, Type]] = [self.ctx.globals]
         self.current_function: Optional[str] = None
         self.return_types: List[Type] = []
         self.function_defs: Dict[str, ast.FunctionDef] = {}
         self.function_param_hints: Dict[str, List[Type]] = {}
+        self.hints_changed: Set[str] = set()
         self.in_if: bool = False
         self.conditional_depth: int = 0
         self.branch_assignments: Dict[str, ast.AST] = {}
 
-    def infer(self, tree: ast.AST) -> TypeContext:
+    def infer(self, tree: ast.AST, graph: Optional[CallGraph] = None) -> TypeContext:
         function_defs = [stmt for stmt in tree.body if isinstance(stmt, ast.FunctionDef)]
 
+        # Imported functions come with fixed signatures from their module.
+        for name, (symbol, func_type) in self.imports.items():
+            self.ctx.functions[name] = func_type
+            self.ctx.externs[name] = symbol
+        for func in function_defs:
+            if func.name in self.imports:
+                self.error(f"Function '{func.name}' shadows an imported function", func)
+
         # Register function stubs so calls can record argument types even before analysis.
         for func in function_defs:
             param_types: List[Type] = [UnknownType() for _ in func.args.args]
             self.ctx.functions[func.name] = FunctionType(tuple(param_types), UnknownType())
             self.function_defs[func.name] = func
 
-        # First pass: globals and calls (skip function bodies).
-        for stmt in tree.body:
-            if not isinstance(stmt, ast.FunctionDef):
-                self.visit(stmt)
+        self._solve(tree, function_defs, graph or call_graph(tree))
+        return self.ctx
 
-        # Second pass: analyze functions with any recorded parameter hints.
-        for func in function_defs:
-            self.visit(func)
+    def _solve(self, tree: ast.Module, function_defs: List[ast.FunctionDef], graph: CallGraph) -> None:
+        """Analyse every function and the module body until no type changes.
+
+        Units start callees first, so return types are usually known where
+        they are used, with the module body last. A unit is analysed again
+        only when something it depends on changed: its parameter hints, the
+        signature of a function it calls, or (for functions) a global it
+        reads. The heap keeps that order within each wave of re-analysis.
+        An error only counts if the unit's last analysis still raises it;
+        earlier ones may come from types that were not known yet.
+        """
+        names = _callee_first(list(self.function_defs), graph.calls)
+        # A later definition of a name replaces an earlier one, which is
+        # still checked, first, so the later signature is the one kept.
+        units: List[Optional[ast.FunctionDef]] = [
+            func for func in function_defs if self.function_defs[func.name] is not func
+        ]
+        rank = {name: len(units) + i for i, name in enumerate(names)}
+        units += [self.function_defs[name] for name in names]
+        units.append(None)  # the module body
+        module_rank = len(units) - 1
+        module_body = [stmt for stmt in tree.body if not isinstance(stmt, ast.FunctionDef)]
+
+        # Hints only matter for parameters without annotations.
+        hinted = {
+            name: rank[name]
+            for name, func in self.function_defs.items()
+            if any(arg.annotation is None for arg in func.args.args)
+        }
+        callers: Dict[str, Set[int]] = {}
+        readers: Dict[str, Set[int]] = {}
+        for owner, callees in graph.calls.items():
+            for callee in callees:
+                if callee in rank:
+                    callers.setdefault(callee, set()).add(module_rank if owner is None else rank[owner])
+        for owner, read in graph.reads.items():
+            if owner is not None and owner in rank:
+                for name in read:
+                    readers.setdefault(name, set()).add(rank[owner])
+
+        heap = list(range(len(units)))
+        queued = set(heap)
+
+        def push(ranks) -> None:
+            for r in ranks:
+                if r not in queued:
+                    queued.add(r)
+                    heapq.heappush(heap, r)
+
+        analyses = [0] * len(units)
+        errors: Dict[int, PhoenixError] = {}
+        while heap:
+            r = heapq.heappop(heap)
+            queued.discard(r)
+            unit = units[r]
+            analyses[r] += 1
+            if analyses[r] > MAX_ANALYSES:
+                if unit is None:
+                    self.error("Global types do not settle; annotate the functions they come from", module_body[0])
+                self.error(f"Types in '{unit.name}' do not settle; annotate its parameters", unit)
+
+            signature = self.ctx.functions.get(unit.name) if unit is not None else None
+            before = dict(self.ctx.globals) if unit is None else None
+            self.env_stack = [self.ctx.globals]
+            self.current_function = None
+            self.return_types = []
+            self.in_if = False
+            self.conditional_depth = 0
+            try:
+                if unit is None:
+                    self._visit_body(module_body)
+                else:
+                    self.visit(unit)
+                errors.pop(r, None)
+            except PhoenixError as e:
+                errors[r] = e
+
+            push(hinted[name] for name in self.hints_changed if name in hinted)
+            self.hints_changed.clear()
+            if unit is not None and self.ctx.functions[unit.name] != signature:
+                push(callers.get(unit.name, ()))
+            if unit is None:
+                for name, t in self.ctx.globals.items():
+                    if before.get(name) != t:
+                        push(readers.get(name, ()))
+
+        if errors:
+            # Report in source order: the module body, then functions as defined.
+            source_order = {id(func): i for i, func in enumerate(function_defs)}
+            first = min(errors, key=lambda r: -1 if units[r] is None else source_order[id(units[r])])
+            raise errors[first]
 
-        # Third pass: refresh globals now that function return types are known.
-        for stmt in tree.body:
-            if not isinstance(stmt, ast.FunctionDef):
+    # ---- helpers -------------------------------------------------
+    def _visit_body(self, stmts: List[ast.stmt]) -> None:
+        """Visit every statement, then raise the first error any of them raised.
+
+        An error is often only a type that is not known yet, so the
+        statements after it still record their call hints; otherwise each
+        analysis would get one call further and the number of analyses
+        would grow with the length of the unit.
+        """
+        first: Optional[PhoenixError] = None
+        for stmt in stmts:
+            try:
                 self.visit(stmt)
-        return self.ctx
+            except PhoenixError as e:
+                if first is None:
+                    first = e
+        if first is not None:
+            raise first
 
-    # ---- helpers -------------------------------------------------
     def error(self, msg: str, node: ast.AST) -> None:
         raise _error(msg, node, self.filename, self.lines)
 
+    def annotation_type(self, node: ast.AST) -> Type:
+        if isinstance(node, ast.Name) and node.id in ANNOTATION_TYPES:
+            return ANNOTATION_TYPES[node.id]()
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in ("list", "List")
+        ):
+            return ListType(self.annotation_type(node.slice), length=None)
+        self.error("Unsupported type annotation (use int, float, bool, str or list[...])", node)
+
     def annotate(self, node: ast.AST, t: Type) -> Type:
         self.ctx.node_types[node] = t
         return t
@@ -105,7 +324,19 @@ class TypeInferencer(ast.NodeVisitor):
         param_types: List[Type] = list(hinted_params[: len(node.args.args)])
         if len(param_types) < len(node.args.args):
             param_types.extend([UnknownType()] * (len(node.args.args) - len(param_types)))
-        func_type = FunctionType(tuple(param_types), UnknownType())
+        # Annotations override call-site hints.
+        for i, arg in enumerate(node.args.args):
+            if arg.annotation is not None:
+                param_types[i] = self.annotation_type(arg.annotation)
+        # Recursive calls see the declared return type, or what the last
+        # analysis of this signature found.
+        provisional: Type = UnknownType()
+        previous = self.ctx.functions.get(node.name)
+        if node.returns is not None:
+            provisional = self.annotation_type(node.returns)
+        elif previous is not None and previous.param_types == tuple(param_types):
+            provisional = previous.return_type
+        func_type = FunctionType(tuple(param_types), provisional)
         self.ctx.functions[node.name] = func_type
 
         # new scope for function body
@@ -113,10 +344,20 @@ class TypeInferencer(ast.NodeVisitor):
         self.current_function = node.name
         self.return_types = []
 
-        for stmt in node.body:
-            self.visit(stmt)
+        self._visit_body(node.body)
 
         return_type = self._resolve_return_type(node)
+        if node.returns is not None:
+            declared = self.annotation_type(node.returns)
+            if isinstance(return_type, UnknownType):
+                return_type = declared
+            elif return_type != declared and not (
+                isinstance(declared, FloatType) and isinstance(return_type, IntType)
+            ):
+                self.error(
+                    f"Function '{node.name}' is annotated to return {declared} but returns {return_type}",
+                    node,
+                )
         self.ctx.functions[node.name] = FunctionType(tuple(param_types), return_type)
 
         self.env_stack.pop()
@@ -288,12 +529,26 @@ class TypeInferencer(ast.NodeVisitor):
 
         if isinstance(expr.func, ast.Name):
             func_name = expr.func.id
+            if func_name in self.ctx.externs:
+                self._check_call_args(func_name, self.ctx.functions[func_name].param_types, arg_types, expr)
             self._record_function_call(func_name, arg_types)
             func_type = self.ctx.functions.get(func_name, None)
             if func_type:
                 return self.annotate(expr, func_type.return_type)
         return self.annotate(expr, UnknownType())
 
+    def _check_call_args(
+        self, func_name: str, param_types: Tuple[Type, ...], arg_types: List[Type], expr: ast.Call
+    ) -> None:
+        if len(param_types) != len(arg_types):
+            self.error(
+                f"'{func_name}' takes {len(param_types)} arguments but {len(arg_types)} were given",
+                expr,
+            )
+        for i, (param, arg) in enumerate(zip(param_types, arg_types), start=1):
+            if not _accepts(param, arg):
+                self.error(f"Argument {i} of '{func_name}' must be {param}, got {arg}", expr)
+
     def _resolve_return_type(self, node: ast.FunctionDef) -> Type:
         if not self.return_types:
             return UnknownType()
@@ -333,9 +588,16 @@ class TypeInferencer(ast.NodeVisitor):
         merged = [
             self._unify_types(old, new) for old, new in zip(current, arg_types)
         ]
+        if merged != current:
+            self.hints_changed.add(func_name)
         self.function_param_hints[func_name] = merged
 
     def _collect_assignments(self, stmts: List[ast.stmt]) -> (set, Dict[str, ast.AST]):
+        if not stmts:
+            return set(), {}
+        known = self.branches.get(stmts[0])
+        if known is not None:
+            return known
         assigned: set = set()
         first: Dict[str, ast.AST] = {}
 
@@ -350,6 +612,24 @@ class TypeInferencer(ast.NodeVisitor):
         return assigned, first
 
 
-def infer_types(tree: ast.AST, filename: str, lines: List[str]) -> TypeContext:
-    inferencer = TypeInferencer(filename, lines)
-    return inferencer.infer(tree)
+def _accepts(param: Type, arg: Type) -> bool:
+    """Whether a value of type arg may be passed where param is declared."""
+    if isinstance(arg, UnknownType) or param == arg:
+        return True
+    if isinstance(param, FloatType) and isinstance(arg, IntType):
+        return True  # C widens int to double
+    if isinstance(param, ListType) and isinstance(arg, ListType):
+        return param.element_type == arg.element_type and param.length in (None, arg.length)
+    return False
+
+
+def infer_types(
+    tree: ast.AST,
+    filename: str,
+    lines: List[str],
+    imports: Optional[Dict[str, Tuple[str, FunctionType]]] = None,
+    branches: Optional[Dict[ast.stmt, Tuple[set, Dict[str, ast.AST]]]] = None,
+    graph: Optional[CallGraph] = None,
+) -> TypeContext:
+    inferencer = TypeInferencer(filename, lines, imports, branches)
+    return inferencer.infer(tree, graph)
@@ -1,61 +1,126 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
+
+# Every type ever built, by (class, fields). Fields that are types are
+# themselves interned, so a key is cheap to hash.
+_INTERNED: Dict[Tuple[Any, ...], "Type"] = {}
 
 
 class Type:
-    """Base Phoenix type."""
+    """Base Phoenix type.
+
+    Types are interned: building one from the same fields returns the same
+    object, so == and hashing are by identity. They are immutable.
+    """
 
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
     name: str = "type"
 
+    def __new__(cls, *fields: Any) -> "Type":
+        key = (cls, *fields)
+        t = _INTERNED.get(key)
+        if t is None:
+            t = object.__new__(cls)
+            for attr, value in zip(cls._fields, fields):
+                object.__setattr__(t, attr, value)
+            # setdefault keeps one winner when daemon threads race.
+            t = _INTERNED.setdefault(key, t)
+        return t
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Unpickling goes through __new__, so loaded types are interned too.
+        return type(self), tuple(getattr(self, attr) for attr in self._fields)
+
     def is_numeric(self) -> bool:
         return False
 
     def __repr__(self) -> str:
-        return self.__class__.__name__
+        fields = [f"{attr}={getattr(self, attr)!r}" for attr in self._fields]
+        return f"{type(self).__name__}({', '.join(fields + [f'name={self.name!r}'])})"
 
 
-@dataclass(frozen=True)
 class UnknownType(Type):
-    name: str = "unknown"
+    __slots__ = ()
+    name = "unknown"
 
 
-@dataclass(frozen=True)
 class IntType(Type):
-    name: str = "int"
+    __slots__ = ()
+    name = "int"
 
     def is_numeric(self) -> bool:
         return True
 
 
-@dataclass(frozen=True)
 class FloatType(Type):
-    name: str = "float"
+    __slots__ = ()
+    name = "float"
 
     def is_numeric(self) -> bool:
         return True
 
 
-@dataclass(frozen=True)
 class BoolType(Type):
-    name: str = "bool"
+    __slots__ = ()
+    name = "bool"
 
 
-@dataclass(frozen=True)
 class StringType(Type):
-    name: str = "string"
+    __slots__ = ()
+    name = "string"
 
 
-@dataclass(frozen=True)
 class ListType(Type):
-    element_type: Type
-    length: Optional[int] = None
-    name: str = "list"
+    __slots__ = ("element_type", "length")
+    _fields = ("element_type", "length")
+    name = "list"
+
+    def __new__(cls, element_type: Type, length: Optional[int] = None) -> "ListType":
+        return super().__new__(cls, element_type, length)
 
 
-@dataclass(frozen=True)
 class FunctionType(Type):
-    param_types: Tuple[Type, ...]
-    return_type: Type
-    name: str = "function"
+    __slots__ = ("param_types", "return_type")
+    _fields = ("param_types", "return_type")
+    name = "function"
+
+    def __new__(cls, param_types: Tuple[Type, ...], return_type: Type) -> "FunctionType":
+        return super().__new__(cls, tuple(param_types), return_type)
+
+
+# ---- serialization -------------------------------------------------
+_SCALARS = {
+    "unknown": UnknownType,
+    "int": IntType,
+    "float": FloatType,
+    "bool": BoolType,
+    "string": StringType,
+}
+
+
+def type_to_json(t: Type) -> Any:
+    """Encode a type as plain JSON data (for cached module interfaces)."""
+    if isinstance(t, ListType):
+        return {"list": type_to_json(t.element_type), "length": t.length}
+    if isinstance(t, FunctionType):
+        return {
+            "params": [type_to_json(p) for p in t.param_types],
+            "returns": type_to_json(t.return_type),
+        }
+    return t.name
+
+
+def type_from_json(data: Any) -> Type:
+    if isinstance(data, str):
+        return _SCALARS[data]()
+    if "list" in data:
+        return ListType(type_from_json(data["list"]), length=data.get("length"))
+    return FunctionType(
+        tuple(type_from_json(p) for p in data["params"]),
+        type_from_json(data["returns"]),
+    )
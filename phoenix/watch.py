@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+
+from phoenix.batch import collect_sources, output_paths
+from phoenix.driver import BuildOptions, BuildSession, describe_build, describe_error
+from phoenix.timing import StageTimer
+
+
+POLL_INTERVAL = 0.5
+
+
+class Watcher:
+    """Rebuild and rerun programs whenever they or their imports change.
+
+    Sources are polled by modification time. One session lives for the
+    whole watch, so unchanged trees and type contexts, module signatures
+    and cached binaries carry over from one save to the next.
+    """
+
+    def __init__(
+        self,
+        patterns: List[str],
+        out_dir: str = "build",
+        options: Optional[BuildOptions] = None,
+        run: bool = True,
+        emit: Callable[[str], None] = print,
+    ):
+        self.patterns = patterns
+        self.out_dir = out_dir
+        self.run = run
+        self.emit = emit
+        self.session = BuildSession(options=options)
+        self.session.timer = StageTimer()
+        self.outputs: Dict[str, str] = {}
+        self.mtimes: Dict[str, Dict[str, float]] = {}
+
+    def programs(self) -> List[str]:
+        files = collect_sources(self.patterns)
+        self.outputs = output_paths(files, self.out_dir, self.session.options)
+        return files
+
+    def _inputs(self, filename: str) -> List[str]:
+        """The program plus every module it imports, as far as it still parses."""
+        try:
+            with open(filename, "r") as f:
+                source = f.read()
+            return [filename, *self.session.modules.dependency_paths(source, filename)]
+        except Exception:
+            return [filename]
+
+    def _stamp(self, paths: List[str]) -> Dict[str, float]:
+        stamps = {}
+        for path in paths:
+            try:
+                stamps[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                stamps[path] = -1
+        return stamps
+
+    def changed(self) -> List[str]:
+        """Programs whose source or imports changed since they were last built."""
+        stale = []
+        for filename in self.programs():
+            previous = self.mtimes.get(filename)
+            if previous is None or self._stamp(list(previous)) != previous:
+                stale.append(filename)
+        for filename in set(self.mtimes) - set(self.outputs):
+            del self.mtimes[filename]
+        return stale
+
+    def rebuild(self, filename: str) -> int:
+        # Stamp before building so a save during the build triggers another one.
+        self.mtimes[filename] = self._stamp(self._inputs(filename))
+        output = self.outputs[filename]
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+        timer = self.session.timer
+        timer.reset()
+        self.emit(f"── {filename}")
+        try:
+            result = self.session.build(filename, output)
+        except Exception as e:
+            for text in describe_error(e):
+                self.emit(text)
+            return 1
+        for line in describe_build(result, output):
+            self.emit(line)
+
+        code = 0
+        if self.run and result.kind == "binary":
+            with timer.stage("run"):
+                code = subprocess.run([os.path.abspath(output)]).returncode
+            if code != 0:
+                self.emit(f"✗ {output} exited with status {code}")
+        for line in timer.report():
+            self.emit(line)
+        return code
+
+    def poll(self) -> int:
+        """Rebuild everything that changed; returns how many programs were rebuilt."""
+        stale = self.changed()
+        for filename in stale:
+            self.rebuild(filename)
+        return len(stale)
+
+    def loop(self, interval: float = POLL_INTERVAL) -> None:
+        if not self.programs():
+            raise ValueError("no Phoenix sources matched")
+        self.poll()
+        self.emit(f"Watching {len(self.outputs)} program(s) for changes (Ctrl-C to stop)")
+        while True:
+            time.sleep(interval)
+            if self.poll():
+                self.emit("Waiting for changes...")
@@ -1,5 +1,8 @@
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 EXAMPLES_DIR = Path("examples")
@@ -21,6 +24,233 @@ EXPECTED_FAIL = {
     "bench_python.py"
 }
 
+# Programs whose binary output is checked, not only their acceptance.
+EXPECTED_OUTPUT = {
+    "good_module_import.py": "12.000000\n12.000000\n10.000000\n0.000000\n",
+    "good_range_step.py": "15\n0\n",
+    "good_call_chain.py": "2.500000\n35.000000\n",
+    "good_mutual_recursion.py": "1\n1\n0\n",
+}
+
+# Library builds of numlib whose wrappers must refuse lists shorter than
+# the indexes dot() uses, rather than let C read past them, and copy back
+# only the lists the function stores into.
+LIBRARY_FLAGS = {
+    "--shared": "numlib_native",
+    "--extension": "numlib",
+}
+
+LIST_PROBE = """
+import {module} as m
+assert m.dot([1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0]) == 10.0
+try:
+    m.dot([1.0, 2.0], [1.0, 1.0])
+except ValueError:
+    pass
+else:
+    raise SystemExit("a two-element list was accepted")
+
+# Only lists the function stores into are copied back.
+a = [1, 2, 3, 4]
+m.dot(a, [1.0, 1.0, 1.0, 1.0])
+assert [type(x) for x in a] == [int] * 4, ("dot() rewrote the list it only reads", a)
+b = [1.0, 2.0, 3.0, 4.0]
+m.scale(b, 2.0)
+assert b == [2.0, 4.0, 6.0, 8.0], ("scale() did not write back", b)
+"""
+
+# @phoenix.jit must give exactly what the plain function gives, and only
+# run compiled code where C computes the same thing.
+JIT_PROBE = """
+import math
+
+import phoenix
+
+
+@phoenix.jit
+def dot(a, b):
+    total = 0.0
+    for i in range(4):
+        total = total + a[i] * b[i]
+    return total
+
+
+@phoenix.jit
+def halve(a, b):
+    return a / b
+
+
+@phoenix.jit
+def half(a):
+    return a / 2.0
+
+
+@phoenix.jit
+def norm(x, y):
+    return math.sqrt(x * x + y * y)
+
+
+@phoenix.jit
+def root(x):
+    return math.sqrt(x)
+
+
+@phoenix.jit
+def rem(a, b):
+    return a % b
+
+
+@phoenix.jit
+def grow(a):
+    return a * 65536
+
+
+@phoenix.jit
+def scale(x):
+    return (x + 1.0) * 3.0
+
+
+@phoenix.jit
+def spread(a):
+    total = 0.0
+    for i in range(1, 4):
+        total = total + a[i * 2 - 2] * (i - 1)
+    return total
+
+
+CASES = [
+    (dot, ([1.0, 2.0, 3.0, 4.0], [1.0, 1.0, 1.0, 1.0])),
+    (dot, ([2, 2.5, 3, 4], [1.0, 1.0, 1.0, 1.0])),
+    (halve, (7, 2)),
+    (halve, (7.0, 2.0)),
+    (half, (7.0,)),
+    (norm, (3.0, 4.0)),
+    (root, (4.0,)),
+    (rem, (7, 3)),
+    (grow, (65536,)),
+    (scale, (2.0,)),
+    (spread, ([1.0, 2.0, 3.0, 4.0, 5.0],)),
+]
+for func, args in CASES:
+    got, want = func(*args), func.py_func(*args)
+    assert got == want and type(got) is type(want), (func.__name__, args, got, want)
+native = {func.__name__ for func, _ in CASES if func.native}
+assert native == {"dot", "half", "norm", "scale", "spread"}, native
+assert halve.specializations[(int, int)] is halve.py_func
+for func, args, error in ((halve, (7.0, 0.0), ZeroDivisionError), (root, (-1.0,), ValueError)):
+    try:
+        func(*args)
+    except error:
+        pass
+    else:
+        raise SystemExit(func.__name__ + " did not raise " + error.__name__)
+try:
+    dot([1.0], [1.0])
+except IndexError:
+    pass
+else:
+    raise SystemExit("dot() of one-element lists did not raise IndexError")
+"""
+
+# Two functions and main: three translation units under --incremental.
+INCREMENTAL_PROBE = """
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def mul(a: int, b: int) -> int:
+    return a * b
+
+
+print(add(2, 3))
+print(mul(2, 3))
+"""
+
+# The stat index must forget a program once anything that could change its
+# key changes: the program's or an import's size, mtime or inode, or the
+# context (flags, compiler) it was built in.
+STAT_PROBE = """
+import os
+import shutil
+import time
+from pathlib import Path
+
+from phoenix.cache import StatIndex
+
+OLD = time.time_ns() - 60 * 10**9
+root = Path(".phoenix_cache")
+
+
+def write(path, text, mtime=OLD):
+    Path(path).write_text(text)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def recorded():
+    write("prog.py", "print(1)\\n")
+    write("dep.py", "x = 1\\n")
+    StatIndex(root).record("prog.py", "ctx", ["dep.py"], "k")
+    return StatIndex(root).lookup("prog.py", "ctx") == "k"
+
+
+assert recorded(), "an untouched program missed"
+assert StatIndex(root).lookup("prog.py", "other") is None, "a different context hit"
+
+write("prog.py", "print(1)\\n", OLD + 10**9)
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "an mtime change hit"
+
+assert recorded()
+write("prog.py", "print(12)\\n")
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "a size change hit"
+
+assert recorded()
+shutil.copy2("prog.py", "copy.py")
+os.replace("copy.py", "prog.py")
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "an inode change hit"
+
+assert recorded()
+write("dep.py", "x = 2\\n", OLD + 10**9)
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "a change to an import hit"
+
+assert recorded()
+os.remove("dep.py")
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "a deleted import hit"
+
+root = Path("fresh_cache")
+write("dep.py", "x = 1\\n")
+write("prog.py", "print(1)\\n", time.time_ns())
+StatIndex(root).record("prog.py", "ctx", ["dep.py"], "k")
+assert StatIndex(root).lookup("prog.py", "ctx") is None, "a just-written program was recorded"
+"""
+
+# Fills a 3000-byte cache with four 1000-byte entries: the least recently
+# used one (bb, since aa was fetched after it) must be the one evicted.
+CACHE_PROBE = """
+import time
+from pathlib import Path
+
+from phoenix.cache import BinaryCache
+
+Path("artifact").write_bytes(bytes(1000))
+cache = BinaryCache(Path(".phoenix_cache"), max_bytes=3000, shared=[])
+for key in ("aa", "bb", "cc"):
+    cache.store(key, "artifact", compile_seconds=1.5)
+    time.sleep(0.05)
+assert cache.fetch("aa", "out"), "a stored entry missed"
+cache.flush()
+time.sleep(0.05)
+cache.store("dd", "artifact")
+assert not cache.fetch("bb", "out"), "an evicted entry hit"
+cache.flush()
+
+cache = BinaryCache(Path(".phoenix_cache"), max_bytes=3000, shared=[])
+summary = cache.summary()
+assert sorted(cache.entries) == ["aa", "cc", "dd"], sorted(cache.entries)
+assert (summary["entries"], summary["bytes"]) == (3, 3000), summary
+assert (summary["hits"], summary["misses"]) == (1, 1), summary
+Path(".phoenix_cache", "orphan.bin").write_bytes(bytes(24))
+"""
+
 def run_test(file_path):
     result = subprocess.run(
         [
@@ -34,6 +264,144 @@ def run_test(file_path):
     )
     return result.returncode, result.stdout + result.stderr
 
+def check_list_arguments(flag, module):
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(EXAMPLES_DIR / "numlib.py", tmp)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        for cmd in (
+            [sys.executable, "-m", "phoenix.cli", "numlib.py", flag],
+            [sys.executable, "-c", LIST_PROBE.format(module=module)],
+        ):
+            result = subprocess.run(cmd, cwd=tmp, env=env, capture_output=True, text=True)
+            if result.returncode != 0:
+                return result.stdout + result.stderr
+    return None
+
+def check_shared_tier():
+    """Builds in a fresh cache come from a tier another cache exported.
+
+    prog.py hits under its own key; prog2.py differs only in a statement
+    with no C, so it hits under the key of its generated code.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        producer, consumer, tier = (Path(tmp, name) for name in ("producer", "consumer", "tier"))
+        source = (EXAMPLES_DIR / "good_if.py").read_text()
+        for directory in (producer, consumer):
+            directory.mkdir()
+            (directory / "prog.py").write_text(source)
+        (consumer / "prog2.py").write_text('"no C for this"\n' + source)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        steps = [
+            (producer, ["prog.py"], False),
+            (producer, ["cache", "export", "--to", str(tier)], False),
+            (consumer, ["prog.py"], True),
+            (consumer, ["prog2.py"], True),
+        ]
+        for cwd, args, hit in steps:
+            step_env = dict(env, PHOENIX_SHARED_CACHE=str(tier)) if hit else env
+            result = subprocess.run(
+                [sys.executable, "-m", "phoenix.cli", *args], cwd=cwd, env=step_env, capture_output=True, text=True
+            )
+            if result.returncode != 0 or (hit and "Using cached binary" not in result.stdout):
+                return f"phoenix {' '.join(args)}:\n{result.stdout}{result.stderr}"
+    return None
+
+def check_jit():
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "jit_probe.py").write_text(JIT_PROBE)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        result = subprocess.run(
+            [sys.executable, "jit_probe.py"], cwd=tmp, env=env, capture_output=True, text=True
+        )
+        return None if result.returncode == 0 else result.stdout + result.stderr
+
+def check_incremental():
+    """--incremental keeps one object file per function and rebuilds only the one edited."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp, "prog.py")
+        source.write_text(INCREMENTAL_PROBE)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        objects = Path(tmp, ".phoenix_cache")
+        steps = [
+            (INCREMENTAL_PROBE, "recompiled 3/3", "5\n6\n", 3),
+            (INCREMENTAL_PROBE.replace("a * b", "a * b + 1"), "recompiled 1/3", "5\n7\n", 4),
+        ]
+        for text, rebuilt, printed, count in steps:
+            source.write_text(text)
+            result = subprocess.run(
+                [sys.executable, "-m", "phoenix.cli", "prog.py", "--incremental", "--no-daemon"],
+                cwd=tmp, env=env, capture_output=True, text=True,
+            )
+            if result.returncode != 0 or rebuilt not in result.stdout:
+                return f"expected {rebuilt}:\n{result.stdout}{result.stderr}"
+            ran = subprocess.run(["./output"], cwd=tmp, capture_output=True, text=True)
+            if ran.stdout != printed:
+                return f"expected {printed!r}, the binary printed {ran.stdout!r}"
+            found = len(list(objects.glob("*.o")))
+            if found != count:
+                return f"expected {count} cached object files after {rebuilt}, found {found}"
+    return None
+
+def check_concurrent_builds(count=6):
+    """Builds of one program started together compile it once; the rest wait and hit."""
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(EXAMPLES_DIR / "good_call_chain.py", Path(tmp, "prog.py"))
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        env.pop("PHOENIX_SHARED_CACHE", None)
+        builds = [
+            subprocess.Popen(
+                [sys.executable, "-m", "phoenix.cli", "prog.py", "-o", f"out{i}", "--no-daemon"],
+                cwd=tmp, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            )
+            for i in range(count)
+        ]
+        outputs = [build.communicate()[0] for build in builds]
+        if any(build.returncode != 0 for build in builds):
+            return "\n".join(outputs)
+        compiled = sum("Compiled to native binary" in output for output in outputs)
+        if compiled != 1:
+            return f"{compiled} of {count} builds compiled:\n" + "\n".join(outputs)
+        for i in range(count):
+            ran = subprocess.run([f"./out{i}"], cwd=tmp, capture_output=True, text=True)
+            if ran.stdout != EXPECTED_OUTPUT["good_call_chain.py"]:
+                return f"out{i} printed {ran.stdout!r}"
+    return None
+
+def check_stat_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "stat_probe.py").write_text(STAT_PROBE)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        result = subprocess.run(
+            [sys.executable, "stat_probe.py"], cwd=tmp, env=env, capture_output=True, text=True
+        )
+        return None if result.returncode == 0 else result.stdout + result.stderr
+
+def check_cache_commands():
+    """LRU eviction on store, then what `cache stats` and `cache prune` report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "cache_probe.py").write_text(CACHE_PROBE)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath("."))
+        env.pop("PHOENIX_SHARED_CACHE", None)
+        env.pop("PHOENIX_CACHE_MAX_BYTES", None)
+        steps = [
+            (["cache_probe.py"], []),
+            (["-m", "phoenix.cli", "cache", "stats"],
+             ["Entries:        3", "Hits:           1", "Misses:         1", "Hit rate:       50.0%",
+              "Compile saved:  ~1.50s"]),
+            # cc is now the least recently used; the orphan has no entry at all.
+            (["-m", "phoenix.cli", "cache", "prune", "--max-bytes", "2000"], ["✓ Removed 2 entries (1.0 KiB)"]),
+            (["-m", "phoenix.cli", "cache", "stats"], ["Entries:        2", "Size:           2.0 KiB / "]),
+        ]
+        for args, expected in steps:
+            result = subprocess.run([sys.executable, *args], cwd=tmp, env=env, capture_output=True, text=True)
+            lines = result.stdout.splitlines()
+            if result.returncode != 0 or not all(any(l.startswith(e) for l in lines) for e in expected):
+                return f"{' '.join(args)}: expected {expected}\n{result.stdout}{result.stderr}"
+        left = sorted(p.name for p in Path(tmp, ".phoenix_cache").glob("*.bin"))
+        if left != ["aa.bin", "dd.bin"]:
+            return f"prune left {left}"
+    return None
+
 def main():
     passed = 0
     failed = 0
@@ -51,6 +419,13 @@ def main():
                 print(output)
                 failed += 1
         else:
+            if code == 0 and name in EXPECTED_OUTPUT:
+                ran = subprocess.run(["./output"], capture_output=True, text=True)
+                if ran.stdout != EXPECTED_OUTPUT[name]:
+                    print(f"✗ {name} printed the wrong output")
+                    print(ran.stdout)
+                    failed += 1
+                    continue
             if code == 0:
                 print(f"✓ {name} correctly accepted")
                 passed += 1
@@ -59,6 +434,70 @@ def main():
                 print(output)
                 failed += 1
 
+    for flag, module in LIBRARY_FLAGS.items():
+        error = check_list_arguments(flag, module)
+        if error is None:
+            print(f"✓ numlib.py {flag} refuses short lists and copies back only stored lists")
+            passed += 1
+        else:
+            print(f"✗ numlib.py {flag} mishandles list arguments")
+            print(error)
+            failed += 1
+
+    error = check_shared_tier()
+    if error is None:
+        print("✓ builds hit an exported shared tier")
+        passed += 1
+    else:
+        print("✗ builds miss an exported shared tier")
+        print(error)
+        failed += 1
+
+    error = check_jit()
+    if error is None:
+        print("✓ @phoenix.jit matches plain Python")
+        passed += 1
+    else:
+        print("✗ @phoenix.jit differs from plain Python")
+        print(error)
+        failed += 1
+
+    error = check_incremental()
+    if error is None:
+        print("✓ --incremental rebuilds only the edited function")
+        passed += 1
+    else:
+        print("✗ --incremental rebuilds more than the edited function")
+        print(error)
+        failed += 1
+
+    error = check_concurrent_builds()
+    if error is None:
+        print("✓ concurrent builds of one program compile it once")
+        passed += 1
+    else:
+        print("✗ concurrent builds of one program compile it more than once")
+        print(error)
+        failed += 1
+
+    error = check_stat_index()
+    if error is None:
+        print("✓ the stat index forgets changed files and contexts")
+        passed += 1
+    else:
+        print("✗ the stat index serves a stale key")
+        print(error)
+        failed += 1
+
+    error = check_cache_commands()
+    if error is None:
+        print("✓ the cache evicts least recently used entries and reports them")
+        passed += 1
+    else:
+        print("✗ the cache evicts or reports the wrong entries")
+        print(error)
+        failed += 1
+
     print("\nSummary:")
     print(f"  Passed: {passed}")
     print(f"  Failed: {failed}")